@@ -11,7 +11,8 @@ from models.user import User, UserCreate
 from models.question import QuestionBank, QuestionCreate
 from models.voucher import Voucher, UserVoucher, PaymentHistory, PaymentMethod
 from services.auth_service import AuthService
-from services.question_service import QuestionService
+from services.voucher_service import VoucherService
+from services.question_import_service import QuestionImportService
 import os
 from dotenv import load_dotenv
 
@@ -300,12 +301,12 @@ SAMPLE_VOUCHERS = [
 def create_sample_questions():
     """샘플 문제 생성"""
     db = SessionLocal()
-    question_service = QuestionService()
     
     try:
-        for question_data in SAMPLE_QUESTIONS:
-            question_create = QuestionCreate(**question_data)
-            question_service.create_question(question_create)
+        QuestionImportService(db).insert_questions(
+            [QuestionCreate(**question_data) for question_data in SAMPLE_QUESTIONS]
+        )
+        db.commit()
         
         print(f"✅ {len(SAMPLE_QUESTIONS)}개의 샘플 문제가 생성되었습니다.")
     except Exception as e:
@@ -362,6 +363,7 @@ def create_sample_vouchers():
             db.add(voucher)
         
         db.commit()
+        VoucherService(db).bump_catalog_version()
         print(f"✅ {len(SAMPLE_VOUCHERS)}개의 샘플 이용권이 생성되었습니다.")
     except Exception as e:
         print(f"❌ 샘플 이용권 생성 중 오류: {e}")
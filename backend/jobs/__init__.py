@@ -0,0 +1,18 @@
+"""
+배치 작업
+
+요청 경로에서 하기에는 무거운 집계/정리 작업을 모아 둔 패키지입니다.
+각 모듈은 python -m jobs.<모듈명> 으로 실행하며, 운영 환경에서는 cron 등으로 예약합니다.
+
+예시 (crontab):
+    10 0 * * 1  cd /app && python -m jobs.weekly_stats
+    30 3 * * *  cd /app && python -m jobs.study_patterns
+    0 4 * * *   cd /app && python -m jobs.export_parquet --output /app/data/exports
+    30 4 * * *  cd /app && python -m jobs.item_stats
+    5 0 * * *   cd /app && python -m jobs.streak_reconcile
+    */10 * * * * cd /app && python -m jobs.voucher_expiry
+
+수동 실행:
+    python -m jobs.question_import data/leet_2024.jsonl
+    python -m jobs.question_dedup
+"""
@@ -0,0 +1,58 @@
+"""
+성취 백필 작업
+
+새 성취 규칙을 추가했을 때, 이미 자격이 있는 기존 사용자에게 다음 활동을 기다리지 않고
+한 번에 부여합니다. 이미 받은 성취는 건너뛰므로 여러 번 실행해도 됩니다.
+
+사용법:
+    python -m jobs.achievement_backfill                       # 전체 규칙
+    python -m jobs.achievement_backfill --type consistency    # 규칙군 하나
+    python -m jobs.achievement_backfill --key streak_30 --key total_365
+"""
+
+import argparse
+import time
+
+from models.database import SessionLocal, init_db
+from services.achievement_service import ACHIEVEMENT_RULES, AchievementService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기존 사용자에게 성취 규칙을 일괄 적용합니다.")
+    parser.add_argument("--type", dest="achievement_type", help="적용할 성취 종류 (streak, consistency 등)")
+    parser.add_argument("--key", action="append", help="적용할 성취 키 (여러 번 지정 가능)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="한 번에 처리할 사용자 수")
+    args = parser.parse_args()
+
+    rules = [
+        rule for rule in ACHIEVEMENT_RULES
+        if (not args.achievement_type or rule.achievement_type == args.achievement_type)
+        and (not args.key or rule.key in args.key)
+    ]
+    if not rules:
+        parser.error("조건에 맞는 성취 규칙이 없습니다.")
+
+    init_db()
+    db = SessionLocal()
+    started = time.monotonic()
+
+    def report(result):
+        elapsed = time.monotonic() - started
+        print(
+            f"  사용자 {result['users']}명 처리, 성취 {result['awarded']}건 부여 "
+            f"({result['users'] / max(elapsed, 1e-6):.0f}명/s)"
+        )
+
+    try:
+        result = AchievementService(db).backfill(rules, chunk_size=args.chunk_size, progress=report)
+        elapsed = time.monotonic() - started
+        print(
+            f"✅ 규칙 {len(rules)}개, 사용자 {result['users']}명, 후보 {result['candidates']}건 → "
+            f"새 성취 {result['awarded']}건 ({elapsed:.1f}s, {result['users'] / max(elapsed, 1e-6):.0f}명/s)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+분석용 Parquet 내보내기 작업
+
+운영 데이터베이스에 분석 쿼리를 직접 돌리지 않도록, 결과/오답/활동 테이블을
+월별 Parquet 파일로 내보냅니다. 기본적으로 지난 실행 이후 변경분만 내보냅니다.
+
+사용법:
+    python -m jobs.export_parquet --output exports
+    python -m jobs.export_parquet --output exports --tables daily_test_results wrong_answers
+    python -m jobs.export_parquet --output exports --full   # 전체 다시 내보내기
+"""
+
+import argparse
+import time
+
+from models.database import SessionLocal, init_db
+from services.export_service import EXPORTS, ParquetExportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석용 테이블을 Parquet으로 내보냅니다.")
+    parser.add_argument("--output", default="exports", help="출력 디렉터리")
+    parser.add_argument("--tables", nargs="+", choices=sorted(EXPORTS), help="내보낼 테이블 (기본값: 전체)")
+    parser.add_argument("--full", action="store_true", help="최고 수위를 무시하고 전체 내보내기")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="한 번에 읽을 행 수")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        service = ParquetExportService(args.output, db_session=db, chunk_size=args.chunk_size)
+        counts = service.export_all(
+            args.tables, full=args.full,
+            progress=lambda name, count: print(f"   {name}: {count}행")
+        )
+        elapsed = time.monotonic() - started
+        for name, count in counts.items():
+            print(f"✅ {name}: {count}행 내보냄")
+        print(f"⏱️ {sum(counts.values())}행, {elapsed:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
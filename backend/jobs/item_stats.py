@@ -0,0 +1,39 @@
+"""
+문항 통계 작업
+
+마지막 실행 이후 채점된 응답만 읽어 문항별 정답률, 점이연 변별도, 답안별 선택 수를
+item_stats에 누적합니다. 매일 새벽 한 번 실행합니다.
+
+사용법:
+    python -m jobs.item_stats
+    python -m jobs.item_stats --chunk-size 50000
+"""
+
+import argparse
+import time
+
+from models.database import SessionLocal, init_db
+from services.item_stats_service import ItemStatsService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문항별 통계를 증분 계산합니다.")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="한 번에 읽을 응답 수")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        result = ItemStatsService(db).update(chunk_size=args.chunk_size)
+        elapsed = time.monotonic() - started
+        print(
+            f"✅ 응답 {result['events']}건 반영 → 문항 통계 {result['items']}건 갱신 "
+            f"({result['chunks']}묶음, {elapsed:.1f}s)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+문제 유사 중복 감사
+
+아직 MinHash 서명이 없는 문제를 색인하면서 기존 문제와의 유사 중복을 기록하고,
+기록된 중복 쌍을 유사도 높은 순으로 보여 줍니다. 이미 색인된 문제는 다시 계산하지 않습니다.
+
+사용법:
+    python -m jobs.question_dedup
+    python -m jobs.question_dedup --show 100
+"""
+
+import argparse
+import time
+
+from models.database import SessionLocal, init_db
+from services.question_dedup_service import QuestionDedupService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 유사 중복을 색인하고 보고합니다.")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="한 번에 색인할 문제 수")
+    parser.add_argument("--show", type=int, default=20, help="출력할 중복 쌍 수")
+    parser.add_argument("--verbose", action="store_true", help="묶음마다 진행 상황 출력")
+    args = parser.parse_args()
+
+    def report(result):
+        print(f"  {result['indexed']}문제 색인, 중복 {result['duplicates']}건")
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        service = QuestionDedupService(db)
+        result = service.index_missing(args.chunk_size, progress=report if args.verbose else None)
+        print(
+            f"✅ {result['indexed']}문제 색인, 새 유사 중복 {result['duplicates']}건 "
+            f"({time.monotonic() - started:.1f}s)"
+        )
+        for pair in service.get_duplicates(args.show):
+            print(f"   #{pair['question_id']} ≈ #{pair['duplicate_of']} (유사도 {pair['similarity']:.2f})")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+문제 일괄 가져오기
+
+JSONL/CSV 파일의 문제를 검증해 묶음 단위로 추가합니다. 중단되면 같은 명령을
+다시 실행해 마지막으로 커밋한 묶음 다음부터 이어서 가져옵니다.
+
+사용법:
+    python -m jobs.question_import data/leet_2024.jsonl
+    python -m jobs.question_import data/*.csv --batch-size 5000
+    python -m jobs.question_import data/leet_2024.jsonl --restart   # 처음부터 다시
+    python -m jobs.question_import data/leet_2024.jsonl --duplicates flag   # 중복도 추가하고 기록만
+"""
+
+import argparse
+import time
+
+from models.database import SessionLocal, init_db
+from services.question_import_service import DUPLICATE_MODES, QuestionImportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL/CSV 파일에서 문제를 가져옵니다.")
+    parser.add_argument("files", nargs="+", help=".jsonl 또는 .csv 파일")
+    parser.add_argument("--batch-size", type=int, default=2000, help="한 트랜잭션에 추가할 문제 수")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 가져오기")
+    parser.add_argument("--duplicates", choices=DUPLICATE_MODES, default="skip",
+                        help="유사 중복 처리: 건너뛰기(skip), 추가하고 기록(flag), 검사 안 함(off)")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        service = QuestionImportService(db, batch_size=args.batch_size, duplicates=args.duplicates)
+        for path in args.files:
+            started = time.monotonic()
+
+            def report(result):
+                elapsed = time.monotonic() - started
+                print(f"   {path}: {result['inserted']}문제 추가 ({result['inserted'] / max(elapsed, 1e-6):.0f}문제/s)")
+
+            result = service.import_file(path, restart=args.restart, progress=report)
+            elapsed = time.monotonic() - started
+            if result["resumed_from"]:
+                print(f"↪️ {path}: {result['resumed_from']}번째 레코드 다음부터 이어서 가져옴")
+            for number, message in result["errors"]:
+                print(f"⚠️ {path}:{number} {message}")
+            print(
+                f"✅ {path}: {result['inserted']}문제 추가, 검증 실패 {result['invalid']}건, "
+                f"유사 중복 {result['duplicates']}건 "
+                f"({result['batches']}묶음, {elapsed:.1f}s)"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
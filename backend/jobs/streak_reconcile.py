@@ -0,0 +1,45 @@
+"""
+스트릭 초기화 반영 작업
+
+조회 API는 마지막 활동일로 끊긴 스트릭을 0으로 계산만 하고 저장하지 않습니다.
+이 작업이 어제 이후 활동이 없는 스트릭의 current_streak를 id 구간별 UPDATE로 0으로 저장해
+learning_streaks를 그대로 집계해도 정확하게 맞춥니다. 매일 자정 직후 실행합니다.
+
+사용법:
+    python -m jobs.streak_reconcile
+    python -m jobs.streak_reconcile --batch-size 20000
+"""
+
+import argparse
+import time
+
+from models.database import SessionLocal, init_db
+from services.learning_streak_service import LearningStreakService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="끊긴 학습 스트릭을 일괄 초기화합니다.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="UPDATE 한 번이 다루는 id 구간 크기")
+    parser.add_argument("--verbose", action="store_true", help="구간마다 진행 상황 출력")
+    args = parser.parse_args()
+
+    def report(result):
+        print(f"  구간 {result['batches']}개 처리, 초기화 {result['reset']}건")
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        result = LearningStreakService(db).expire_stale_streaks(
+            batch_size=args.batch_size, progress=report if args.verbose else None
+        )
+        print(
+            f"✅ 끊긴 스트릭 {result['reset']}건 초기화, 진행 중 스트릭 {result['active']}건 "
+            f"({result['batches']}구간, {time.monotonic() - started:.1f}s)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
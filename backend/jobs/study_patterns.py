@@ -0,0 +1,39 @@
+"""
+학습 패턴 스냅샷 작업
+
+전체 사용자의 학습 이벤트를 사용자 묶음 단위로 읽어 시간대/요일 패턴을 계산하고
+study_pattern_snapshots에 저장합니다. 매일 새벽 한 번 실행합니다.
+
+사용법:
+    python -m jobs.study_patterns
+    python -m jobs.study_patterns --chunk-size 1000
+"""
+
+import argparse
+import time
+
+from models.database import SessionLocal, init_db
+from services.study_pattern_service import StudyPatternService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자별 학습 패턴 스냅샷을 계산합니다.")
+    parser.add_argument("--chunk-size", type=int, default=500, help="한 번에 처리할 사용자 수")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        result = StudyPatternService(db).build_snapshots(chunk_size=args.chunk_size)
+        elapsed = time.monotonic() - started
+        print(
+            f"✅ 사용자 {result['users']}명, 이벤트 {result['events']}건 처리 → "
+            f"스냅샷 {result['snapshots']}건 저장 ({elapsed:.1f}s)"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
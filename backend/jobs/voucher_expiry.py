@@ -0,0 +1,33 @@
+"""
+이용권 만료 처리 작업
+
+만료 시각이 지난 활성 이용권(user_vouchers)을 한 번의 UPDATE로 비활성화합니다.
+권한 캐시는 만료 시각을 넘겨 유지되지 않으므로 이 작업은 저장된 상태를 맞추는 용도이며,
+자정 전후로 자주(예: 10분마다) 실행해도 부담이 없습니다.
+
+사용법:
+    python -m jobs.voucher_expiry
+"""
+
+import argparse
+import time
+
+from models.database import SessionLocal, init_db
+from services.entitlement_service import EntitlementService
+
+
+def main():
+    argparse.ArgumentParser(description="만료된 이용권을 비활성화합니다.").parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        expired = EntitlementService(db).expire_vouchers()
+        print(f"✅ 만료된 이용권 {expired}건 비활성화 ({time.monotonic() - started:.1f}s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+주간 통계 저장 작업
+
+지난주까지 종료된 주의 통계를 weekly_stats 테이블에 저장합니다.
+매주 월요일 새벽에 실행하면 /analytics/weekly-report는 이번 주만 계산합니다.
+
+사용법:
+    python -m jobs.weekly_stats                    # 마지막 저장 주 이후부터
+    python -m jobs.weekly_stats --since 2024-03-04 # 지정한 날짜의 주부터 재계산
+"""
+
+import argparse
+import time
+from datetime import date
+
+from models.database import SessionLocal, init_db
+from services.weekly_stats_service import WeeklyStatsService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종료된 주의 주간 통계를 저장합니다.")
+    parser.add_argument("--since", type=date.fromisoformat, help="재계산 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--user-id", type=int, help="특정 사용자만 계산")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        count = WeeklyStatsService(db).materialize_closed_weeks(since=args.since, user_id=args.user_id)
+        print(f"✅ 주간 통계 {count}건 저장 ({time.monotonic() - started:.1f}s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
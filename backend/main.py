@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Form
+from fastapi import FastAPI, HTTPException, Depends, status, Form, Header, Request, Response
 from sqlalchemy.orm import Session
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -9,8 +9,9 @@ import os
 from dotenv import load_dotenv
 
 from models.database import init_db, get_db
-from models.user import User, UserCreate, UserResponse
+from models.user import User, UserCreate, UserResponse, TokenRefresh
 from models.question import QuestionBank
+from models.learning_streak import DailyActivityBatch
 from services.auth_service import AuthService
 from services.diagnostic_service import DiagnosticService
 from services.recommendation_service import RecommendationService
@@ -18,6 +19,11 @@ from services.analytics_service import AnalyticsService
 from services.voucher_service import VoucherService
 from services.wrong_answer_service import WrongAnswerService
 from services.learning_streak_service import LearningStreakService
+from services.ranking_service import RankingService, TEST_TYPES
+from services.item_stats_service import ItemStatsService
+from services.entitlement_service import EntitlementService
+from services.search_service import SearchService
+from middleware.rate_limit import RateLimitMiddleware, create_bucket_store
 
 load_dotenv()
 
@@ -26,6 +32,9 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# 관리자 계정 (쉼표로 구분한 이메일 목록)
+ADMIN_EMAILS = {email.strip() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
 security = HTTPBearer()
 
 @asynccontextmanager
@@ -42,6 +51,17 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# 요청 수 제한 (IP/사용자별 토큰 버킷, REDIS_URL이 있으면 워커 간 공유)
+# CORS보다 먼저 등록해 429/503 응답에도 CORS 헤더가 붙도록 합니다.
+app.add_middleware(
+    RateLimitMiddleware,
+    requests_per_minute=int(os.getenv("RATE_LIMIT_PER_MINUTE", "60")),
+    max_concurrent=int(os.getenv("MAX_CONCURRENT_REQUESTS", "100")),
+    identify_user=lambda token: auth_service.verify_token(token),
+    store=create_bucket_store(os.getenv("REDIS_URL")),
+    trust_forwarded=os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true",
+)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +69,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Before-Id"],
 )
 
 # 서비스 인스턴스
@@ -58,6 +79,36 @@ recommendation_service = RecommendationService()
 analytics_service = AnalyticsService()
 wrong_answer_service = WrongAnswerService()
 learning_streak_service = LearningStreakService()
+ranking_service = RankingService()
+item_stats_service = ItemStatsService()
+entitlement_service = EntitlementService()
+search_service = SearchService()
+
+def current_user_id(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> int:
+    """인증된 사용자 ID (요청 수 제한 미들웨어가 이미 확인했으면 토큰을 다시 풀지 않음)"""
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is not None:
+        return user_id
+    try:
+        return auth_service.verify_token(credentials.credentials)
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+def current_user(user_id: int = Depends(current_user_id)) -> UserResponse:
+    """인증된 사용자 (요청당 한 번, 짧은 TTL 캐시를 거쳐 조회)"""
+    user = auth_service.get_current_user(user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
+    return user
+
+def require_admin(user: UserResponse = Depends(current_user)) -> UserResponse:
+    """관리자 계정이 아니면 403"""
+    if user.email not in ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
+    return user
 
 @app.get("/")
 async def root():
@@ -79,20 +130,30 @@ async def register(user_data: UserCreate):
 @app.post("/auth/login")
 async def login(email: str = Form(...), password: str = Form(...)):
     try:
-        token = auth_service.login_user(email, password)
-        return {"access_token": token, "token_type": "bearer"}
+        return auth_service.login_user(email, password)
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
 
-@app.get("/auth/profile", response_model=UserResponse)
-async def get_profile(credentials: HTTPAuthorizationCredentials = Depends(security)):
+@app.post("/auth/refresh")
+async def refresh_token(data: TokenRefresh):
+    """리프레시 토큰으로 액세스 토큰 재발급 (비밀번호 검증 없음, 리프레시 토큰도 새로 발급)"""
     try:
-        user_id = auth_service.verify_token(credentials.credentials)
-        user = auth_service.get_user_by_id(user_id)
-        return user
+        return auth_service.refresh_access_token(data.refresh_token)
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
 
+@app.post("/auth/logout")
+async def logout(data: TokenRefresh):
+    try:
+        auth_service.revoke_refresh_token(data.refresh_token)
+        return {"message": "로그아웃되었습니다."}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/auth/profile", response_model=UserResponse)
+async def get_profile(user: UserResponse = Depends(current_user)):
+    return user
+
 # 진단 평가 관련 엔드포인트
 @app.get("/diagnostic/questions")
 async def get_diagnostic_questions():
@@ -112,20 +173,18 @@ async def submit_diagnostic(answers: dict, credentials: HTTPAuthorizationCredent
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/diagnostic/result")
-async def get_diagnostic_result(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_diagnostic_result(user: UserResponse = Depends(current_user)):
     try:
-        user_id = auth_service.verify_token(credentials.credentials)
-        result = diagnostic_service.get_user_diagnostic_result(user_id)
+        result = diagnostic_service.get_user_diagnostic_result(user)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 일일 모의고사 관련 엔드포인트
 @app.get("/daily-test")
-async def get_daily_test(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_daily_test(user: UserResponse = Depends(current_user)):
     try:
-        user_id = auth_service.verify_token(credentials.credentials)
-        daily_test = recommendation_service.get_today_daily_test(user_id)
+        daily_test = recommendation_service.get_today_daily_test(user)
         return daily_test
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -150,23 +209,38 @@ async def get_daily_test_history(credentials: HTTPAuthorizationCredentials = Dep
 
 # 분석 관련 엔드포인트
 @app.get("/analytics/dashboard")
-async def get_dashboard(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_dashboard(user: UserResponse = Depends(current_user)):
     try:
-        user_id = auth_service.verify_token(credentials.credentials)
-        dashboard = analytics_service.get_user_dashboard(user_id)
+        dashboard = analytics_service.get_user_dashboard(user)
         return dashboard
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/analytics/weekly-report")
-async def get_weekly_report(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_weekly_report(user: UserResponse = Depends(current_user)):
     try:
-        user_id = auth_service.verify_token(credentials.credentials)
-        report = analytics_service.generate_weekly_report(user_id)
+        report = analytics_service.generate_weekly_report(user)
         return report
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/analytics/ranking")
+async def get_ranking(
+    test_type: str = None,
+    user_id: int = Depends(current_user_id)
+):
+    """최근 결과 기준 백분위/순위 조회"""
+    try:
+        if test_type and test_type not in TEST_TYPES:
+            raise HTTPException(status_code=400, detail="지원하지 않는 시험 종류입니다.")
+        
+        ranking = ranking_service.get_user_ranking(user_id, [test_type] if test_type else None)
+        return {"ranking": ranking}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # 오답 노트 관련 엔드포인트
 @app.get("/wrong-notes")
 async def get_wrong_notes(
@@ -201,6 +275,19 @@ async def get_wrong_notes(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/wrong-notes/search")
+async def search_wrong_notes(
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    user_id: int = Depends(current_user_id)
+):
+    """오답 노트 검색 (문제 내용/해설, 관련도 순, <mark>로 강조한 발췌 포함)"""
+    try:
+        return search_service.search_wrong_notes(user_id, q, limit=min(limit, 100), offset=max(offset, 0))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/wrong-notes/{wrong_note_id}")
 async def get_wrong_note_detail(
     wrong_note_id: int,
@@ -288,12 +375,24 @@ async def get_voucher_info(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/voucher/payment-history")
-async def get_payment_history(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+async def get_payment_history(
+    response: Response,
+    limit: int = 20,
+    before_id: int = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """결제 내역 목록 (최신순)
+    
+    다음 페이지가 있으면 X-Next-Before-Id 헤더 값을 before_id로 전달합니다.
+    """
     try:
         user_id = auth_service.verify_token(credentials.credentials)
         voucher_service = VoucherService(db)
-        payment_history = voucher_service.get_payment_history(user_id)
-        return payment_history
+        payment_history = voucher_service.get_payment_history(user_id, limit=max(1, min(limit, 100)), before_id=before_id)
+        if payment_history["next_before_id"] is not None:
+            response.headers["X-Next-Before-Id"] = str(payment_history["next_before_id"])
+        return payment_history["payments"]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -307,6 +406,19 @@ async def get_payment_method(credentials: HTTPAuthorizationCredentials = Depends
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/voucher/entitlement")
+async def get_entitlement(user_id: int = Depends(current_user_id)):
+    """현재 쓸 수 있는 요금제와 기능 (캐시)"""
+    try:
+        entitlement = entitlement_service.get_entitlement(user_id)
+        return {
+            "plan": entitlement.plan,
+            "features": sorted(entitlement.features),
+            "expires_at": entitlement.expires_at
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/voucher/available")
 async def get_available_vouchers(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
     try:
@@ -364,6 +476,27 @@ async def record_learning_activity(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/learning/activities:batch")
+async def record_learning_activities_batch(
+    batch: DailyActivityBatch,
+    idempotency_key: str = Header(None, max_length=100),
+    user_id: int = Depends(current_user_id)
+):
+    """날짜별 학습 활동 일괄 기록 (오프라인 기록 동기화)
+    
+    횟수는 기존 값에 더해지므로, 재시도하는 클라이언트는 요청마다 고유한
+    Idempotency-Key 헤더를 보내야 같은 기록이 두 번 집계되지 않습니다.
+    """
+    try:
+        result = learning_streak_service.record_activities_batch(
+            user_id, batch.activities, idempotency_key=idempotency_key
+        )
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/learning/activities")
 async def get_daily_activities(
     days: int = 30,
@@ -377,6 +510,18 @@ async def get_daily_activities(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/learning/calendar")
+async def get_learning_calendar(
+    days: int = 365,
+    user_id: int = Depends(current_user_id)
+):
+    """학습 달력(히트맵) 조회"""
+    try:
+        calendar = learning_streak_service.get_activity_calendar(user_id, max(1, min(days, 730)))
+        return calendar
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/learning/achievements")
 async def get_achievements(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """성취 목록 조회"""
@@ -397,5 +542,37 @@ async def get_learning_stats(credentials: HTTPAuthorizationCredentials = Depends
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# 관리자 엔드포인트
+@app.get("/questions/search")
+async def search_questions(
+    q: str,
+    unit: str = None,
+    limit: int = 20,
+    offset: int = 0,
+    admin: UserResponse = Depends(require_admin)
+):
+    """문제 은행 검색 (내용/해설, 관련도 순, <mark>로 강조한 발췌 포함)"""
+    try:
+        return search_service.search_questions(q, unit=unit, limit=min(limit, 100), offset=max(offset, 0))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/admin/item-stats")
+async def get_item_stats(
+    flagged_only: bool = False,
+    unit: str = None,
+    limit: int = 50,
+    offset: int = 0,
+    admin: UserResponse = Depends(require_admin)
+):
+    """문항 통계 조회 (정답률, 변별도, 답안별 선택 수)"""
+    try:
+        items = item_stats_service.get_item_stats(
+            flagged_only=flagged_only, unit=unit, limit=min(limit, 200), offset=offset
+        )
+        return {"items": items, "limit": limit, "offset": offset}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+ASGI 미들웨어
+"""
@@ -0,0 +1,218 @@
+"""
+요청 수 제한(rate limiting) 미들웨어
+
+토큰 버킷으로 IP별, 사용자별 요청 수를 제한하고, 경로마다 비용을 달리 매겨
+로그인(bcrypt)이나 진단 평가 문제 조회처럼 무거운 요청은 토큰을 더 많이 씁니다.
+프로세스 전체 동시 처리 수에도 상한을 두어 넘치는 요청은 바로 503으로 돌려보냅니다.
+
+버킷은 기본적으로 프로세스 메모리에 두고, REDIS_URL이 있으면 Redis에 두어
+여러 워커가 같은 한도를 나눠 씁니다. Redis에 연결할 수 없으면 메모리 버킷으로 처리합니다.
+"""
+
+import json
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (HTTP 메서드, 경로) -> 토큰 비용 (기본 1)
+DEFAULT_ROUTE_COSTS: Dict[Tuple[str, str], int] = {
+    ("POST", "/auth/login"): 10,
+    ("POST", "/auth/register"): 10,
+    ("GET", "/diagnostic/questions"): 10,
+    ("POST", "/diagnostic/submit"): 5,
+    ("GET", "/daily-test"): 5,
+    ("POST", "/daily-test/submit"): 5,
+    ("POST", "/learning/activities:batch"): 3,
+}
+
+# 제한하지 않는 경로
+DEFAULT_EXEMPT_PATHS = ("/", "/health", "/docs", "/redoc", "/openapi.json")
+
+
+class InMemoryBucketStore:
+    """프로세스 메모리 토큰 버킷"""
+
+    # 이 개수를 넘으면 가득 찬 버킷을 정리합니다.
+    PRUNE_THRESHOLD = 10000
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _prune(self, now: float, capacity: float, rate: float):
+        full_after = capacity / rate
+        self._buckets = {
+            key: (tokens, updated) for key, (tokens, updated) in self._buckets.items()
+            if now - updated < full_after
+        }
+
+    async def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        """토큰을 cost만큼 꺼냅니다
+
+        Returns:
+            (허용 여부, 거절 시 다시 시도할 수 있을 때까지의 초)
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            allowed, retry_after = True, 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            allowed, retry_after = False, (cost - tokens) / rate
+
+        if len(self._buckets) > self.PRUNE_THRESHOLD:
+            self._prune(now, capacity, rate)
+        return allowed, retry_after
+
+
+class RedisBucketStore:
+    """Redis 토큰 버킷 (여러 워커가 같은 버킷을 공유)
+
+    버킷 갱신은 Lua 스크립트 하나로 원자적으로 처리합니다.
+    """
+
+    SCRIPT = """
+        local capacity = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local cost = tonumber(ARGV[4])
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+        local allowed = 0
+        local retry_after = 0
+        if tokens >= cost then
+            tokens = tokens - cost
+            allowed = 1
+        else
+            retry_after = (cost - tokens) / rate
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis  # 선택 의존성
+
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+        self.prefix = prefix
+        self.fallback = InMemoryBucketStore()
+
+    async def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        try:
+            allowed, retry_after = await self.script(
+                keys=[self.prefix + key], args=[capacity, rate, time.time(), cost]
+            )
+            return bool(int(allowed)), float(retry_after)
+        except Exception:
+            # Redis 장애 시 요청을 막지 않고 워커별 메모리 버킷으로 제한합니다.
+            return await self.fallback.take(key, cost, capacity, rate)
+
+
+def create_bucket_store(redis_url: Optional[str] = None):
+    """REDIS_URL이 있고 redis 패키지가 설치되어 있으면 Redis, 아니면 메모리 버킷"""
+    if redis_url:
+        try:
+            return RedisBucketStore(redis_url)
+        except ImportError:
+            print("⚠️ redis 패키지가 없어 메모리 기반 요청 제한을 사용합니다.")
+    return InMemoryBucketStore()
+
+
+class RateLimitMiddleware:
+    """IP/사용자별 토큰 버킷과 전역 동시 처리 상한을 적용하는 ASGI 미들웨어
+
+    Args:
+        app: 감쌀 ASGI 앱
+        requests_per_minute: 버킷이 1분에 채우는 토큰 수 (버킷 크기도 같음)
+        max_concurrent: 프로세스 전체에서 동시에 처리할 최대 요청 수 (0이면 제한 없음)
+        identify_user: Bearer 토큰 -> 사용자 ID (실패하면 예외), 없으면 IP 버킷만 사용.
+            확인한 사용자 ID는 scope["state"]["user_id"]에 남겨 엔드포인트가 토큰을 다시 풀지 않게 합니다.
+        store: 버킷 저장소 (기본값: 메모리)
+        route_costs: (메서드, 경로) -> 토큰 비용
+        exempt_paths: 제한하지 않는 경로
+        trust_forwarded: 프록시 뒤에서 X-Forwarded-For의 첫 주소를 클라이언트 IP로 사용
+    """
+
+    def __init__(self, app, requests_per_minute: int = 60, max_concurrent: int = 100,
+                 identify_user: Optional[Callable[[str], object]] = None, store=None,
+                 route_costs: Optional[Dict[Tuple[str, str], int]] = None,
+                 exempt_paths: Iterable[str] = DEFAULT_EXEMPT_PATHS,
+                 trust_forwarded: bool = False):
+        self.app = app
+        self.capacity = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.max_concurrent = max_concurrent
+        self.identify_user = identify_user
+        self.store = store or InMemoryBucketStore()
+        self.route_costs = DEFAULT_ROUTE_COSTS if route_costs is None else route_costs
+        self.exempt_paths = set(exempt_paths)
+        self.trust_forwarded = trust_forwarded
+        self.in_flight = 0
+
+    def _headers(self, scope) -> Dict[str, str]:
+        return {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+
+    def _client_ip(self, scope, headers: Dict[str, str]) -> str:
+        if self.trust_forwarded and headers.get("x-forwarded-for"):
+            return headers["x-forwarded-for"].split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _user_id(self, headers: Dict[str, str]) -> Optional[object]:
+        authorization = headers.get("authorization", "")
+        if not self.identify_user or not authorization.lower().startswith("bearer "):
+            return None
+        try:
+            return self.identify_user(authorization[7:].strip())
+        except Exception:
+            # 잘못된 토큰은 IP 버킷으로만 제한하고 인증 오류는 엔드포인트가 처리합니다.
+            return None
+
+    async def _reject(self, send, status: int, detail: str, retry_after: float):
+        body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        # 전역 동시 처리 상한 (이벤트 루프 안에서만 바뀌므로 잠금이 필요 없음)
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            await self._reject(send, 503, "요청이 많아 잠시 후 다시 시도해주세요.", 1)
+            return
+
+        headers = self._headers(scope)
+        cost = min(self.route_costs.get((scope["method"], scope["path"]), 1), self.capacity)
+        keys: List[str] = [f"ip:{self._client_ip(scope, headers)}"]
+        user_id = self._user_id(headers)
+        if user_id is not None:
+            scope.setdefault("state", {})["user_id"] = user_id
+            keys.append(f"user:{user_id}")
+
+        for key in keys:
+            allowed, retry_after = await self.store.take(key, cost, self.capacity, self.rate)
+            if not allowed:
+                await self._reject(send, 429, "요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.", retry_after)
+                return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
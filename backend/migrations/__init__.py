@@ -0,0 +1,87 @@
+"""
+데이터베이스 마이그레이션
+
+init_db()의 create_all은 없는 테이블만 생성하고, 이미 존재하는 테이블의
+컬럼이나 제약조건은 변경하지 않습니다. 이 패키지는 기존 데이터베이스에
+스키마 변경과 데이터 백필을 순서대로 적용합니다.
+
+각 마이그레이션 모듈은 upgrade(connection) 함수를 제공하며, 적용 이력은
+schema_migrations 테이블에 기록되어 한 번만 실행됩니다.
+
+사용법:
+    python -m migrations
+"""
+
+import importlib
+from typing import List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+# 적용 순서대로 나열합니다.
+MIGRATIONS = [
+    "m0001_wrong_answer_consecutive_correct",
+    "m0002_wrong_answer_unique_source",
+    "m0003_score_histograms",
+    "m0004_unit_stats",
+    "m0005_learning_streak_bitmap",
+    "m0006_achievement_unique_key",
+    "m0007_daily_activity_unique_date",
+    "m0008_payment_history_user_index",
+    "m0009_full_text_search",
+    "m0010_learning_streak_unique_user",
+]
+
+
+def column_exists(connection: Connection, table: str, column: str) -> bool:
+    """테이블에 컬럼이 존재하는지 확인합니다"""
+    return any(c["name"] == column for c in inspect(connection).get_columns(table))
+
+
+def add_column_if_missing(connection: Connection, table: str, column: str, ddl: str):
+    """컬럼이 없을 때만 ALTER TABLE ... ADD COLUMN을 실행합니다"""
+    if not column_exists(connection, table, column):
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _ensure_history_table(connection: Connection):
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version VARCHAR(100) PRIMARY KEY, "
+        "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    ))
+
+
+def run_migrations(engine: Optional[Engine] = None) -> List[str]:
+    """아직 적용되지 않은 마이그레이션을 순서대로 실행합니다
+
+    Args:
+        engine: 대상 엔진 (기본값: models.database.engine)
+
+    Returns:
+        이번에 적용된 마이그레이션 이름 목록
+    """
+    if engine is None:
+        from models.database import engine
+
+    applied_now = []
+    with engine.begin() as connection:
+        _ensure_history_table(connection)
+        applied = {
+            row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))
+        }
+
+    for name in MIGRATIONS:
+        if name in applied:
+            continue
+        module = importlib.import_module(f"{__name__}.{name}")
+        # 마이그레이션과 이력 기록을 하나의 트랜잭션으로 처리
+        with engine.begin() as connection:
+            module.upgrade(connection)
+            connection.execute(
+                text("INSERT INTO schema_migrations (version) VALUES (:version)"),
+                {"version": name}
+            )
+        applied_now.append(name)
+
+    return applied_now
@@ -0,0 +1,6 @@
+from models.database import init_db
+
+
+if __name__ == "__main__":
+    # init_db()가 테이블 생성 후 미적용 마이그레이션을 실행합니다.
+    init_db()
@@ -0,0 +1,33 @@
+"""
+wrong_answers.consecutive_correct 컬럼 추가 및 백필
+
+복습 기록에서 마지막 오답 이후의 연속 정답 횟수를 계산해 채웁니다.
+복습 기록은 id 순서가 곧 입력 순서이므로 created_at 대신 id로 순서를 판단합니다.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from migrations import add_column_if_missing
+
+
+def upgrade(connection: Connection):
+    add_column_if_missing(
+        connection, "wrong_answers", "consecutive_correct", "INTEGER NOT NULL DEFAULT 0"
+    )
+
+    connection.execute(text("""
+        UPDATE wrong_answers
+        SET consecutive_correct = (
+            SELECT COUNT(*)
+            FROM wrong_answer_reviews r
+            WHERE r.wrong_answer_id = wrong_answers.id
+              AND r.is_correct = :true
+              AND r.id > COALESCE((
+                  SELECT MAX(r2.id)
+                  FROM wrong_answer_reviews r2
+                  WHERE r2.wrong_answer_id = wrong_answers.id
+                    AND r2.is_correct = :false
+              ), 0)
+        )
+    """), {"true": True, "false": False})
@@ -0,0 +1,91 @@
+"""
+wrong_answers (user_id, question_id, source_type) 유니크 인덱스 추가
+
+인덱스를 만들기 전에 기존 중복 항목을 정리합니다. 가장 먼저 생성된 항목(최소 id)을
+남기고, 중복 항목의 복습 기록은 남긴 항목으로 옮긴 뒤 중복 항목을 삭제합니다.
+복습 기록을 넘겨받은 항목은 복습 횟수, 연속 정답, 마스터 여부, 마지막 복습 시간을
+합쳐진 복습 기록으로 다시 계산합니다. (m0001과 같은 방식, id 순서 = 입력 순서)
+"""
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+
+# services.wrong_answer_service.MASTERY_STREAK와 같은 값
+MASTERY_STREAK = 3
+
+KEEPER_SQL = """
+    SELECT MIN(k.id) FROM wrong_answers k
+    WHERE k.user_id = wrong_answers.user_id
+      AND k.question_id = wrong_answers.question_id
+      AND k.source_type = wrong_answers.source_type
+"""
+
+LAST_WRONG_SQL = """
+    COALESCE((
+        SELECT MAX(r2.id) FROM wrong_answer_reviews r2
+        WHERE r2.wrong_answer_id = wrong_answers.id AND r2.is_correct = :false
+    ), 0)
+"""
+
+
+def _recompute_review_state(connection: Connection, keeper_ids):
+    connection.execute(text(f"""
+        UPDATE wrong_answers
+        SET review_count = (
+                SELECT COUNT(*) FROM wrong_answer_reviews r WHERE r.wrong_answer_id = wrong_answers.id
+            ),
+            consecutive_correct = (
+                SELECT COUNT(*) FROM wrong_answer_reviews r
+                WHERE r.wrong_answer_id = wrong_answers.id
+                  AND r.is_correct = :true
+                  AND r.id > {LAST_WRONG_SQL}
+            ),
+            last_reviewed_at = COALESCE((
+                SELECT MAX(r.created_at) FROM wrong_answer_reviews r WHERE r.wrong_answer_id = wrong_answers.id
+            ), last_reviewed_at)
+        WHERE id IN :ids
+    """).bindparams(bindparam("ids", expanding=True)), {"ids": keeper_ids, "true": True, "false": False})
+
+    # 마지막 오답 이후 MASTERY_STREAK번째 정답에서 마스터 (복습 로직과 동일)
+    connection.execute(text(f"""
+        UPDATE wrong_answers
+        SET mastered = CASE WHEN consecutive_correct >= :streak THEN :true ELSE :false END,
+            mastered_at = CASE WHEN consecutive_correct >= :streak THEN (
+                SELECT r.created_at FROM wrong_answer_reviews r
+                WHERE r.wrong_answer_id = wrong_answers.id
+                  AND r.is_correct = :true
+                  AND r.id > {LAST_WRONG_SQL}
+                ORDER BY r.id
+                LIMIT 1 OFFSET :offset
+            ) END
+        WHERE id IN :ids
+    """).bindparams(bindparam("ids", expanding=True)), {
+        "ids": keeper_ids, "true": True, "false": False,
+        "streak": MASTERY_STREAK, "offset": MASTERY_STREAK - 1
+    })
+
+
+def upgrade(connection: Connection):
+    keeper_ids = list(connection.execute(text(f"""
+        SELECT DISTINCT ({KEEPER_SQL}) FROM wrong_answers WHERE id <> ({KEEPER_SQL})
+    """)).scalars())
+
+    connection.execute(text(f"""
+        UPDATE wrong_answer_reviews
+        SET wrong_answer_id = (
+            SELECT ({KEEPER_SQL}) FROM wrong_answers
+            WHERE wrong_answers.id = wrong_answer_reviews.wrong_answer_id
+        )
+        WHERE wrong_answer_id IN (
+            SELECT id FROM wrong_answers WHERE id <> ({KEEPER_SQL})
+        )
+    """))
+    connection.execute(text(f"""
+        DELETE FROM wrong_answers WHERE id <> ({KEEPER_SQL})
+    """))
+    if keeper_ids:
+        _recompute_review_state(connection, keeper_ids)
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_wrong_answers_user_question_source "
+        "ON wrong_answers (user_id, question_id, source_type)"
+    ))
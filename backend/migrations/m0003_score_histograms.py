@@ -0,0 +1,33 @@
+"""
+score_histograms 초기 분포 채우기
+
+기존 진단 평가/일일 모의고사 결과의 정답률을 1점 단위 구간으로 세어 넣습니다.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+SOURCES = {
+    "diagnostic": "diagnostic_results",
+    "daily_test": "daily_test_results",
+}
+
+
+def upgrade(connection: Connection):
+    if connection.execute(text("SELECT COUNT(*) FROM score_histograms")).scalar():
+        return
+
+    for test_type, table in SOURCES.items():
+        connection.execute(text(f"""
+            INSERT INTO score_histograms (test_type, bucket, count)
+            SELECT :test_type, bucket, COUNT(*)
+            FROM (
+                SELECT CAST(ROUND(CASE
+                    WHEN accuracy IS NULL OR accuracy < 0 THEN 0
+                    WHEN accuracy > 100 THEN 100
+                    ELSE accuracy
+                END) AS INTEGER) AS bucket
+                FROM {table}
+            ) scores
+            GROUP BY bucket
+        """), {"test_type": test_type})
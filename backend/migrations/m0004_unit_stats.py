@@ -0,0 +1,97 @@
+"""
+unit_stats 초기 카운터 채우기
+
+(사용자, 단원)별 카운터를 다음 두 출처로 채웁니다. 단원이 없거나 빈 문제는 record_results와
+같이 "기타"로 묶습니다.
+
+- answer_events: 진단 평가/일일 모의고사 응답 (정답 여부와 배점이 모두 있음)
+- answer_events가 없는 이전 결과: 남아 있는 정보만으로 복원합니다.
+  - 일일 모의고사는 오답 문항(wrong_questions)만 남아 있으므로 오답만 더합니다.
+    (이전 강점/약점 분석과 같은 기준)
+  - 진단 평가는 단원별 배점(unit_scores)이 남아 있으므로 배점은 그대로 더하고,
+    맞힌 문제 수는 맞힌 배점을 그 단원 문제의 평균 배점으로 나눠 추정합니다.
+"""
+
+import json
+from typing import Dict, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+DEFAULT_UNIT = "기타"
+DEFAULT_POINTS = 3
+
+
+def _unit(value) -> str:
+    # JSON 키로 저장된 None은 "null"이 됨
+    return value if value and value != "null" else DEFAULT_UNIT
+
+
+def _json(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def upgrade(connection: Connection):
+    if connection.execute(text("SELECT COUNT(*) FROM unit_stats")).scalar():
+        return
+
+    totals: Dict[Tuple[int, str], Dict[str, int]] = {}
+
+    def _add(user_id: int, unit, attempted: int, correct: int, points_attempted: int, points_earned: int):
+        row = totals.setdefault((user_id, _unit(unit)), {
+            "attempted": 0, "correct": 0, "points_attempted": 0, "points_earned": 0
+        })
+        row["attempted"] += attempted
+        row["correct"] += correct
+        row["points_attempted"] += points_attempted
+        row["points_earned"] += points_earned
+
+    for row in connection.execute(text(f"""
+        SELECT e.user_id, COALESCE(NULLIF(q.unit, ''), '{DEFAULT_UNIT}'),
+               COUNT(*),
+               SUM(CASE WHEN e.is_correct THEN 1 ELSE 0 END),
+               SUM(COALESCE(q.points, 0)),
+               SUM(CASE WHEN e.is_correct THEN COALESCE(q.points, 0) ELSE 0 END)
+        FROM answer_events e
+        JOIN question_banks q ON q.id = e.question_id
+        WHERE e.source_type IN ('diagnostic', 'daily_test')
+        GROUP BY e.user_id, COALESCE(NULLIF(q.unit, ''), '{DEFAULT_UNIT}')
+    """)):
+        _add(*row)
+
+    for user_id, wrong_questions in connection.execute(text("""
+        SELECT r.user_id, r.wrong_questions FROM daily_test_results r
+        WHERE r.user_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM answer_events e WHERE e.source_type = 'daily_test' AND e.source_id = r.id
+        )
+    """)):
+        for question in _json(wrong_questions) or []:
+            _add(user_id, question.get("unit"), 1, 0, question.get("points") or 0, 0)
+
+    unit_points = {
+        _unit(unit): float(points) for unit, points in connection.execute(text(
+            f"SELECT COALESCE(NULLIF(unit, ''), '{DEFAULT_UNIT}'), AVG(points) FROM question_banks "
+            f"WHERE points > 0 GROUP BY COALESCE(NULLIF(unit, ''), '{DEFAULT_UNIT}')"
+        ))
+    }
+    for user_id, unit_scores, wrong_questions in connection.execute(text("""
+        SELECT r.user_id, r.unit_scores, r.wrong_questions FROM diagnostic_results r
+        WHERE r.user_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM answer_events e WHERE e.source_type = 'diagnostic' AND e.source_id = r.id
+        )
+    """)):
+        wrong_counts: Dict[str, int] = {}
+        for question in _json(wrong_questions) or []:
+            unit = _unit(question.get("unit"))
+            wrong_counts[unit] = wrong_counts.get(unit, 0) + 1
+        for unit, scores in (_json(unit_scores) or {}).items():
+            unit = _unit(unit)
+            earned = scores.get("correct", 0)
+            correct = round(earned / unit_points.get(unit, DEFAULT_POINTS)) if earned else 0
+            _add(user_id, unit, correct + wrong_counts.get(unit, 0), correct, scores.get("total", 0), earned)
+
+    if totals:
+        connection.execute(text("""
+            INSERT INTO unit_stats (user_id, unit, attempted, correct, points_attempted, points_earned)
+            VALUES (:user_id, :unit, :attempted, :correct, :points_attempted, :points_earned)
+        """), [{"user_id": user_id, "unit": unit, **counts} for (user_id, unit), counts in totals.items()])
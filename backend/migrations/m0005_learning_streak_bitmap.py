@@ -0,0 +1,66 @@
+"""
+learning_streaks 활동 비트맵 컬럼 추가 및 백필
+
+daily_activities의 활동 날짜와 일일 모의고사/진단 평가 완료일로 사용자별 비트맵을
+만들어 채우고, 총 학습일/연속 학습일을 비트맵 기준으로 맞춥니다.
+(모의고사만 본 사용자도 연속 학습일이 0이 되지 않도록 결과 테이블도 함께 읽음)
+스트릭 행이 없는 사용자는 새로 만듭니다.
+"""
+
+from datetime import date, datetime
+from itertools import groupby
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from migrations import add_column_if_missing
+from services.activity_bitmap import ActivityBitmap
+
+
+def _as_date(value) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value.date() if isinstance(value, datetime) else value
+
+
+def upgrade(connection: Connection):
+    blob = "BYTEA" if connection.dialect.name == "postgresql" else "BLOB"
+    add_column_if_missing(connection, "learning_streaks", "activity_start", "DATE")
+    add_column_if_missing(connection, "learning_streaks", "activity_bitmap", blob)
+
+    rows = connection.execute(text("""
+        SELECT user_id, activity_date FROM daily_activities
+        UNION ALL
+        SELECT user_id, completed_at FROM daily_test_results WHERE user_id IS NOT NULL AND completed_at IS NOT NULL
+        UNION ALL
+        SELECT user_id, completed_at FROM diagnostic_results WHERE user_id IS NOT NULL AND completed_at IS NOT NULL
+        ORDER BY 1
+    """))
+    for user_id, activities in groupby(rows, key=lambda row: row[0]):
+        bitmap = ActivityBitmap.from_dates(_as_date(row[1]) for row in activities)
+        last_active = bitmap.last_active()
+        params = {
+            "start": bitmap.start,
+            "bitmap": bitmap.to_bytes(),
+            "total": bitmap.total(),
+            "longest": bitmap.longest_streak(),
+            "current": bitmap.run_ending_at(last_active),
+            "last_active": last_active,
+            "user_id": user_id
+        }
+        updated = connection.execute(text("""
+            UPDATE learning_streaks
+            SET activity_start = :start,
+                activity_bitmap = :bitmap,
+                total_study_days = :total,
+                current_streak = :current,
+                last_activity_date = :last_active,
+                longest_streak = CASE WHEN longest_streak > :longest THEN longest_streak ELSE :longest END
+            WHERE user_id = :user_id
+        """), params)
+        if not updated.rowcount:
+            connection.execute(text("""
+                INSERT INTO learning_streaks (user_id, current_streak, longest_streak, total_study_days,
+                                              last_activity_date, activity_start, activity_bitmap)
+                VALUES (:user_id, :current, :longest, :total, :last_active, :start, :bitmap)
+            """), params)
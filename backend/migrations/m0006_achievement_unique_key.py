@@ -0,0 +1,26 @@
+"""
+achievements (user_id, achievement_key) 유니크 인덱스 및 성취 기준값 캐시 컬럼 추가
+
+인덱스를 만들기 전에 같은 성취가 여러 번 부여된 행은 가장 먼저 부여된 행(최소 id)만 남깁니다.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from migrations import add_column_if_missing
+
+
+def upgrade(connection: Connection):
+    add_column_if_missing(connection, "learning_streaks", "next_achievement_thresholds", "JSON")
+
+    connection.execute(text("""
+        DELETE FROM achievements WHERE id <> (
+            SELECT MIN(k.id) FROM achievements k
+            WHERE k.user_id = achievements.user_id
+              AND k.achievement_key = achievements.achievement_key
+        )
+    """))
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_achievements_user_key "
+        "ON achievements (user_id, achievement_key)"
+    ))
@@ -0,0 +1,45 @@
+"""
+daily_activities (user_id, activity_date) 유니크 인덱스 추가
+
+인덱스를 만들기 전에 같은 날짜에 여러 행이 있으면 가장 먼저 만든 행(최소 id)에
+횟수/시간 컬럼을 합치고 진단 완료 여부는 하나라도 완료면 완료로 남긴 뒤 나머지를 삭제합니다.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+COUNTER_COLUMNS = [
+    "daily_tests_completed",
+    "wrong_answers_reviewed",
+    "study_time_minutes",
+    "questions_solved",
+    "correct_answers",
+]
+
+SAME_DAY = """
+    FROM daily_activities d
+    WHERE d.user_id = daily_activities.user_id
+      AND d.activity_date = daily_activities.activity_date
+"""
+
+
+def upgrade(connection: Connection):
+    sums = ",\n".join(
+        f"{column} = (SELECT SUM(COALESCE(d.{column}, 0)) {SAME_DAY})" for column in COUNTER_COLUMNS
+    )
+    connection.execute(text(f"""
+        UPDATE daily_activities
+        SET {sums},
+            diagnostic_completed = (
+                SELECT MAX(CASE WHEN d.diagnostic_completed THEN 1 ELSE 0 END) {SAME_DAY}
+            ) = 1
+        WHERE id = (SELECT MIN(d.id) {SAME_DAY})
+          AND (SELECT COUNT(*) {SAME_DAY}) > 1
+    """))
+    connection.execute(text(f"""
+        DELETE FROM daily_activities WHERE id <> (SELECT MIN(d.id) {SAME_DAY})
+    """))
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_daily_activities_user_date "
+        "ON daily_activities (user_id, activity_date)"
+    ))
@@ -0,0 +1,15 @@
+"""
+payment_history 사용자별 키셋 페이지네이션 인덱스
+
+결제 내역을 (user_id, id) 역순으로 이어 읽을 수 있도록 복합 인덱스를 추가합니다.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(connection: Connection):
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_payment_history_user_id_id "
+        "ON payment_history (user_id, id)"
+    ))
@@ -0,0 +1,81 @@
+"""
+문제/오답 노트 전문 검색 색인
+
+SQLite: trigram 토크나이저 FTS5 외부 콘텐츠 테이블(<테이블>_fts)과 동기화 트리거를 만들고
+기존 행으로 색인을 다시 채웁니다. 트리거가 INSERT/UPDATE/DELETE를 모두 반영하므로
+ORM, executemany, upsert 등 어떤 경로로 바뀌어도 색인이 맞습니다.
+
+trigram 토크나이저는 SQLite 3.34부터 있으므로, 그보다 오래되었거나 FTS5 없이 빌드된 SQLite에서는
+색인을 만들지 않고 넘어갑니다. (SearchService는 색인 테이블이 없으면 LIKE로 검색)
+
+PostgreSQL: 'simple' 설정의 tsvector 생성 컬럼(search_vector)과 GIN 인덱스를 추가합니다.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# 테이블 -> 검색할 컬럼
+SEARCH_INDEXES = {
+    "question_banks": ("content", "explanation"),
+    "wrong_answers": ("question_content", "explanation"),
+}
+
+
+def sqlite_trigram_available(connection: Connection) -> bool:
+    """FTS5 trigram 토크나이저를 쓸 수 있는 SQLite인지 (3.34 이상, FTS5 포함 빌드)"""
+    version = connection.execute(text("SELECT sqlite_version()")).scalar()
+    if tuple(int(part) for part in version.split(".")[:2]) < (3, 34):
+        return False
+    return bool(connection.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar())
+
+
+def _upgrade_sqlite(connection: Connection, table: str, columns):
+    fts = f"{table}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', tokenize='trigram')"
+    ))
+    connection.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+    """))
+    connection.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+        END
+    """))
+    connection.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+    """))
+    connection.execute(text(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')"))
+
+
+def _upgrade_postgresql(connection: Connection, table: str, columns):
+    document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+    connection.execute(text(
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED"
+    ))
+    connection.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)"
+    ))
+
+
+def upgrade(connection: Connection):
+    if connection.dialect.name != "postgresql" and not sqlite_trigram_available(connection):
+        print("⚠️ SQLite FTS5 trigram 토크나이저를 쓸 수 없어 전문 검색 색인을 건너뜁니다. (LIKE 검색)")
+        return
+
+    for table, columns in SEARCH_INDEXES.items():
+        if connection.dialect.name == "postgresql":
+            _upgrade_postgresql(connection, table, columns)
+        else:
+            _upgrade_sqlite(connection, table, columns)
@@ -0,0 +1,79 @@
+"""
+learning_streaks (user_id) 유니크 인덱스 추가
+
+동시에 들어온 첫 활동 기록이 같은 사용자의 스트릭 행을 둘 이상 만든 경우, 인덱스를 만들기 전에
+가장 먼저 만든 행(최소 id)으로 합칩니다. 활동 비트맵은 합집합으로 합치고 총 학습일/연속 학습일은
+합친 비트맵으로 다시 계산하며, 최장 연속 학습일은 큰 값을 남깁니다. 나머지 행을 가리키던
+daily_activities는 남긴 행으로 옮기고, 성취 기준값 캐시는 비워 다음 기록 때 다시 계산하게 합니다.
+"""
+
+from datetime import date
+from itertools import groupby
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+
+from services.activity_bitmap import ActivityBitmap
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def upgrade(connection: Connection):
+    rows = connection.execute(text("""
+        SELECT id, user_id, longest_streak, activity_start, activity_bitmap
+        FROM learning_streaks
+        WHERE user_id IN (SELECT user_id FROM learning_streaks GROUP BY user_id HAVING COUNT(*) > 1)
+        ORDER BY user_id, id
+    """)).all()
+
+    for user_id, streaks in groupby(rows, key=lambda row: row[1]):
+        streaks = list(streaks)
+        keeper_id = streaks[0][0]
+        others = [row[0] for row in streaks[1:]]
+
+        bitmaps = [
+            ActivityBitmap.from_bytes(_as_date(row[3]), row[4]) for row in streaks if row[3] is not None
+        ]
+        merged = ActivityBitmap()
+        if bitmaps:
+            start = min(bitmap.start for bitmap in bitmaps)
+            merged = ActivityBitmap(start, 0)
+            for bitmap in bitmaps:
+                merged.bits |= bitmap.bits << (bitmap.start - start).days
+        last_active = merged.last_active()
+
+        connection.execute(text("""
+            UPDATE learning_streaks
+            SET activity_start = :start,
+                activity_bitmap = :bitmap,
+                total_study_days = :total,
+                current_streak = :current,
+                longest_streak = :longest,
+                last_activity_date = :last_active,
+                next_achievement_thresholds = NULL
+            WHERE id = :keeper_id
+        """), {
+            "start": merged.start,
+            "bitmap": merged.to_bytes() if merged.start else None,
+            "total": merged.total(),
+            "current": merged.run_ending_at(last_active) if last_active else 0,
+            "longest": max([merged.longest_streak()] + [row[2] or 0 for row in streaks]),
+            "last_active": last_active,
+            "keeper_id": keeper_id
+        })
+        connection.execute(
+            text("UPDATE daily_activities SET learning_streak_id = :keeper_id WHERE learning_streak_id IN :others")
+            .bindparams(bindparam("others", expanding=True)),
+            {"keeper_id": keeper_id, "others": others}
+        )
+        connection.execute(
+            text("DELETE FROM learning_streaks WHERE id IN :others")
+            .bindparams(bindparam("others", expanding=True)),
+            {"others": others}
+        )
+
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_learning_streaks_user ON learning_streaks (user_id)"
+    ))
@@ -0,0 +1,145 @@
+"""
+학습 분석 관련 데이터베이스 모델
+
+배치 작업이 미리 계산해 두는 집계 테이블을 정의합니다.
+조회 API는 원본 결과 테이블을 다시 훑지 않고 이 테이블을 읽습니다.
+"""
+
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, Index, JSON
+from sqlalchemy.sql import func
+from .database import Base
+
+
+class WeeklyStats(Base):
+    """주간 학습 통계 테이블
+
+    종료된 ISO 주(월요일 시작)의 집계를 사용자별로 한 행씩 저장합니다.
+    진행 중인 주는 저장하지 않고 조회 시점에 계산합니다.
+    """
+    __tablename__ = "weekly_stats"
+    __table_args__ = (
+        Index("uq_weekly_stats_user_week", "user_id", "week_start", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    week_start = Column(Date, nullable=False)  # 해당 주 월요일
+    iso_year = Column(Integer, nullable=False)
+    iso_week = Column(Integer, nullable=False)
+
+    tests_completed = Column(Integer, default=0)  # 완료한 일일 모의고사 수
+    questions_solved = Column(Integer, default=0)  # 푼 문제 수
+    correct_count = Column(Integer, default=0)  # 정답 수
+    wrong_questions = Column(Integer, default=0)  # 오답 수
+    average_score = Column(Float, default=0.0)  # 평균 정답률 (%)
+    study_days = Column(Integer, default=0)  # 학습한 날 수
+    total_study_time = Column(Integer, default=0)  # 총 학습 시간 (분)
+    improvement_rate = Column(Float, default=0.0)  # 직전 학습 주 대비 평균 정답률 변화율 (%)
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class StudyPatternSnapshot(Base):
+    """학습 패턴 스냅샷 테이블
+
+    야간 배치가 사용자별 학습 이벤트(모의고사 완료, 오답 복습, 활동 기록)를
+    시간대/요일별로 집계해 한 행씩 저장합니다. 주간 리포트는 이 행만 읽습니다.
+    """
+    __tablename__ = "study_pattern_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, unique=True)
+    event_count = Column(Integer, default=0)  # 분석에 사용한 이벤트 수
+
+    hour_histogram = Column(JSON)  # 시간대(0-23)별 이벤트 수
+    hour_accuracy = Column(JSON)  # 시간대별 정답률 (%), 기록 없으면 null
+    hour_session_length = Column(JSON)  # 시간대별 평균 세션 길이 (분)
+    weekday_histogram = Column(JSON)  # 요일(월-일)별 이벤트 수
+    weekday_accuracy = Column(JSON)  # 요일별 정답률 (%)
+
+    preferred_study_time = Column(String(20))  # 새벽, 오전, 오후, 저녁
+    most_productive_day = Column(String(10))  # 정답 수가 가장 많은 요일
+    average_session_length = Column(Integer, default=0)  # 분
+    concentration_level = Column(String(10))  # 높음, 보통, 낮음
+    weakest_time_slot = Column(String(20))  # 정답률이 가장 낮은 2시간 구간
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ScoreHistogram(Base):
+    """점수 분포 테이블
+
+    시험 종류별로 정답률(0-100, 1점 단위 구간)마다 제출 수를 누적합니다.
+    백분위/순위는 결과 테이블을 정렬하지 않고 이 분포로 계산합니다.
+    """
+    __tablename__ = "score_histograms"
+    __table_args__ = (
+        Index("uq_score_histograms_type_bucket", "test_type", "bucket", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    test_type = Column(String(20), nullable=False)  # diagnostic, daily_test
+    bucket = Column(Integer, nullable=False)  # 반올림한 정답률 (0-100)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class UnitStats(Base):
+    """단원별 누적 성과 테이블
+
+    채점할 때마다 (사용자, 단원)별 응답 수/정답 수/배점을 더해 둡니다.
+    강점/약점 단원과 약점 단원 출제는 결과 이력을 다시 훑지 않고 이 행을 읽습니다.
+    """
+    __tablename__ = "unit_stats"
+    __table_args__ = (
+        Index("uq_unit_stats_user_unit", "user_id", "unit", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    unit = Column(String(100), nullable=False)
+
+    attempted = Column(Integer, nullable=False, default=0)  # 응답한 문제 수
+    correct = Column(Integer, nullable=False, default=0)  # 맞힌 문제 수
+    points_attempted = Column(Integer, nullable=False, default=0)  # 응답한 문제 배점 합
+    points_earned = Column(Integer, nullable=False, default=0)  # 맞힌 문제 배점 합
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ItemStats(Base):
+    """문항 통계 테이블
+
+    채점된 응답(진단 평가, 일일 모의고사)을 문항별로 누적합니다.
+    정답률과 점이연 상관(변별도)은 아래 충분통계량에서 다시 계산하므로
+    배치는 새 응답만 더하면 됩니다.
+    """
+    __tablename__ = "item_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    question_id = Column(Integer, nullable=False, unique=True)
+
+    attempts = Column(Integer, nullable=False, default=0)  # 응답 수
+    correct = Column(Integer, nullable=False, default=0)  # 정답 수
+    # 응답한 제출의 총점(정답률 0-1) 합계들
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sq_sum = Column(Float, nullable=False, default=0.0)
+    correct_score_sum = Column(Float, nullable=False, default=0.0)  # 정답자 제출 총점 합
+    option_counts = Column(JSON)  # 답안별 선택 수 {"①": 12, ...}
+
+    p_value = Column(Float)  # 정답률 (0-1)
+    discrimination = Column(Float)  # 점이연 상관계수
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class JobCheckpoint(Base):
+    """배치 작업 진행 위치 테이블
+
+    증분 배치가 마지막으로 처리한 원본 행 ID를 작업별로 저장합니다.
+    """
+    __tablename__ = "job_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(50), nullable=False, unique=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,30 @@
+"""
+문항 응답 이벤트 모델
+
+채점된 모든 문항 응답(정답 포함)을 한 행씩 추가만 하는 로그 테이블입니다.
+단원별 정답률, 문항 통계, 연속 학습 같은 분석을 JSON 결과를 풀지 않고
+인덱스를 타는 집계로 계산할 수 있게 합니다.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
+from sqlalchemy.sql import func
+from .database import Base
+
+
+class AnswerEvent(Base):
+    """문항 응답 이벤트 테이블 (추가 전용)"""
+    __tablename__ = "answer_events"
+    __table_args__ = (
+        Index("ix_answer_events_user_answered", "user_id", "answered_at"),
+        Index("ix_answer_events_question_answered", "question_id", "answered_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    question_id = Column(Integer, nullable=False)
+    source_type = Column(String(20), nullable=False)  # diagnostic, daily_test, review
+    source_id = Column(Integer)  # 진단평가/일일모의고사 결과 ID 또는 오답 노트 ID
+    is_correct = Column(Boolean, nullable=False)
+    user_answer = Column(String(500))  # 사용자 답안
+    time_taken = Column(Integer)  # 소요 시간 (초)
+    answered_at = Column(DateTime, nullable=False, default=func.now())
@@ -27,12 +27,31 @@ metadata = MetaData()
 def init_db():
     """데이터베이스 초기화"""
     # 모든 모델을 import하여 테이블이 생성되도록 함
-    from . import user, question, diagnostic, daily_test, voucher, wrong_answer, learning_streak
+    from . import user, question, diagnostic, daily_test, voucher, wrong_answer, learning_streak, analytics, answer_event
     
     # 모든 테이블 생성
     Base.metadata.create_all(bind=engine)
+
+    # 기존 데이터베이스에 스키마 변경/백필 적용
+    from migrations import run_migrations
+    for name in run_migrations(engine):
+        print(f"✅ 마이그레이션 적용: {name}")
+
     print("✅ 데이터베이스가 초기화되었습니다.")
 
+def dialect_insert(db):
+    """세션/엔진의 방언에 맞는 insert 구성자를 반환합니다
+
+    SQLite와 PostgreSQL 모두 INSERT ... ON CONFLICT를 지원하므로
+    on_conflict_do_update / on_conflict_do_nothing을 같은 방식으로 사용할 수 있습니다.
+    """
+    bind = db.get_bind() if hasattr(db, "get_bind") else db
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
 def get_db():
     """데이터베이스 세션 의존성"""
     db = SessionLocal()
@@ -4,10 +4,10 @@
 사용자의 연속 학습 일수와 학습 습관을 추적하는 모델입니다.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Date, ForeignKey, LargeBinary, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 from datetime import datetime, date
 from typing import Optional, List
 from .database import Base
@@ -19,6 +19,10 @@ class LearningStreak(Base):
     사용자의 연속 학습 일수를 추적합니다.
     """
     __tablename__ = "learning_streaks"
+    __table_args__ = (
+        # 사용자당 한 행 (첫 기록이 동시에 들어와도 INSERT ... ON CONFLICT DO NOTHING으로 한 행만 생성)
+        Index("uq_learning_streaks_user", "user_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -26,6 +30,9 @@ class LearningStreak(Base):
     longest_streak = Column(Integer, default=0)  # 최장 연속 일수
     last_activity_date = Column(Date)  # 마지막 활동 날짜
     total_study_days = Column(Integer, default=0)  # 총 학습 일수
+    activity_start = Column(Date)  # 활동 비트맵의 기준일 (비트 0)
+    activity_bitmap = Column(LargeBinary)  # 하루 1비트 활동 비트맵 (리틀 엔디언)
+    next_achievement_thresholds = Column(JSON)  # 지표별 다음 성취 기준값 캐시 (규칙 버전 포함)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -41,6 +48,9 @@ class DailyActivity(Base):
     사용자의 일일 학습 활동을 기록합니다.
     """
     __tablename__ = "daily_activities"
+    __table_args__ = (
+        Index("uq_daily_activities_user_date", "user_id", "activity_date", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -66,12 +76,31 @@ class DailyActivity(Base):
     learning_streak = relationship("LearningStreak", back_populates="daily_activities")
 
 
+class ActivityBatchKey(Base):
+    """일괄 기록 멱등성 키 테이블
+    
+    같은 Idempotency-Key로 다시 보낸 일괄 기록 요청을 한 번만 반영하기 위해 사용합니다.
+    """
+    __tablename__ = "activity_batch_keys"
+    __table_args__ = (
+        Index("uq_activity_batch_keys_user_key", "user_id", "idempotency_key", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    idempotency_key = Column(String(100), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Achievement(Base):
     """성취 뱃지 테이블
     
     사용자가 달성한 성취를 기록합니다.
     """
     __tablename__ = "achievements"
+    __table_args__ = (
+        Index("uq_achievements_user_key", "user_id", "achievement_key", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -111,6 +140,20 @@ class DailyActivityCreate(BaseModel):
     correct_answers: int = 0
 
 
+class DailyActivityRecord(DailyActivityCreate):
+    """날짜를 지정한 일일 활동 (오프라인 기록 동기화용)"""
+    activity_date: date
+
+
+# 일괄 기록 한 번에 보낼 수 있는 최대 활동 수
+MAX_BATCH_ACTIVITIES = 400
+
+
+class DailyActivityBatch(BaseModel):
+    """일일 활동 일괄 기록 요청 모델"""
+    activities: List[DailyActivityRecord] = Field(..., min_length=1, max_length=MAX_BATCH_ACTIVITIES)
+
+
 class DailyActivityResponse(BaseModel):
     """일일 활동 응답 모델"""
     id: int
@@ -122,11 +165,11 @@ class DailyActivityResponse(BaseModel):
     average_score: Optional[int]
     questions_solved: int
     correct_answers: int
-    accuracy_rate: float
     
     class Config:
         from_attributes = True
     
+    @computed_field
     @property
     def accuracy_rate(self) -> float:
         if self.questions_solved == 0:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Text, JSON, DateTime, LargeBinary, Index
 from sqlalchemy.sql import func
 from models.database import Base
 from pydantic import BaseModel
@@ -23,6 +23,36 @@ class QuestionBank(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class QuestionSignature(Base):
+    """문제 MinHash 서명 테이블 (중복 탐지용)"""
+    __tablename__ = "question_signatures"
+    
+    question_id = Column(Integer, primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # uint32 리틀 엔디언 배열
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class QuestionLshBucket(Base):
+    """MinHash LSH 밴드 버킷 테이블 (밴드마다 한 행)"""
+    __tablename__ = "question_lsh_buckets"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    bucket_hash = Column(BigInteger, nullable=False, index=True)  # 밴드 번호와 밴드 값의 해시
+    question_id = Column(Integer, nullable=False, index=True)
+
+class QuestionDuplicate(Base):
+    """유사 중복으로 판정된 문제 쌍 테이블"""
+    __tablename__ = "question_duplicates"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    question_id = Column(Integer, nullable=False, index=True)  # 나중에 추가된 문제
+    duplicate_of = Column(Integer, nullable=False, index=True)  # 먼저 있던 문제
+    similarity = Column(Float, nullable=False)  # 추정 자카드 유사도
+    detected_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("uq_question_duplicates_pair", "question_id", "duplicate_of", unique=True),
+    )
+
 class QuestionCreate(BaseModel):
     subject: str
     unit: str
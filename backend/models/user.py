@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from models.database import Base
@@ -26,6 +26,18 @@ class User(Base):
     wrong_answers = relationship("WrongAnswer", back_populates="user")
     learning_streak = relationship("LearningStreak", back_populates="user", uselist=False)
 
+class RefreshToken(Base):
+    """리프레시 토큰 테이블 (토큰 원문 대신 SHA-256 해시만 저장)"""
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)
+    family_id = Column(String(32), nullable=False, index=True)  # 같은 로그인에서 회전된 토큰 묶음
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)  # 회전/로그아웃으로 더 이상 쓸 수 없게 된 시각
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -50,6 +62,9 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
 class UserUpdate(BaseModel):
     name: Optional[str] = None
     grade: Optional[str] = None
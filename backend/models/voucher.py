@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON, Index
 from sqlalchemy.sql import func
 from pydantic import BaseModel
 from typing import List, Optional
@@ -37,6 +37,11 @@ class PaymentHistory(Base):
     payment_method = Column(String(50), nullable=True)
     created_at = Column(DateTime, default=func.now())
 
+    __table_args__ = (
+        # 사용자별 최신순 키셋 페이지네이션
+        Index("ix_payment_history_user_id_id", "user_id", "id"),
+    )
+
 class PaymentMethod(Base):
     __tablename__ = "payment_methods"
 
@@ -47,6 +52,14 @@ class PaymentMethod(Base):
     expiry_date = Column(String(10), nullable=False)
     is_default = Column(Boolean, default=False)
 
+class CatalogVersion(Base):
+    """카탈로그 버전 (변경 시 올려서 프로세스별 캐시를 무효화)"""
+    __tablename__ = "catalog_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
 # Pydantic 스키마
 class VoucherBase(BaseModel):
     name: str
@@ -5,7 +5,7 @@
 오답 노트 시스템의 데이터 모델을 정의합니다.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from pydantic import BaseModel
@@ -21,6 +21,10 @@ class WrongAnswer(Base):
     진단 평가와 일일 모의고사에서 틀린 문제들을 자동으로 수집합니다.
     """
     __tablename__ = "wrong_answers"
+    __table_args__ = (
+        # 같은 출처에서 같은 문제는 한 번만 저장 (INSERT ... ON CONFLICT 대상)
+        Index("uq_wrong_answers_user_question_source", "user_id", "question_id", "source_type", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -39,6 +43,7 @@ class WrongAnswer(Base):
     
     # 복습 관련 필드
     review_count = Column(Integer, default=0)  # 복습 횟수
+    consecutive_correct = Column(Integer, default=0, nullable=False)  # 연속 정답 횟수 (오답 시 0으로 초기화)
     last_reviewed_at = Column(DateTime(timezone=True))  # 마지막 복습 시간
     mastered = Column(Boolean, default=False)  # 마스터 여부
     mastered_at = Column(DateTime(timezone=True))  # 마스터 달성 시간
@@ -104,6 +109,7 @@ class WrongAnswerResponse(BaseModel):
     points: Optional[int]
     source_type: str
     review_count: int
+    consecutive_correct: int = 0
     last_reviewed_at: Optional[datetime]
     mastered: bool
     mastered_at: Optional[datetime]
@@ -0,0 +1,243 @@
+"""
+성취 서비스
+
+성취 규칙을 (지표, 기준값) 목록으로 선언하고, 지표별 다음 기준값을
+learning_streaks.next_achievement_thresholds에 캐시해 두어 활동 기록 때마다
+지표당 정수 비교 한 번으로 검사를 끝냅니다. 기준값에 도달했을 때만 규칙을 평가하며,
+성취는 (user_id, achievement_key) 유니크 인덱스에 기대어 중복 없이 추가합니다.
+
+새 규칙군(점수, 복습, 숙달 등)은 ACHIEVEMENT_RULES에 지표 이름과 함께 추가하고,
+그 지표를 갱신하는 쪽에서 check()에 값을 넘기면 됩니다.
+"""
+
+import bisect
+import zlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from models.database import SessionLocal, dialect_insert
+from models.learning_streak import Achievement, DailyActivity, LearningStreak
+
+
+class AchievementRule(NamedTuple):
+    """지표가 threshold 이상이 되면 부여하는 성취"""
+    key: str
+    achievement_type: str
+    metric: str
+    threshold: int
+    title: str
+    description: str
+    icon: str
+    color: str
+
+
+ACHIEVEMENT_RULES: List[AchievementRule] = [
+    # 연속 학습
+    AchievementRule("streak_3", "streak", "current_streak", 3, "첫걸음", "3일 연속 학습을 달성했습니다!", "🔥", "#FF6B35"),
+    AchievementRule("streak_7", "streak", "current_streak", 7, "일주일 챌린지", "7일 연속 학습을 달성했습니다!", "⭐", "#FF6B35"),
+    AchievementRule("streak_14", "streak", "current_streak", 14, "2주 마스터", "14일 연속 학습을 달성했습니다!", "🏆", "#FF6B35"),
+    AchievementRule("streak_30", "streak", "current_streak", 30, "한달 챔피언", "30일 연속 학습을 달성했습니다!", "👑", "#FF6B35"),
+    AchievementRule("streak_100", "streak", "current_streak", 100, "백일장", "100일 연속 학습을 달성했습니다!", "💎", "#FF6B35"),
+    # 총 학습일
+    AchievementRule("total_50", "consistency", "total_study_days", 50, "꾸준한 학습자", "총 50일 학습을 완료했습니다!", "📚", "#4ECDC4"),
+    AchievementRule("total_100", "consistency", "total_study_days", 100, "학습 애호가", "총 100일 학습을 완료했습니다!", "🎓", "#4ECDC4"),
+    AchievementRule("total_200", "consistency", "total_study_days", 200, "학습 전문가", "총 200일 학습을 완료했습니다!", "🧠", "#4ECDC4"),
+    AchievementRule("total_365", "consistency", "total_study_days", 365, "1년 마스터", "총 365일 학습을 완료했습니다!", "🌟", "#4ECDC4"),
+]
+
+# 지표 -> 기준값 오름차순 규칙 목록
+RULES_BY_METRIC: Dict[str, List[AchievementRule]] = {}
+for _rule in sorted(ACHIEVEMENT_RULES, key=lambda rule: rule.threshold):
+    RULES_BY_METRIC.setdefault(_rule.metric, []).append(_rule)
+_THRESHOLDS = {metric: [rule.threshold for rule in rules] for metric, rules in RULES_BY_METRIC.items()}
+
+# 규칙이 바뀌면 캐시된 다음 기준값을 버리고 다시 평가합니다.
+RULES_VERSION = zlib.crc32(repr(sorted((r.metric, r.threshold, r.key) for r in ACHIEVEMENT_RULES)).encode())
+
+
+# 백필 시 지표별로 읽을 값
+# 연속 학습 성취는 지금까지 한 번이라도 도달했으면 받을 자격이 있으므로 최장 스트릭을 씁니다.
+STREAK_METRICS = {
+    "current_streak": LearningStreak.longest_streak,
+    "total_study_days": LearningStreak.total_study_days,
+}
+# daily_activities 사용자별 합계로 계산하는 지표
+ACTIVITY_METRICS = {
+    "questions_solved": func.sum(DailyActivity.questions_solved),
+    "correct_answers": func.sum(DailyActivity.correct_answers),
+    "wrong_answers_reviewed": func.sum(DailyActivity.wrong_answers_reviewed),
+    "daily_tests_completed": func.sum(DailyActivity.daily_tests_completed),
+    "study_time_minutes": func.sum(DailyActivity.study_time_minutes),
+}
+
+
+def next_threshold(metric: str, value: int) -> Optional[int]:
+    """value보다 큰 가장 작은 기준값 (없으면 None)"""
+    thresholds = _THRESHOLDS.get(metric, [])
+    index = bisect.bisect_right(thresholds, value)
+    return thresholds[index] if index < len(thresholds) else None
+
+
+def rules_reached(metric: str, value: int) -> List[AchievementRule]:
+    """value로 달성한 규칙 목록"""
+    rules = RULES_BY_METRIC.get(metric, [])
+    return rules[:bisect.bisect_right(_THRESHOLDS.get(metric, []), value)]
+
+
+class AchievementService:
+    """규칙 기반 성취 부여 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+
+    def check(self, streak: LearningStreak, metrics: Dict[str, int]) -> List[str]:
+        """갱신된 지표 값으로 성취를 검사합니다
+
+        지표마다 캐시된 다음 기준값과 한 번 비교하고, 도달한 지표만 규칙을 평가합니다.
+        커밋하지 않으므로 호출한 쪽에서 커밋합니다.
+
+        Args:
+            streak: 캐시를 보관하는 사용자의 스트릭 행
+            metrics: 지표 이름 -> 현재 값
+
+        Returns:
+            새로 부여한 성취 키 목록
+        """
+        cached = streak.next_achievement_thresholds or {}
+        thresholds = dict(cached) if cached.get("version") == RULES_VERSION else {"version": RULES_VERSION}
+
+        reached: List[AchievementRule] = []
+        for metric, value in metrics.items():
+            if metric in thresholds and (thresholds[metric] is None or value < thresholds[metric]):
+                continue
+            reached.extend(rules_reached(metric, value))
+            thresholds[metric] = next_threshold(metric, value)
+
+        if thresholds != cached:
+            streak.next_achievement_thresholds = thresholds
+
+        return self.award(streak.user_id, reached)
+
+    def award(self, user_id: int, rules: List[AchievementRule]) -> List[str]:
+        """성취를 한 번의 INSERT ... ON CONFLICT DO NOTHING으로 추가합니다
+
+        Returns:
+            새로 추가된 성취 키 목록 (이미 있던 성취는 제외)
+        """
+        if not rules:
+            return []
+
+        insert = dialect_insert(self.db)
+        stmt = insert(Achievement.__table__).values([
+            {
+                "user_id": user_id,
+                "achievement_type": rule.achievement_type,
+                "achievement_key": rule.key,
+                "title": rule.title,
+                "description": rule.description,
+                "icon": rule.icon,
+                "color": rule.color
+            }
+            for rule in rules
+        ]).on_conflict_do_nothing(index_elements=["user_id", "achievement_key"])
+
+        return list(self.db.execute(stmt.returning(Achievement.__table__.c.achievement_key)).scalars())
+
+    # 백필
+
+    def _chunk_values(self, metrics: List[str], after_user_id: int, chunk_size: int):
+        """다음 사용자 묶음의 (user_id 배열, 지표 -> 값 배열)"""
+        streak_metrics = [metric for metric in metrics if metric in STREAK_METRICS]
+        rows = self.db.execute(
+            select(LearningStreak.user_id, *[STREAK_METRICS[metric] for metric in streak_metrics])
+            .where(LearningStreak.user_id > after_user_id)
+            .order_by(LearningStreak.user_id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return None, {}
+
+        user_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        values = {
+            metric: np.array([row[i + 1] or 0 for row in rows], dtype=np.int64)
+            for i, metric in enumerate(streak_metrics)
+        }
+
+        activity_metrics = [metric for metric in metrics if metric in ACTIVITY_METRICS]
+        if activity_metrics:
+            totals = self.db.execute(
+                select(DailyActivity.user_id, *[ACTIVITY_METRICS[metric] for metric in activity_metrics])
+                .where(DailyActivity.user_id.between(int(user_ids[0]), int(user_ids[-1])))
+                .group_by(DailyActivity.user_id)
+            ).all()
+            # 범위 안이어도 learning_streaks 행이 없는 사용자의 합계는 버립니다.
+            total_ids = np.array([row[0] for row in totals], dtype=np.int64)
+            known = np.isin(total_ids, user_ids)
+            positions = np.searchsorted(user_ids, total_ids[known])
+            for i, metric in enumerate(activity_metrics):
+                column = np.zeros(len(user_ids), dtype=np.int64)
+                column[positions] = np.array([row[i + 1] or 0 for row in totals], dtype=np.int64)[known]
+                values[metric] = column
+
+        return user_ids, values
+
+    def backfill(self, rules: Optional[List[AchievementRule]] = None, chunk_size: int = 5000,
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """전체 사용자에 규칙을 적용해 이미 자격이 있는 성취를 부여합니다
+
+        learning_streaks를 user_id 순으로 묶음 단위로 읽어 NumPy 비교로 대상자를 고르고,
+        묶음마다 한 번의 INSERT ... ON CONFLICT DO NOTHING(executemany)으로 추가한 뒤 커밋합니다.
+        ORM 객체는 만들지 않습니다.
+
+        Args:
+            rules: 적용할 규칙 (기본값: 전체 규칙)
+            chunk_size: 한 번에 처리할 사용자 수
+            progress: 묶음마다 누적 결과를 받는 콜백
+
+        Returns:
+            처리한 사용자 수, 평가한 후보 수, 새로 부여한 성취 수
+        """
+        rules = rules or ACHIEVEMENT_RULES
+        unknown = {rule.metric for rule in rules} - set(STREAK_METRICS) - set(ACTIVITY_METRICS)
+        if unknown:
+            raise ValueError(f"백필할 수 없는 지표입니다: {', '.join(sorted(unknown))}")
+
+        metrics = sorted({rule.metric for rule in rules})
+        insert_stmt = dialect_insert(self.db)(Achievement.__table__).on_conflict_do_nothing(
+            index_elements=["user_id", "achievement_key"]
+        ).returning(Achievement.__table__.c.id)
+
+        result = {"users": 0, "candidates": 0, "awarded": 0}
+        last_user_id = 0
+        while True:
+            user_ids, values = self._chunk_values(metrics, last_user_id, chunk_size)
+            if user_ids is None:
+                break
+
+            awards = []
+            for rule in rules:
+                for user_id in user_ids[values[rule.metric] >= rule.threshold]:
+                    awards.append({
+                        "user_id": int(user_id),
+                        "achievement_type": rule.achievement_type,
+                        "achievement_key": rule.key,
+                        "title": rule.title,
+                        "description": rule.description,
+                        "icon": rule.icon,
+                        "color": rule.color
+                    })
+
+            if awards:
+                result["awarded"] += len(self.db.execute(insert_stmt, awards).all())
+            self.db.commit()
+
+            result["users"] += len(user_ids)
+            result["candidates"] += len(awards)
+            last_user_id = int(user_ids[-1])
+            if progress:
+                progress(result)
+
+        return result
+
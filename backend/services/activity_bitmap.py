@@ -0,0 +1,110 @@
+"""
+학습 활동 비트맵
+
+하루에 1비트씩, 기준일(start)부터 지난 일수를 비트 위치로 삼아 학습한 날을 기록합니다.
+현재/최장 연속 학습일, 기간별 학습일 수, 달력은 모두 정수 비트 연산으로 계산합니다.
+저장할 때는 리틀 엔디언 바이트열로 직렬화합니다.
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+
+def _popcount(value: int) -> int:
+    # int.bit_count()는 Python 3.10부터 있으므로 3.9에서도 동작하도록 bin()으로 셉니다.
+    return bin(value).count("1")
+
+
+class ActivityBitmap:
+    """하루 1비트 학습 활동 비트맵 (비트 0 = start)"""
+
+    def __init__(self, start: Optional[date] = None, bits: int = 0):
+        self.start = start
+        self.bits = bits if start else 0
+
+    @classmethod
+    def from_bytes(cls, start: Optional[date], data: Optional[bytes]) -> "ActivityBitmap":
+        return cls(start, int.from_bytes(data or b"", "little"))
+
+    @classmethod
+    def from_dates(cls, days: Iterable[date]) -> "ActivityBitmap":
+        bitmap = cls()
+        for day in days:
+            bitmap.set(day)
+        return bitmap
+
+    def to_bytes(self) -> bytes:
+        return self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+
+    def _offset(self, day: date) -> int:
+        return (day - self.start).days
+
+    def set(self, day: date) -> bool:
+        """학습한 날로 표시합니다 (새로 표시했으면 True)"""
+        if self.start is None:
+            self.start, self.bits = day, 1
+            return True
+        if day < self.start:
+            # 기준일보다 이른 날은 기준일을 앞당기고 기존 비트를 밀어 둡니다.
+            self.bits <<= (self.start - day).days
+            self.start = day
+
+        bit = 1 << self._offset(day)
+        if self.bits & bit:
+            return False
+        self.bits |= bit
+        return True
+
+    def is_active(self, day: date) -> bool:
+        if self.start is None or day < self.start:
+            return False
+        return bool(self.bits >> self._offset(day) & 1)
+
+    def count(self, first: date, last: date) -> int:
+        """first부터 last까지(포함) 학습한 날 수"""
+        if self.start is None:
+            return 0
+        low = max(self._offset(first), 0)
+        high = self._offset(last)
+        if high < low:
+            return 0
+        return _popcount((self.bits >> low) & ((1 << (high - low + 1)) - 1))
+
+    def total(self) -> int:
+        return _popcount(self.bits)
+
+    def last_active(self) -> Optional[date]:
+        if not self.bits:
+            return None
+        return self.start + timedelta(days=self.bits.bit_length() - 1)
+
+    def run_ending_at(self, day: date) -> int:
+        """day에서 끝나는 연속 학습일 수"""
+        if not self.is_active(day):
+            return 0
+        offset = self._offset(day)
+        gaps = ~self.bits & ((1 << (offset + 1)) - 1)
+        return offset + 1 if not gaps else offset - gaps.bit_length() + 1
+
+    def current_streak(self, today: date) -> int:
+        """오늘 기준 연속 학습일 수 (오늘 아직 학습하지 않았으면 어제까지로 계산)"""
+        if self.is_active(today):
+            return self.run_ending_at(today)
+        return self.run_ending_at(today - timedelta(days=1))
+
+    def longest_streak(self) -> int:
+        """가장 긴 연속 학습일 수"""
+        bits, length = self.bits, 0
+        while bits:
+            bits &= bits >> 1
+            length += 1
+        return length
+
+    def days(self, first: date, last: date) -> List[bool]:
+        """first부터 last까지(포함) 날짜별 학습 여부"""
+        length = (last - first).days + 1
+        if self.start is None:
+            return [False] * length
+        offset = self._offset(first)
+        window = self.bits >> offset if offset >= 0 else self.bits << -offset
+        return [bool(window >> i & 1) for i in range(length)]
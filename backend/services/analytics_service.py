@@ -2,21 +2,31 @@ from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import random
 from models.database import SessionLocal
-from models.user import User
+from models.user import UserResponse
 from models.diagnostic import DiagnosticResult
 from models.daily_test import DailyTestResult
 from services.auth_service import AuthService
+from services.study_pattern_service import StudyPatternService
+from services.unit_stats_service import UnitStatsService
+from services.learning_streak_service import LearningStreakService
+from services.weekly_stats_service import WeeklyStatsService
+
+# 단원별 기록이 없는 사용자의 강점/약점 단원
+DEFAULT_STRONGEST_UNIT = "민법총칙"
+DEFAULT_WEAKEST_UNIT = "형법총론"
 
 class AnalyticsService:
-    def __init__(self):
-        self.auth_service = AuthService()
-        self.db = SessionLocal()
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+        self.auth_service = AuthService(self.db)
+        self.weekly_stats_service = WeeklyStatsService(self.db)
+        self.study_pattern_service = StudyPatternService(self.db)
+        self.unit_stats_service = UnitStatsService(self.db)
+        self.learning_streak_service = LearningStreakService(self.db)
     
-    def get_user_dashboard(self, user_id: int) -> Dict[str, Any]:
-        """사용자 대시보드 데이터 조회"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return {"error": "사용자를 찾을 수 없습니다."}
+    def get_user_dashboard(self, user: UserResponse) -> Dict[str, Any]:
+        """사용자 대시보드 데이터 조회 (인증 단계에서 조회한 사용자)"""
+        user_id = user.id
         
         # 기본 통계 계산
         stats = self._calculate_basic_stats(user_id)
@@ -44,11 +54,9 @@ class AnalyticsService:
             "recommendations": recommendations
         }
     
-    def generate_weekly_report(self, user_id: int) -> Dict[str, Any]:
-        """주간 학습 리포트 생성"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return {"error": "사용자를 찾을 수 없습니다."}
+    def generate_weekly_report(self, user: UserResponse) -> Dict[str, Any]:
+        """주간 학습 리포트 생성 (인증 단계에서 조회한 사용자)"""
+        user_id = user.id
         
         # 주간 통계 계산
         weekly_stats = self._calculate_weekly_stats(user_id)
@@ -62,7 +70,7 @@ class AnalyticsService:
         return {
             "user_id": user_id,
             "week_period": {
-                "start": (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d"),
+                "start": weekly_stats["week_start"],
                 "end": datetime.now().strftime("%Y-%m-%d")
             },
             "weekly_stats": weekly_stats,
@@ -137,11 +145,16 @@ class AnalyticsService:
             average_score = 0
             total_wrong_questions = 0
         
-        # 연속 학습일 계산 (간단한 로직)
-        consecutive_days = self._calculate_consecutive_days(daily_test_results)
+        # 연속 학습일 (활동 비트맵)
+        activity_bitmap = self.learning_streak_service.get_activity_bitmap(user_id)
+        consecutive_days = activity_bitmap.current_streak(datetime.now().date())
         
-        # 강점/약점 단원 분석
-        strongest_unit, weakest_unit = self._analyze_unit_performance(daily_test_results)
+        # 강점/약점 단원 (단원별 누적 성과)
+        unit_performance = self.unit_stats_service.get_unit_stats(user_id)
+        strongest_unit, weakest_unit = self.unit_stats_service.get_strongest_weakest(user_id)
+        # 단원 기록이 없으면 기존 기본값 (클라이언트는 두 값을 null이 아닌 문자열로 받음)
+        strongest_unit = strongest_unit or DEFAULT_STRONGEST_UNIT
+        weakest_unit = weakest_unit or DEFAULT_WEAKEST_UNIT
         
         return {
             "total_study_days": total_study_days,
@@ -151,11 +164,12 @@ class AnalyticsService:
             "total_wrong_questions": total_wrong_questions,
             "strongest_unit": strongest_unit,
             "weakest_unit": weakest_unit,
+            "unit_performance": unit_performance,
             "current_streak": consecutive_days,
-            "best_streak": consecutive_days  # 실제로는 더 복잡한 계산 필요
+            "best_streak": activity_bitmap.longest_streak()
         }
     
-    def _calculate_progress(self, user: User) -> Dict[str, Any]:
+    def _calculate_progress(self, user: UserResponse) -> Dict[str, Any]:
         """학습 진행도 계산"""
         # 리트 점수 기반 진행도 (간단한 추정)
         def _parse_score(text: str) -> int:
@@ -217,7 +231,7 @@ class AnalyticsService:
         
         return activities[:10]  # 최근 10개 활동만 반환
     
-    def _generate_recommendations(self, user: User, stats: Dict[str, Any]) -> List[str]:
+    def _generate_recommendations(self, user: UserResponse, stats: Dict[str, Any]) -> List[str]:
         """추천 사항 생성"""
         recommendations = []
         
@@ -244,34 +258,48 @@ class AnalyticsService:
         return recommendations
     
     def _calculate_weekly_stats(self, user_id: int) -> Dict[str, Any]:
-        """주간 통계 계산"""
-        # 더미 데이터 반환
-        return {
-            "questions_solved": 45,
-            "average_score": 82.3,
-            "study_days": 6,
-            "total_study_time": 480,  # 분 단위
-            "wrong_questions": 8,
-            "improvement_rate": 5.2  # 전주 대비 개선률
-        }
+        """주간 통계 계산
+
+        이번 주(월요일부터)만 실시간으로 집계하고, 개선률은 weekly_stats에
+        저장된 직전 학습 주와 비교합니다.
+        """
+        return self.weekly_stats_service.get_current_week_stats(user_id)
     
     def _analyze_learning_pattern(self, user_id: int) -> Dict[str, Any]:
-        """학습 패턴 분석"""
+        """학습 패턴 분석
+
+        야간 배치(jobs.study_patterns)가 저장한 스냅샷만 읽습니다.
+        """
+        snapshot = self.study_pattern_service.get_snapshot(user_id)
+        if not snapshot:
+            return {
+                "preferred_study_time": None,
+                "most_productive_day": None,
+                "average_session_length": 0,
+                "concentration_level": None,
+                "weakest_time_slot": None,
+                "analyzed_at": None
+            }
+        
         return {
-            "preferred_study_time": "저녁",
-            "most_productive_day": "수요일",
-            "average_session_length": 45,  # 분
-            "concentration_level": "높음",
-            "weakest_time_slot": "오후 2-4시"
+            "preferred_study_time": snapshot.preferred_study_time,
+            "most_productive_day": snapshot.most_productive_day,
+            "average_session_length": snapshot.average_session_length,  # 분
+            "concentration_level": snapshot.concentration_level,
+            "weakest_time_slot": snapshot.weakest_time_slot,
+            "hour_histogram": snapshot.hour_histogram,
+            "weekday_histogram": snapshot.weekday_histogram,
+            "analyzed_at": snapshot.computed_at
         }
     
-    def _set_next_week_goals(self, user: User, weekly_stats: Dict[str, Any]) -> Dict[str, Any]:
+    def _set_next_week_goals(self, user: UserResponse, weekly_stats: Dict[str, Any]) -> Dict[str, Any]:
         """다음 주 목표 설정"""
         current_questions = weekly_stats["questions_solved"]
         current_score = weekly_stats["average_score"]
         
         return {
-            "target_questions": int(current_questions * 1.1),  # 10% 증가
+            # 10% 증가 (이번 주 기록이 없으면 일일 모의고사 1회분 15문제)
+            "target_questions": max(int(current_questions * 1.1), 15),
             "target_score": min(current_score + 2, 100),  # 2점 증가
             "target_study_days": 7,
             "focus_units": ["미적분", "확률과통계"],
@@ -291,59 +319,3 @@ class AnalyticsService:
             return "6개월 내"
         else:
             return "1년 내"
-    
-    def _calculate_consecutive_days(self, daily_test_results: List[DailyTestResult]) -> int:
-        """연속 학습일 계산"""
-        if not daily_test_results:
-            return 0
-        
-        # 날짜별로 정렬
-        sorted_results = sorted(daily_test_results, key=lambda x: x.completed_at, reverse=True)
-        
-        consecutive_days = 0
-        current_date = datetime.now().date()
-        
-        for result in sorted_results:
-            result_date = result.completed_at.date()
-            if (current_date - result_date).days == consecutive_days:
-                consecutive_days += 1
-            else:
-                break
-        
-        return consecutive_days
-    
-    def _analyze_unit_performance(self, daily_test_results: List[DailyTestResult]) -> tuple:
-        """단원별 성과 분석"""
-        if not daily_test_results:
-            return "민법총칙", "형법총론"
-        
-        unit_scores = {}
-        
-        for result in daily_test_results:
-            if result.wrong_questions:
-                for question in result.wrong_questions:
-                    unit = question.get('unit', '기타')
-                    if unit not in unit_scores:
-                        unit_scores[unit] = {'correct': 0, 'total': 0}
-                    unit_scores[unit]['total'] += 1
-        
-        if not unit_scores:
-            return "민법총칙", "형법총론"
-        
-        # 정답률 계산
-        unit_accuracies = {}
-        for unit, scores in unit_scores.items():
-            if scores['total'] > 0:
-                unit_accuracies[unit] = (scores['correct'] / scores['total']) * 100
-            else:
-                unit_accuracies[unit] = 0
-        
-        # 강점/약점 단원 찾기
-        if unit_accuracies:
-            strongest_unit = max(unit_accuracies, key=unit_accuracies.get)
-            weakest_unit = min(unit_accuracies, key=unit_accuracies.get)
-        else:
-            strongest_unit = "민법총칙"
-            weakest_unit = "형법총론"
-        
-        return strongest_unit, weakest_unit 
\ No newline at end of file
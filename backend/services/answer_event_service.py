@@ -0,0 +1,53 @@
+"""
+문항 응답 이벤트 서비스
+
+채점 결과를 answer_events에 기록합니다.
+단원/문항 집계는 unit_stats(UnitStatsService)와 item_stats(ItemStatsService)에서 읽습니다.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from models.answer_event import AnswerEvent
+from models.database import SessionLocal
+
+
+class AnswerEventService:
+    """문항 응답 이벤트 기록 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+
+    def record_answers(self, user_id: int, source_type: str, source_id: Optional[int],
+                       answers: List[Dict[str, Any]], answered_at: Optional[datetime] = None):
+        """제출 한 건의 응답들을 executemany 한 번으로 기록합니다
+
+        커밋하지 않으므로 호출한 쪽에서 결과 저장과 같은 트랜잭션으로 커밋합니다.
+
+        Args:
+            user_id: 사용자 ID
+            source_type: 출처 (diagnostic, daily_test, review)
+            source_id: 출처 ID
+            answers: question_id, is_correct, user_answer, time_taken(선택) 딕셔너리 목록
+            answered_at: 응답 시각 (기본값: 현재 시각)
+        """
+        if not answers:
+            return
+
+        answered_at = answered_at or datetime.now()
+        rows = [
+            {
+                "user_id": user_id,
+                "question_id": answer["question_id"],
+                "source_type": source_type,
+                "source_id": source_id,
+                "is_correct": answer["is_correct"],
+                "user_answer": answer.get("user_answer"),
+                "time_taken": answer.get("time_taken"),
+                "answered_at": answered_at
+            }
+            for answer in answers
+        ]
+        self.db.execute(insert(AnswerEvent.__table__), rows)
@@ -1,9 +1,15 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
+import hashlib
+import os
+import secrets
+import threading
+import time
+from sqlalchemy import update
 from models.database import SessionLocal
-from models.user import User, UserCreate, UserResponse
+from models.user import RefreshToken, User, UserCreate, UserResponse
 
 # 비밀번호 해싱 설정
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -12,6 +18,25 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = "your-secret-key-here"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+# 인증된 사용자 캐시 유지 시간 (초)
+USER_CACHE_TTL_SECONDS = 30
+
+# 프로세스 안 사용자 캐시: user_id -> (만료 시각, 사용자)
+_user_cache: Dict[int, Tuple[float, UserResponse]] = {}
+_user_cache_lock = threading.Lock()
+
+
+def invalidate_user(user_id: int):
+    """사용자 정보가 바뀌었을 때 캐시에서 지웁니다"""
+    with _user_cache_lock:
+        _user_cache.pop(int(user_id), None)
+
+
+def hash_refresh_token(token: str) -> str:
+    """리프레시 토큰 저장/조회용 해시 (토큰 자체가 무작위 256비트라 솔트가 필요 없음)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
 class AuthService:
     def __init__(self, db_session=None):
@@ -73,21 +98,10 @@ class AuthService:
         self.db.commit()
         self.db.refresh(db_user)
         
-        return UserResponse(
-            id=db_user.id,
-            email=db_user.email,
-            name=db_user.name,
-            grade=db_user.grade,
-            target_grade=db_user.target_grade,
-            study_time=db_user.study_time,
-            learning_style=db_user.learning_style,
-            diagnostic_completed=db_user.diagnostic_completed,
-            created_at=db_user.created_at,
-            updated_at=db_user.updated_at
-        )
+        return self._user_response(db_user)
     
-    def login_user(self, email: str, password: str) -> str:
-        """사용자 로그인"""
+    def login_user(self, email: str, password: str) -> Dict[str, str]:
+        """사용자 로그인 (액세스 토큰과 리프레시 토큰 발급)"""
         # 사용자 조회
         user = self.db.query(User).filter(User.email == email).first()
         if not user:
@@ -97,20 +111,93 @@ class AuthService:
         if not self.verify_password(password, user.password_hash):
             raise Exception("이메일 또는 비밀번호가 잘못되었습니다.")
         
-        # JWT 토큰 생성
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        # 만료된 리프레시 토큰 정리
+        self.db.query(RefreshToken).filter(
+            RefreshToken.user_id == user.id,
+            RefreshToken.expires_at < datetime.utcnow()
+        ).delete(synchronize_session=False)
+        
+        return self._issue_tokens(user.id)
+    
+    def _issue_tokens(self, user_id: int, family_id: Optional[str] = None) -> Dict[str, str]:
+        """액세스 토큰과 새 리프레시 토큰을 발급하고 커밋합니다"""
         access_token = self.create_access_token(
-            data={"sub": str(user.id)}, expires_delta=access_token_expires
+            data={"sub": str(user_id)}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         )
         
-        return access_token
+        refresh_token = secrets.token_urlsafe(32)
+        self.db.add(RefreshToken(
+            user_id=user_id,
+            token_hash=hash_refresh_token(refresh_token),
+            family_id=family_id or secrets.token_hex(16),
+            expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        ))
+        self.db.commit()
+        
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer"
+        }
     
-    def get_user_by_id(self, user_id: int) -> Optional[UserResponse]:
-        """ID로 사용자 조회"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return None
+    def refresh_access_token(self, refresh_token: str) -> Dict[str, str]:
+        """리프레시 토큰으로 새 액세스 토큰 발급 (리프레시 토큰도 회전)
+        
+        비밀번호 검증 없이 해시 인덱스로 한 행을 찾아 폐기하는 UPDATE 한 번과
+        새 토큰 INSERT 한 번으로 끝납니다. 이미 회전된 토큰이 다시 쓰이면
+        탈취된 것으로 보고 같은 로그인에서 나온 토큰을 모두 폐기합니다.
+        """
+        now = datetime.utcnow()
+        token_hash = hash_refresh_token(refresh_token)
+        table = RefreshToken.__table__
         
+        row = self.db.execute(
+            update(table)
+            .where(
+                table.c.token_hash == token_hash,
+                table.c.revoked_at.is_(None),
+                table.c.expires_at > now
+            )
+            .values(revoked_at=now)
+            .returning(table.c.user_id, table.c.family_id)
+        ).first()
+        
+        if not row:
+            reused = self.db.query(RefreshToken.family_id).filter(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.isnot(None)
+            ).first()
+            if reused:
+                self._revoke_family(reused.family_id, now)
+            self.db.commit()
+            raise Exception("리프레시 토큰이 유효하지 않습니다.")
+        
+        # 탈퇴(삭제)한 사용자는 남은 리프레시 토큰으로 계속 발급받지 못하게 합니다.
+        if not self.db.query(User.id).filter(User.id == row.user_id).first():
+            self._revoke_family(row.family_id, now)
+            self.db.commit()
+            raise Exception("사용자를 찾을 수 없습니다.")
+        
+        return self._issue_tokens(row.user_id, row.family_id)
+    
+    def revoke_refresh_token(self, refresh_token: str):
+        """로그아웃: 리프레시 토큰과 같은 로그인에서 회전된 토큰을 모두 폐기"""
+        token = self.db.query(RefreshToken.family_id).filter(
+            RefreshToken.token_hash == hash_refresh_token(refresh_token)
+        ).first()
+        if token:
+            self._revoke_family(token.family_id, datetime.utcnow())
+            self.db.commit()
+    
+    def _revoke_family(self, family_id: str, now: datetime):
+        table = RefreshToken.__table__
+        self.db.execute(
+            update(table)
+            .where(table.c.family_id == family_id, table.c.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+    
+    def _user_response(self, user: User) -> UserResponse:
         return UserResponse(
             id=user.id,
             email=user.email,
@@ -124,6 +211,33 @@ class AuthService:
             updated_at=user.updated_at
         )
     
+    def get_user_by_id(self, user_id: int) -> Optional[UserResponse]:
+        """ID로 사용자 조회"""
+        user = self.db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return None
+        
+        return self._user_response(user)
+    
+    def get_current_user(self, user_id: int) -> Optional[UserResponse]:
+        """인증된 사용자 조회 (USER_CACHE_TTL_SECONDS 동안 캐시)
+        
+        요청마다 사용자 행을 다시 읽지 않도록 조회 결과를 짧게 캐시합니다.
+        사용자 정보를 바꾸는 쪽에서는 invalidate_user()로 캐시를 지웁니다.
+        """
+        user_id = int(user_id)
+        now = time.monotonic()
+        with _user_cache_lock:
+            cached = _user_cache.get(user_id)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        user = self.get_user_by_id(user_id)
+        if user:
+            with _user_cache_lock:
+                _user_cache[user_id] = (now + USER_CACHE_TTL_SECONDS, user)
+        return user
+    
     def update_user_profile(self, user_id: int, **kwargs) -> Optional[UserResponse]:
         """사용자 프로필 업데이트"""
         user = self.db.query(User).filter(User.id == user_id).first()
@@ -140,16 +254,6 @@ class AuthService:
         user.updated_at = datetime.now()
         self.db.commit()
         self.db.refresh(user)
+        invalidate_user(user_id)
         
-        return UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            grade=user.grade,
-            target_grade=user.target_grade,
-            study_time=user.study_time,
-            learning_style=user.learning_style,
-            diagnostic_completed=user.diagnostic_completed,
-            created_at=user.created_at,
-            updated_at=user.updated_at
-        ) 
\ No newline at end of file
+        return self._user_response(user) 
\ No newline at end of file
@@ -5,16 +5,24 @@ import numpy as np
 from sklearn.cluster import KMeans
 
 from models.database import SessionLocal
-from models.user import User
+from models.user import User, UserResponse
 from models.question import QuestionBank, QuestionService
 from models.diagnostic import DiagnosticResult
-from services.auth_service import AuthService
+from services.auth_service import AuthService, invalidate_user
+from services.answer_event_service import AnswerEventService
+from services.ranking_service import RankingService
+from services.unit_stats_service import UnitStatsService
+from services.learning_streak_service import LearningStreakService
 
 class DiagnosticService:
-    def __init__(self):
+    def __init__(self, db_session=None):
         self.question_service = QuestionService()
         self.auth_service = AuthService()
-        self.db = SessionLocal()
+        self.db = db_session or SessionLocal()
+        self.answer_event_service = AnswerEventService(self.db)
+        self.ranking_service = RankingService(self.db)
+        self.unit_stats_service = UnitStatsService(self.db)
+        self.learning_streak_service = LearningStreakService(self.db)
     
     def get_diagnostic_questions(self) -> List[Dict[str, Any]]:
         """진단 평가 문제 목록 조회 (30문제)"""
@@ -69,6 +77,7 @@ class DiagnosticService:
         total_points = 0
         unit_scores = {}
         wrong_questions = []
+        answer_events = []
         
         for question in questions:
             question_id = str(question.id)
@@ -76,6 +85,13 @@ class DiagnosticService:
             correct_answer = question.correct_answer
             
             total_points += question.points
+            answer_events.append({
+                "question_id": question.id,
+                "is_correct": user_answer == correct_answer,
+                "user_answer": user_answer,
+                "unit": question.unit,
+                "points": question.points
+            })
             
             if user_answer == correct_answer:
                 total_score += question.points
@@ -144,6 +160,15 @@ class DiagnosticService:
         )
         
         self.db.add(diagnostic_result)
+        self.db.flush()
+        
+        # 문항별 응답 기록 (정답 포함) 및 단원별 누적 성과 반영
+        self.answer_event_service.record_answers(
+            user_id, "diagnostic", diagnostic_result.id, answer_events
+        )
+        self.unit_stats_service.record_results(user_id, answer_events)
+        # 학습한 날로 표시 (대시보드 연속 학습일은 활동 비트맵 기준)
+        self.learning_streak_service.mark_study_day(user_id)
         
         # 사용자 진단 완료 상태 업데이트
         user = self.db.query(User).filter(User.id == user_id).first()
@@ -151,26 +176,38 @@ class DiagnosticService:
             user.diagnostic_completed = True
             user.grade = estimated_grade  # 예상 등급으로 업데이트
         
+        # 점수 분포 누적 후 백분위/순위 계산
+        self.ranking_service.record_score("diagnostic", accuracy)
         self.db.commit()
+        invalidate_user(user_id)  # 진단 완료 여부와 등급이 바뀜
+        self.ranking_service.apply_score("diagnostic", accuracy)
+        
+        standing = self.ranking_service.get_standing("diagnostic", accuracy)
+        result["percentile"] = standing["percentile"]
+        result["rank"] = standing["rank"]
         
         return result
     
-    def get_user_diagnostic_result(self, user_id: int) -> Dict[str, Any]:
-        """사용자의 최근 진단 결과 조회"""
+    def get_user_diagnostic_result(self, user: UserResponse) -> Dict[str, Any]:
+        """사용자의 최근 진단 결과 조회 (인증 단계에서 조회한 사용자)"""
+        user_id = user.id
         # 가장 최근 진단 결과 조회
         latest_result = self.db.query(DiagnosticResult).filter(
             DiagnosticResult.user_id == user_id
         ).order_by(DiagnosticResult.completed_at.desc()).first()
         
         if latest_result:
+            result = latest_result.to_dict()
+            standing = self.ranking_service.get_standing("diagnostic", latest_result.accuracy)
+            result["percentile"] = standing["percentile"]
+            result["rank"] = standing["rank"]
             return {
                 "diagnostic_completed": True,
-                "result": latest_result.to_dict()
+                "result": result
             }
         
         # 진단 결과가 없으면 사용자 정보에서 확인
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if user and user.diagnostic_completed:
+        if user.diagnostic_completed:
             return {
                 "diagnostic_completed": True,
                 "user_info": {
@@ -181,12 +218,8 @@ class DiagnosticService:
         
         return {"diagnostic_completed": False}
     
-    def analyze_learning_pattern(self, user_id: int) -> Dict[str, Any]:
-        """학습 패턴 분석 및 전략 제안"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return {"error": "사용자를 찾을 수 없습니다."}
-        
+    def analyze_learning_pattern(self, user: UserResponse) -> Dict[str, Any]:
+        """학습 패턴 분석 및 전략 제안 (인증 단계에서 조회한 사용자)"""
         # 간단한 학습 전략 제안
         strategies = {
             "concept_first": "개념 이해를 우선으로 하는 학습",
@@ -197,7 +230,7 @@ class DiagnosticService:
         recommended_strategy = strategies.get(user.learning_style, "mixed")
         
         return {
-            "user_id": user_id,
+            "user_id": user.id,
             "current_grade": user.grade,
             "target_grade": user.target_grade,
             "study_time": user.study_time,
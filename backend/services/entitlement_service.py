@@ -0,0 +1,108 @@
+"""
+이용권 권한 서비스
+
+사용자의 활성 이용권(요금제와 기능 목록)을 프로세스 안에 캐시해, 유료 기능을
+확인할 때마다 user_vouchers/vouchers를 조회하지 않도록 합니다. 캐시 유지 시간은
+ENTITLEMENT_CACHE_TTL_SECONDS와 이용권 만료 시각 중 이른 쪽까지이므로
+만료된 이용권이 캐시 때문에 더 쓰이지는 않습니다.
+
+만료된 이용권의 is_active는 jobs.voucher_expiry가 한 번의 UPDATE로 내립니다.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from sqlalchemy import or_, update
+
+from models.database import SessionLocal
+from models.voucher import UserVoucher, Voucher
+
+# 권한 캐시 유지 시간 (초)
+ENTITLEMENT_CACHE_TTL_SECONDS = 60
+
+# 프로세스 안 권한 캐시: user_id -> (만료 시각(monotonic), 권한)
+_entitlements: Dict[int, Tuple[float, "Entitlement"]] = {}
+_entitlements_lock = threading.Lock()
+
+
+class Entitlement(NamedTuple):
+    """사용자가 지금 쓸 수 있는 요금제와 기능"""
+    plan: Optional[str]  # pro, basic, light (이용권이 없으면 None)
+    features: FrozenSet[str]
+    expires_at: Optional[datetime]
+
+    def has_plan(self, *plans: str) -> bool:
+        return self.plan is not None and self.plan in plans
+
+    def has_feature(self, feature: str) -> bool:
+        return feature in self.features
+
+
+FREE = Entitlement(plan=None, features=frozenset(), expires_at=None)
+
+
+def invalidate_entitlement(user_id: int):
+    """이용권을 구매/해지했을 때 캐시에서 지웁니다"""
+    with _entitlements_lock:
+        _entitlements.pop(int(user_id), None)
+
+
+class EntitlementService:
+    """이용권 권한 조회/만료 처리 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+
+    def _load(self, user_id: int, now: datetime) -> Entitlement:
+        row = self.db.query(Voucher.type, Voucher.features, UserVoucher.expires_at).join(
+            UserVoucher, UserVoucher.voucher_id == Voucher.id
+        ).filter(
+            UserVoucher.user_id == user_id,
+            UserVoucher.is_active == True,
+            or_(UserVoucher.expires_at.is_(None), UserVoucher.expires_at > now)
+        ).order_by(UserVoucher.id.desc()).first()
+
+        if not row:
+            return FREE
+        return Entitlement(plan=row.type, features=frozenset(row.features or []), expires_at=row.expires_at)
+
+    def get_entitlement(self, user_id: int) -> Entitlement:
+        """사용자의 현재 권한 (캐시에 있으면 조회하지 않음)"""
+        user_id = int(user_id)
+        monotonic_now = time.monotonic()
+        with _entitlements_lock:
+            cached = _entitlements.get(user_id)
+        if cached and cached[0] > monotonic_now:
+            return cached[1]
+
+        now = datetime.now()
+        entitlement = self._load(user_id, now)
+
+        ttl = ENTITLEMENT_CACHE_TTL_SECONDS
+        if entitlement.expires_at is not None:
+            ttl = min(ttl, (entitlement.expires_at - now).total_seconds())
+        with _entitlements_lock:
+            _entitlements[user_id] = (monotonic_now + ttl, entitlement)
+        return entitlement
+
+    def expire_vouchers(self, now: Optional[datetime] = None) -> int:
+        """만료 시각이 지난 활성 이용권을 한 번의 UPDATE로 비활성화합니다
+
+        Returns:
+            비활성화한 이용권 수
+        """
+        now = now or datetime.now()
+        table = UserVoucher.__table__
+        result = self.db.execute(
+            update(table)
+            .where(
+                table.c.is_active == True,
+                table.c.expires_at.isnot(None),
+                table.c.expires_at <= now
+            )
+            .values(is_active=False)
+        )
+        self.db.commit()
+        return result.rowcount
@@ -0,0 +1,263 @@
+"""
+Parquet 내보내기 서비스
+
+분석용 테이블을 묶음 단위(yield_per)로 읽어 월별로 나뉜 Parquet 파일로 씁니다.
+JSON 컬럼은 별도 데이터셋의 일반 컬럼으로 펼치고, 테이블별 최고 수위(high-water mark)를
+상태 파일에 저장해 다음 실행에서는 그 이후에 생기거나 바뀐 행만 내보냅니다.
+
+최고 수위는 마지막으로 내보낸 변경 시각과 그 시각에 내보낸 행 id 목록입니다. 다음 실행은
+그 시각 이상(>=)인 행을 읽고 목록에 있는 id만 건너뛰므로, 같은 시각을 가진 행이
+실행 뒤에 커밋되어도 빠지지 않습니다. SQLite는 시각을 문자열로 비교하는데 서버 기본값은
+초 단위('YYYY-MM-DD HH:MM:SS'), ORM이 쓴 값은 마이크로초까지 저장되므로 양쪽을
+strftime으로 같은 형식(밀리초)으로 맞춘 뒤 비교합니다.
+
+전체 내보내기(full)는 새 파일을 모두 쓴 뒤 해당 데이터셋의 이전 파일을 지웁니다.
+
+출력 구조:
+    <output_dir>/<dataset>/month=YYYY-MM/part-<실행시각>-<번호>.parquet
+    <output_dir>/_export_state.json
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+from sqlalchemy import func, select
+
+from models.daily_test import DailyTestResult
+from models.database import SessionLocal
+from models.diagnostic import DiagnosticResult
+from models.learning_streak import DailyActivity
+from models.wrong_answer import WrongAnswer, WrongAnswerReview
+
+STATE_FILE = "_export_state.json"
+
+# SQLite 변경 시각 비교 형식 (%f는 초.밀리초)
+SQLITE_CHANGED_AT_FORMAT = "%Y-%m-%d %H:%M:%f"
+
+
+def _wrong_question_rows(row: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """wrong_questions JSON -> 결과별 오답 문항 행"""
+    return [
+        {
+            "result_id": row["id"],
+            "user_id": row["user_id"],
+            "completed_at": row["completed_at"],
+            "question_id": question.get("id"),
+            "unit": question.get("unit"),
+            "points": question.get("points"),
+            "user_answer": question.get("user_answer"),
+            "correct_answer": question.get("correct_answer"),
+        }
+        for question in row.get("wrong_questions") or []
+    ]
+
+
+def _unit_score_rows(row: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """unit_scores JSON -> 결과별 단원 점수 행"""
+    return [
+        {
+            "result_id": row["id"],
+            "user_id": row["user_id"],
+            "completed_at": row["completed_at"],
+            "unit": unit,
+            "correct": scores.get("correct", 0),
+            "total": scores.get("total", 0),
+        }
+        for unit, scores in (row.get("unit_scores") or {}).items()
+    ]
+
+
+# 데이터셋 이름 -> (모델, 변경 시각 식, 파티션 기준 컬럼, 펼칠 JSON 컬럼 {컬럼: (자식 데이터셋, 변환 함수)})
+EXPORTS: Dict[str, Dict[str, Any]] = {
+    "daily_test_results": {
+        "model": DailyTestResult,
+        "changed_at": DailyTestResult.completed_at,
+        "partition_by": "completed_at",
+        "flatten": {"wrong_questions": ("daily_test_wrong_questions", _wrong_question_rows)},
+    },
+    "diagnostic_results": {
+        "model": DiagnosticResult,
+        "changed_at": DiagnosticResult.completed_at,
+        "partition_by": "completed_at",
+        "flatten": {
+            "wrong_questions": ("diagnostic_wrong_questions", _wrong_question_rows),
+            "unit_scores": ("diagnostic_unit_scores", _unit_score_rows),
+        },
+    },
+    # 수정되는 테이블은 updated_at 기준으로 다시 내보내므로 분석 시 id로 최신 행을 고릅니다.
+    "wrong_answers": {
+        "model": WrongAnswer,
+        "changed_at": func.coalesce(WrongAnswer.updated_at, WrongAnswer.created_at),
+        "partition_by": "created_at",
+        "flatten": {},
+    },
+    "wrong_answer_reviews": {
+        "model": WrongAnswerReview,
+        "changed_at": WrongAnswerReview.created_at,
+        "partition_by": "created_at",
+        "flatten": {},
+    },
+    "daily_activities": {
+        "model": DailyActivity,
+        "changed_at": func.coalesce(DailyActivity.updated_at, DailyActivity.created_at),
+        "partition_by": "activity_date",
+        "flatten": {},
+    },
+}
+
+
+class ParquetExportService:
+    """분석용 Parquet 스냅샷 내보내기"""
+
+    def __init__(self, output_dir: str, db_session=None, chunk_size: int = 5000):
+        self.db = db_session or SessionLocal()
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+        self.run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        self._is_sqlite = self.db.get_bind().dialect.name == "sqlite"
+
+    # 상태 파일
+
+    def _load_state(self) -> Dict[str, Any]:
+        path = os.path.join(self.output_dir, STATE_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _high_water(self, name: str) -> Tuple[Optional[str], Set[int]]:
+        """(마지막 변경 시각, 그 시각에 내보낸 id) (이전 형식의 문자열 값은 id 목록 없이 읽음)"""
+        value = self._load_state().get(name)
+        if isinstance(value, str):
+            return self._normalize(value), set()
+        if not value:
+            return None, set()
+        return self._normalize(value["changed_at"]), set(value["ids"])
+
+    def _normalize(self, changed_at: str) -> str:
+        """저장된 최고 수위 -> 이번 방언의 비교 형식"""
+        if self._is_sqlite:
+            return datetime.fromisoformat(changed_at).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        return changed_at
+
+    def _changed_at_key(self, value) -> str:
+        """조회한 변경 시각 -> 최고 수위 문자열 (SQLite는 이미 비교 형식의 문자열)"""
+        return value if self._is_sqlite else pd.Timestamp(value).isoformat()
+
+    def _save_state(self, state: Dict[str, Any]):
+        path = os.path.join(self.output_dir, STATE_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    # 쓰기
+
+    def _write_partitioned(self, dataset: str, rows: List[Dict[str, Any]], partition_by: str,
+                           part: int) -> int:
+        """행 묶음을 월별 파티션 파일로 씁니다"""
+        if not rows:
+            return 0
+
+        frame = pd.DataFrame.from_records(rows)
+        months = pd.to_datetime(frame[partition_by]).dt.strftime("%Y-%m")
+        for month, chunk in frame.groupby(months):
+            directory = os.path.join(self.output_dir, dataset, f"month={month}")
+            os.makedirs(directory, exist_ok=True)
+            chunk.to_parquet(
+                os.path.join(directory, f"part-{self.run_id}-{part:05d}.parquet"), index=False
+            )
+        return len(frame)
+
+    def _remove_previous_parts(self, dataset: str):
+        """이번 실행이 쓰지 않은 파티션 파일과 빈 파티션 디렉터리를 지웁니다"""
+        root = os.path.join(self.output_dir, dataset)
+        if not os.path.isdir(root):
+            return
+        current = f"part-{self.run_id}-"
+        for month in os.listdir(root):
+            directory = os.path.join(root, month)
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                if filename.startswith("part-") and not filename.startswith(current):
+                    os.remove(os.path.join(directory, filename))
+            if not os.listdir(directory):
+                os.rmdir(directory)
+
+    def export_table(self, name: str, full: bool = False,
+                     progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """테이블 하나를 내보냅니다
+
+        Args:
+            name: EXPORTS의 데이터셋 이름
+            full: True면 최고 수위를 무시하고 전체를 다시 내보낸 뒤 이전 파일을 지움
+            progress: (데이터셋, 누적 행 수)를 받는 진행 상황 콜백
+
+        Returns:
+            데이터셋별 내보낸 행 수
+        """
+        spec = EXPORTS[name]
+        model = spec["model"]
+        changed_at_expr = spec["changed_at"]
+        if self._is_sqlite:
+            changed_at_expr = func.strftime(SQLITE_CHANGED_AT_FORMAT, changed_at_expr)
+        changed_at = changed_at_expr.label("_changed_at")
+        columns = [column.name for column in model.__table__.columns]
+
+        high_water, exported_ids = (None, set()) if full else self._high_water(name)
+
+        stmt = select(model.__table__, changed_at).order_by(changed_at, model.__table__.c.id)
+        if high_water:
+            bound = high_water if self._is_sqlite else datetime.fromisoformat(high_water)
+            stmt = stmt.where(changed_at_expr >= bound)
+
+        counts = {name: 0, **{child: 0 for child, _ in spec["flatten"].values()}}
+        latest, latest_ids = high_water, set(exported_ids)
+        result = self.db.execute(stmt.execution_options(yield_per=self.chunk_size))
+
+        for part, chunk in enumerate(result.mappings().partitions()):
+            rows = []
+            children: Dict[str, List[Dict[str, Any]]] = {child: [] for child in counts if child != name}
+            for mapping in chunk:
+                row_changed_at = self._changed_at_key(mapping["_changed_at"])
+                if row_changed_at == high_water and mapping["id"] in exported_ids:
+                    continue
+                if row_changed_at != latest:
+                    latest, latest_ids = row_changed_at, set()
+                latest_ids.add(mapping["id"])
+
+                row = {column: mapping[column] for column in columns}
+                for column, (child, flatten) in spec["flatten"].items():
+                    children[child].extend(flatten(row))
+                    row.pop(column)
+                rows.append(row)
+
+            counts[name] += self._write_partitioned(name, rows, spec["partition_by"], part)
+            for child, child_rows in children.items():
+                counts[child] += self._write_partitioned(child, child_rows, "completed_at", part)
+            if progress:
+                progress(name, counts[name])
+
+        # 모든 파일을 쓴 뒤에만 이전 파일을 지우고 최고 수위를 올립니다.
+        if full:
+            for dataset in counts:
+                self._remove_previous_parts(dataset)
+        if latest is not None:
+            state = self._load_state()
+            state[name] = {"changed_at": latest, "ids": sorted(latest_ids)}
+            self._save_state(state)
+
+        return counts
+
+    def export_all(self, tables: Optional[List[str]] = None, full: bool = False,
+                   progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """여러 테이블을 차례로 내보냅니다"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        counts: Dict[str, int] = {}
+        for name in tables or list(EXPORTS):
+            counts.update(self.export_table(name, full=full, progress=progress))
+        return counts
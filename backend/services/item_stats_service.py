@@ -0,0 +1,282 @@
+"""
+문항 통계 서비스
+
+answer_events의 채점 응답을 문항별 충분통계량(응답 수, 정답 수, 제출 총점 합/제곱합,
+정답자 총점 합)과 답안별 선택 수로 누적하고, 이로부터 정답률(p-value)과
+점이연 상관(point-biserial) 변별도를 계산해 item_stats에 저장합니다.
+
+job_checkpoints에 마지막으로 반영한 answer_events.id를 남겨 다음 실행에서는
+그 이후의 응답만 더합니다.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import case, func
+
+from models.analytics import ItemStats, JobCheckpoint
+from models.answer_event import AnswerEvent
+from models.database import SessionLocal, dialect_insert
+from models.question import QuestionBank
+
+JOB_NAME = "item_stats"
+
+# 채점 제출로 보는 응답 출처 (오답 복습은 제외)
+GRADED_SOURCES = ("diagnostic", "daily_test")
+
+# 아직 커밋 중일 수 있는 최근 응답은 다음 실행으로 미룹니다 (초)
+SETTLE_SECONDS = 300
+
+# 판정 기준
+MIN_ATTEMPTS_FOR_FLAGS = 30
+TOO_EASY_P = 0.9
+TOO_HARD_P = 0.2
+LOW_DISCRIMINATION = 0.1
+
+
+def item_metrics(attempts: np.ndarray, correct: np.ndarray, score_sum: np.ndarray,
+                 score_sq_sum: np.ndarray, correct_score_sum: np.ndarray):
+    """충분통계량 배열 -> (정답률, 점이연 상관) 배열
+
+    정답자/오답자 중 한쪽이 없거나 총점 분산이 0이면 변별도는 NaN입니다.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = correct / attempts
+        mean = score_sum / attempts
+        variance = score_sq_sum / attempts - mean ** 2
+        wrong = attempts - correct
+        mean_correct = correct_score_sum / correct
+        mean_wrong = (score_sum - correct_score_sum) / wrong
+        r = (mean_correct - mean_wrong) / np.sqrt(variance) * np.sqrt(p * (1 - p))
+
+    valid = (correct > 0) & (wrong > 0) & (variance > 1e-12)
+    return p, np.where(valid, r, np.nan)
+
+
+def _nullable(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+class ItemStatsService:
+    """문항 통계 누적/조회 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+
+    # 배치
+
+    def _checkpoint(self) -> JobCheckpoint:
+        checkpoint = self.db.query(JobCheckpoint).filter(JobCheckpoint.job_name == JOB_NAME).first()
+        if not checkpoint:
+            checkpoint = JobCheckpoint(job_name=JOB_NAME, last_id=0)
+            self.db.add(checkpoint)
+            self.db.flush()
+        return checkpoint
+
+    def _submission_scores(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """묶음에 등장한 제출들의 총점(정답률 0-1)
+
+        제출이 묶음 경계에 걸쳐도 총점은 그 제출의 전체 응답으로 계산합니다.
+        """
+        scores = []
+        for source_type, group in frame.groupby("source_type"):
+            source_ids = [int(i) for i in group["source_id"].dropna().unique()]
+            if not source_ids:
+                continue
+            rows = self.db.query(
+                AnswerEvent.source_id,
+                func.avg(case((AnswerEvent.is_correct == True, 1.0), else_=0.0))
+            ).filter(
+                AnswerEvent.source_type == source_type,
+                AnswerEvent.source_id.in_(source_ids)
+            ).group_by(AnswerEvent.source_id).all()
+            scores.extend((source_type, source_id, float(score)) for source_id, score in rows)
+
+        return pd.DataFrame(scores, columns=["source_type", "source_id", "score"])
+
+    def _fold_chunk(self, frame: pd.DataFrame) -> int:
+        """응답 묶음을 문항별 누적값에 더해 upsert합니다"""
+        frame = frame.merge(self._submission_scores(frame), on=["source_type", "source_id"], how="left")
+        frame["score"] = frame["score"].fillna(frame["is_correct"].astype(float))
+
+        question_ids, inverse = np.unique(frame["question_id"].to_numpy(), return_inverse=True)
+        is_correct = frame["is_correct"].to_numpy(dtype=float)
+        score = frame["score"].to_numpy(dtype=float)
+
+        attempts = np.bincount(inverse).astype(float)
+        correct = np.bincount(inverse, weights=is_correct)
+        score_sum = np.bincount(inverse, weights=score)
+        score_sq_sum = np.bincount(inverse, weights=score ** 2)
+        correct_score_sum = np.bincount(inverse, weights=score * is_correct)
+
+        option_counts: Dict[int, Dict[str, int]] = {int(q): {} for q in question_ids}
+        answers = frame.assign(user_answer=frame["user_answer"].fillna(""))
+        for (question_id, answer), count in answers.groupby(["question_id", "user_answer"]).size().items():
+            option_counts[int(question_id)][answer] = int(count)
+
+        # 기존 누적값 더하기
+        existing = {
+            row.question_id: row
+            for row in self.db.query(ItemStats).filter(ItemStats.question_id.in_(option_counts)).all()
+        }
+        for i, question_id in enumerate(question_ids):
+            row = existing.get(int(question_id))
+            if not row:
+                continue
+            attempts[i] += row.attempts
+            correct[i] += row.correct
+            score_sum[i] += row.score_sum
+            score_sq_sum[i] += row.score_sq_sum
+            correct_score_sum[i] += row.correct_score_sum
+            merged = dict(row.option_counts or {})
+            for answer, count in option_counts[int(question_id)].items():
+                merged[answer] = merged.get(answer, 0) + count
+            option_counts[int(question_id)] = merged
+
+        p_values, discriminations = item_metrics(
+            attempts, correct, score_sum, score_sq_sum, correct_score_sum
+        )
+
+        now = datetime.now()
+        rows = [
+            {
+                "question_id": int(question_id),
+                "attempts": int(attempts[i]),
+                "correct": int(correct[i]),
+                "score_sum": float(score_sum[i]),
+                "score_sq_sum": float(score_sq_sum[i]),
+                "correct_score_sum": float(correct_score_sum[i]),
+                "option_counts": option_counts[int(question_id)],
+                "p_value": _nullable(p_values[i]),
+                "discrimination": _nullable(discriminations[i]),
+                "updated_at": now
+            }
+            for i, question_id in enumerate(question_ids)
+        ]
+
+        insert = dialect_insert(self.db)
+        stmt = insert(ItemStats.__table__).values(rows)
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["question_id"],
+            set_={key: stmt.excluded[key] for key in rows[0] if key != "question_id"}
+        ))
+        return len(rows)
+
+    def update(self, chunk_size: int = 10000, settle_seconds: int = SETTLE_SECONDS) -> Dict[str, int]:
+        """마지막 실행 이후의 채점 응답을 누적합니다
+
+        묶음마다 누적값과 진행 위치를 같은 트랜잭션으로 커밋하므로 중단되어도
+        다음 실행이 이어서 처리합니다.
+
+        Returns:
+            처리한 응답 수, 갱신한 문항 수(중복 포함), 묶음 수
+        """
+        checkpoint = self._checkpoint()
+        cutoff = datetime.now() - timedelta(seconds=settle_seconds)
+
+        # 아직 정착되지 않은 첫 응답 이전까지만 처리해 진행 위치가 건너뛰지 않게 합니다.
+        upper = self.db.query(func.min(AnswerEvent.id)).filter(
+            AnswerEvent.id > checkpoint.last_id,
+            AnswerEvent.answered_at > cutoff
+        ).scalar()
+
+        result = {"events": 0, "items": 0, "chunks": 0}
+        while True:
+            query = self.db.query(
+                AnswerEvent.id, AnswerEvent.question_id, AnswerEvent.source_type,
+                AnswerEvent.source_id, AnswerEvent.is_correct, AnswerEvent.user_answer
+            ).filter(AnswerEvent.id > checkpoint.last_id)
+            if upper is not None:
+                query = query.filter(AnswerEvent.id < upper)
+            rows = query.order_by(AnswerEvent.id).limit(chunk_size).all()
+            if not rows:
+                break
+
+            frame = pd.DataFrame(rows, columns=[
+                "id", "question_id", "source_type", "source_id", "is_correct", "user_answer"
+            ])
+            graded = frame[frame["source_type"].isin(GRADED_SOURCES)]
+            if not graded.empty:
+                result["items"] += self._fold_chunk(graded)
+                result["events"] += len(graded)
+
+            checkpoint.last_id = int(frame["id"].max())
+            self.db.commit()
+            result["chunks"] += 1
+
+        self.db.commit()
+        return result
+
+    # 조회
+
+    def _flags(self, stats: ItemStats, correct_answer: Optional[str]) -> List[str]:
+        if stats.attempts < MIN_ATTEMPTS_FOR_FLAGS:
+            return []
+
+        flags = []
+        if stats.p_value is not None and stats.p_value > TOO_EASY_P:
+            flags.append("too_easy")
+        if stats.p_value is not None and stats.p_value < TOO_HARD_P:
+            flags.append("too_hard")
+        if stats.discrimination is not None and stats.discrimination < LOW_DISCRIMINATION:
+            flags.append("negative_discrimination" if stats.discrimination < 0 else "low_discrimination")
+
+        # 정답보다 많이 고른 오답지가 있으면 정답 오기 의심
+        counts = stats.option_counts or {}
+        key_count = counts.get(correct_answer, 0)
+        if any(answer != correct_answer and answer and count > key_count for answer, count in counts.items()):
+            flags.append("possible_miskey")
+        return flags
+
+    def get_item_stats(self, flagged_only: bool = False, unit: Optional[str] = None,
+                       limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """문항 통계 목록 (변별도 낮은 순)
+
+        Args:
+            flagged_only: 응답 수가 충분하고 플래그(정답률/변별도 기준 이탈, 정답 오기 의심)가 있는 문항만
+            unit: 단원 필터
+        """
+        query = self.db.query(ItemStats, QuestionBank.unit, QuestionBank.correct_answer).join(
+            QuestionBank, QuestionBank.id == ItemStats.question_id
+        )
+        if unit:
+            query = query.filter(QuestionBank.unit == unit)
+        query = query.order_by(
+            ItemStats.discrimination.is_(None), ItemStats.discrimination, ItemStats.question_id
+        )
+
+        if flagged_only:
+            # 정답 오기 의심은 option_counts(JSON)로 판정하므로 SQL로 거르지 않고
+            # 응답 수가 충분한 문항의 플래그를 계산한 뒤 페이지를 자릅니다.
+            rows = []
+            for stats, question_unit, correct_answer in query.filter(
+                ItemStats.attempts >= MIN_ATTEMPTS_FOR_FLAGS
+            ).yield_per(500):
+                flags = self._flags(stats, correct_answer)
+                if flags:
+                    rows.append((stats, question_unit, correct_answer, flags))
+                    if len(rows) >= offset + limit:
+                        break
+            rows = rows[offset:]
+        else:
+            rows = [
+                (stats, question_unit, correct_answer, self._flags(stats, correct_answer))
+                for stats, question_unit, correct_answer in query.offset(offset).limit(limit).all()
+            ]
+
+        return [
+            {
+                "question_id": stats.question_id,
+                "unit": question_unit,
+                "correct_answer": correct_answer,
+                "attempts": stats.attempts,
+                "p_value": stats.p_value,
+                "discrimination": stats.discrimination,
+                "option_counts": stats.option_counts or {},
+                "flags": flags,
+                "updated_at": stats.updated_at
+            }
+            for stats, question_unit, correct_answer, flags in rows
+        ]
@@ -5,17 +5,36 @@
 """
 
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import and_, desc, func
+from sqlalchemy import and_, desc, func, or_
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
+import numpy as np
 
-from models.database import SessionLocal
+from models.database import SessionLocal, dialect_insert
 from models.learning_streak import (
-    LearningStreak, DailyActivity, Achievement,
-    LearningStreakResponse, DailyActivityCreate, DailyActivityResponse,
+    LearningStreak, DailyActivity, Achievement, ActivityBatchKey,
+    LearningStreakResponse, DailyActivityCreate, DailyActivityRecord, DailyActivityResponse,
     AchievementResponse, LearningStats
 )
 from models.user import User
+from services.activity_bitmap import ActivityBitmap
+from services.achievement_service import AchievementService
+
+
+# 같은 날 기록을 합칠 때 더하는 컬럼
+COUNTER_FIELDS = (
+    "daily_tests_completed",
+    "wrong_answers_reviewed",
+    "study_time_minutes",
+    "questions_solved",
+    "correct_answers",
+)
+
+# 한 번의 upsert 문에 넣을 최대 날짜 수 (SQLite 바인드 변수 한도 안쪽)
+UPSERT_CHUNK_SIZE = 50
+
+# 일괄 기록 멱등성 키 보관 기간 (일)
+IDEMPOTENCY_KEY_TTL_DAYS = 7
 
 
 class LearningStreakService:
@@ -24,133 +43,314 @@ class LearningStreakService:
     연속 학습 일수 추적, 일일 활동 기록, 성취 시스템 등을 제공합니다.
     """
     
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+        self._owns_session = db_session is None  # 직접 연 세션만 닫음
+        self.achievement_service = AchievementService(self.db)
     
     def get_or_create_streak(self, user_id: int) -> LearningStreak:
-        """사용자의 학습 스트릭을 가져오거나 생성합니다"""
-        streak = self.db.query(LearningStreak).filter(
+        """사용자의 학습 스트릭을 가져오거나 생성합니다 (쓰기 경로 전용)"""
+        # 없는 행은 잠글 수 없으므로 먼저 ON CONFLICT DO NOTHING으로 만들어 둡니다.
+        # (동시에 들어온 첫 기록도 user_id 유니크 인덱스 덕분에 한 행만 생김)
+        insert = dialect_insert(self.db)
+        self.db.execute(insert(LearningStreak.__table__).values(
+            user_id=user_id,
+            current_streak=0,
+            longest_streak=0,
+            total_study_days=0
+        ).on_conflict_do_nothing(index_elements=["user_id"]))
+        
+        # 같은 사용자의 동시 기록이 비트맵을 덮어쓰지 않도록 행을 잠급니다 (PostgreSQL).
+        return self.db.query(LearningStreak).filter(
             LearningStreak.user_id == user_id
-        ).first()
-        
-        if not streak:
-            streak = LearningStreak(
-                user_id=user_id,
-                current_streak=0,
-                longest_streak=0,
-                total_study_days=0
-            )
-            self.db.add(streak)
-            self.db.commit()
-            self.db.refresh(streak)
-        
-        return streak
+        ).with_for_update().one()
     
     def record_daily_activity(self, user_id: int, activity_data: DailyActivityCreate) -> DailyActivityResponse:
-        """일일 학습 활동을 기록합니다"""
-        today = date.today()
-        streak = self.get_or_create_streak(user_id)
-        
-        # 오늘 활동이 이미 있는지 확인
-        existing_activity = self.db.query(DailyActivity).filter(
-            and_(
-                DailyActivity.user_id == user_id,
-                DailyActivity.activity_date == today
-            )
-        ).first()
+        """오늘의 학습 활동을 기록합니다
         
-        if existing_activity:
-            # 기존 활동 업데이트
-            for field, value in activity_data.dict().items():
-                if hasattr(existing_activity, field):
-                    current_value = getattr(existing_activity, field)
-                    if isinstance(current_value, int) and isinstance(value, int):
-                        # 정수 필드는 누적
-                        setattr(existing_activity, field, current_value + value)
-                    else:
-                        # 불린이나 기타 필드는 덮어쓰기
-                        setattr(existing_activity, field, value)
-            
-            existing_activity.updated_at = datetime.now()
-            activity = existing_activity
-        else:
-            # 새 활동 생성
-            activity = DailyActivity(
-                user_id=user_id,
-                learning_streak_id=streak.id,
-                activity_date=today,
-                **activity_data.dict()
-            )
-            self.db.add(activity)
+        오늘 행에 INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col 한 번으로 더하므로
+        동시에 들어온 기록도 유실되지 않고, 스트릭/성취 갱신까지 한 트랜잭션으로 커밋합니다.
+        """
+        today = date.today()
+        try:
+            rows, _, _ = self._record_days(user_id, {today: activity_data.dict()})
+        except Exception:
+            self.db.rollback()
+            raise
         
-        # 스트릭 업데이트
-        self._update_streak(user_id, today)
+        return DailyActivityResponse.from_orm(rows[0])
+    
+    def _record_days(self, user_id: int, days: Dict[date, Dict[str, Any]]):
+        """날짜별 활동 upsert, 스트릭 재계산, 성취 확인 후 커밋합니다
         
+        Returns:
+            (기록된 daily_activities 행, 스트릭 행, 새로 부여한 성취 키)
+        """
+        streak = self.get_or_create_streak(user_id)
+        rows = self._upsert_activities(user_id, streak.id, days)
+        self._mark_active_days(streak, list(days))
+        new_achievements = self.achievement_service.check(streak, {
+            "current_streak": streak.current_streak,
+            "total_study_days": streak.total_study_days
+        })
         self.db.commit()
-        self.db.refresh(activity)
-        
-        # 성취 확인
-        self._check_achievements(user_id)
-        
-        return DailyActivityResponse.from_orm(activity)
+        return rows, streak, new_achievements
     
-    def _update_streak(self, user_id: int, activity_date: date):
-        """스트릭을 업데이트합니다"""
-        streak = self.get_or_create_streak(user_id)
+    def mark_study_day(self, user_id: int, day: Optional[date] = None) -> LearningStreak:
+        """daily_activities를 거치지 않는 학습(일일 모의고사/진단 평가 제출)을 스트릭에 반영합니다
         
-        if streak.last_activity_date is None:
-            # 첫 활동
-            streak.current_streak = 1
-            streak.longest_streak = 1
-            streak.total_study_days = 1
-        elif streak.last_activity_date == activity_date:
-            # 같은 날 - 스트릭 유지
-            pass
-        elif streak.last_activity_date == activity_date - timedelta(days=1):
-            # 연속된 날 - 스트릭 증가
-            streak.current_streak += 1
-            streak.total_study_days += 1
-            if streak.current_streak > streak.longest_streak:
-                streak.longest_streak = streak.current_streak
-        else:
-            # 연속되지 않은 날 - 스트릭 리셋
-            streak.current_streak = 1
-            streak.total_study_days += 1
-        
-        streak.last_activity_date = activity_date
+        커밋하지 않으므로 호출한 쪽에서 결과 저장과 같은 트랜잭션으로 커밋합니다.
+        """
+        streak = self.get_or_create_streak(user_id)
+        self._mark_active_days(streak, [day or date.today()])
+        self.achievement_service.check(streak, {
+            "current_streak": streak.current_streak,
+            "total_study_days": streak.total_study_days
+        })
+        return streak
+    
+    def _bitmap(self, streak: Optional[LearningStreak]) -> ActivityBitmap:
+        if not streak:
+            return ActivityBitmap()
+        return ActivityBitmap.from_bytes(streak.activity_start, streak.activity_bitmap)
+    
+    def get_activity_bitmap(self, user_id: int) -> ActivityBitmap:
+        """사용자의 활동 비트맵을 조회합니다 (스트릭이 없으면 빈 비트맵)"""
+        streak = self.db.query(LearningStreak).filter(
+            LearningStreak.user_id == user_id
+        ).first()
+        return self._bitmap(streak)
+    
+    def _mark_active_days(self, streak: LearningStreak, days: List[date]):
+        """활동 비트맵에 날짜들을 표시하고 스트릭을 다시 계산합니다 (커밋하지 않음)"""
+        bitmap = self._bitmap(streak)
+        for day in days:
+            bitmap.set(day)
+        
+        streak.activity_start = bitmap.start
+        streak.activity_bitmap = bitmap.to_bytes()
+        # 저장된 현재 스트릭은 마지막 활동일까지의 연속 일수입니다.
+        streak.current_streak = bitmap.run_ending_at(bitmap.last_active())
+        streak.longest_streak = max(streak.longest_streak or 0, bitmap.longest_streak())
+        streak.total_study_days = bitmap.total()
+        streak.last_activity_date = bitmap.last_active()
         streak.updated_at = datetime.now()
-        self.db.commit()
     
-    def get_learning_streak(self, user_id: int) -> LearningStreakResponse:
-        """사용자의 학습 스트릭 정보를 조회합니다"""
-        streak = self.get_or_create_streak(user_id)
-        today = date.today()
-        
-        # 오늘 활동 여부 확인
-        today_activity = self.db.query(DailyActivity).filter(
-            and_(
-                DailyActivity.user_id == user_id,
-                DailyActivity.activity_date == today
+    def _upsert_activities(self, user_id: int, streak_id: int,
+                           rows: Dict[date, Dict[str, Any]]) -> List[Any]:
+        """날짜별 활동을 INSERT ... ON CONFLICT DO UPDATE로 더합니다
+        
+        횟수/시간 컬럼은 기존 값에 더하고, 진단 완료는 하나라도 완료면 완료,
+        평균 점수는 새 값이 있을 때만 바꿉니다. UPSERT_CHUNK_SIZE일씩 나눠 실행하며
+        커밋하지 않습니다.
+        
+        Returns:
+            기록된 날짜별 daily_activities 행
+        """
+        now = datetime.now()
+        table = DailyActivity.__table__
+        insert = dialect_insert(self.db)
+        days = sorted(rows.items())
+        
+        result = []
+        for start in range(0, len(days), UPSERT_CHUNK_SIZE):
+            stmt = insert(table).values([
+                {
+                    "user_id": user_id,
+                    "learning_streak_id": streak_id,
+                    "activity_date": activity_date,
+                    "updated_at": now,
+                    **values
+                }
+                for activity_date, values in days[start:start + UPSERT_CHUNK_SIZE]
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "activity_date"],
+                set_={
+                    **{field: table.c[field] + stmt.excluded[field] for field in COUNTER_FIELDS},
+                    "diagnostic_completed": or_(table.c.diagnostic_completed, stmt.excluded.diagnostic_completed),
+                    "average_score": func.coalesce(stmt.excluded.average_score, table.c.average_score),
+                    "updated_at": stmt.excluded.updated_at
+                }
             )
+            result.extend(self.db.execute(stmt.returning(*table.c)).all())
+        return result
+    
+    def _claim_idempotency_key(self, user_id: int, key: str) -> bool:
+        """멱등성 키를 기록합니다 (이미 쓰인 키면 False, 커밋하지 않음)
+        
+        보관 기간이 지난 이 사용자의 키는 함께 지웁니다.
+        """
+        self.db.query(ActivityBatchKey).filter(
+            ActivityBatchKey.user_id == user_id,
+            ActivityBatchKey.created_at < datetime.now() - timedelta(days=IDEMPOTENCY_KEY_TTL_DAYS)
+        ).delete(synchronize_session=False)
+        
+        insert = dialect_insert(self.db)
+        claimed = self.db.execute(
+            insert(ActivityBatchKey.__table__)
+            .values(user_id=user_id, idempotency_key=key)
+            .on_conflict_do_nothing(index_elements=["user_id", "idempotency_key"])
+            .returning(ActivityBatchKey.__table__.c.id)
         ).first()
+        return claimed is not None
+    
+    def record_activities_batch(self, user_id: int, records: List[DailyActivityRecord],
+                                idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """날짜를 지정한 활동 기록들을 한 트랜잭션으로 반영합니다
+        
+        같은 날짜 기록은 메모리에서 먼저 합친 뒤 upsert로 쓰고,
+        스트릭과 성취는 마지막에 한 번만 다시 계산합니다.
+        
+        횟수 컬럼은 더해지므로 같은 요청을 다시 보내면 두 번 집계됩니다. 재시도할 수 있는
+        클라이언트는 idempotency_key를 보내야 하며, 이미 반영된 키면 아무것도 더하지 않고
+        현재 기록을 replayed=True와 함께 돌려줍니다.
+        
+        Raises:
+            ValueError: 미래 날짜가 포함된 경우
+        """
+        if not records:
+            raise ValueError("기록할 활동이 없습니다.")
+        if any(record.activity_date > date.today() for record in records):
+            raise ValueError("미래 날짜의 활동은 기록할 수 없습니다.")
+        
+        merged: Dict[date, Dict[str, Any]] = {}
+        for record in records:
+            values = record.dict(exclude={"activity_date"})
+            day = merged.get(record.activity_date)
+            if day is None:
+                merged[record.activity_date] = values
+                continue
+            for field in COUNTER_FIELDS:
+                day[field] += values[field]
+            day["diagnostic_completed"] = day["diagnostic_completed"] or values["diagnostic_completed"]
+            if values["average_score"] is not None:
+                day["average_score"] = values["average_score"]
+        
+        try:
+            if idempotency_key and not self._claim_idempotency_key(user_id, idempotency_key):
+                self.db.rollback()
+                rows = self.db.query(DailyActivity).filter(
+                    DailyActivity.user_id == user_id,
+                    DailyActivity.activity_date.in_(list(merged))
+                ).order_by(DailyActivity.activity_date).all()
+                streak = self.db.query(LearningStreak).filter(LearningStreak.user_id == user_id).first()
+                return {
+                    "activities": [DailyActivityResponse.from_orm(row) for row in rows],
+                    "streak": self._streak_response(streak, date.today()),
+                    "new_achievements": [],
+                    "replayed": True
+                }
+            rows, streak, new_achievements = self._record_days(user_id, merged)
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return {
+            "activities": [DailyActivityResponse.from_orm(row) for row in rows],
+            "streak": self._streak_response(streak, date.today()),
+            "new_achievements": new_achievements,
+            "replayed": False
+        }
+    
+    def _streak_response(self, streak: Optional[LearningStreak], today: date) -> LearningStreakResponse:
+        """스트릭 행을 읽기만 해서 응답을 만듭니다
         
-        is_active_today = today_activity is not None
+        마지막 활동일이 어제보다 이전이면 저장된 값과 관계없이 현재 스트릭은 0입니다.
+        저장된 값의 초기화는 jobs.streak_reconcile이 따로 반영합니다.
+        """
+        if not streak:
+            return LearningStreakResponse(
+                current_streak=0,
+                longest_streak=0,
+                last_activity_date=None,
+                total_study_days=0,
+                is_active_today=False
+            )
         
-        # 스트릭이 깨졌는지 확인 (마지막 활동이 어제가 아닌 경우)
-        if (streak.last_activity_date and 
-            streak.last_activity_date < today - timedelta(days=1) and
-            streak.current_streak > 0):
-            streak.current_streak = 0
-            self.db.commit()
+        last_activity = streak.last_activity_date
+        is_alive = last_activity is not None and last_activity >= today - timedelta(days=1)
         
         return LearningStreakResponse(
-            current_streak=streak.current_streak,
+            current_streak=streak.current_streak if is_alive else 0,
             longest_streak=streak.longest_streak,
-            last_activity_date=streak.last_activity_date,
+            last_activity_date=last_activity,
             total_study_days=streak.total_study_days,
-            is_active_today=is_active_today
+            is_active_today=last_activity == today
         )
     
+    def get_learning_streak(self, user_id: int) -> LearningStreakResponse:
+        """사용자의 학습 스트릭 정보를 조회합니다 (읽기 전용, 행을 만들지 않음)"""
+        streak = self.db.query(LearningStreak).filter(
+            LearningStreak.user_id == user_id
+        ).first()
+        return self._streak_response(streak, date.today())
+    
+    def expire_stale_streaks(self, today: Optional[date] = None, batch_size: int = 5000,
+                             progress=None) -> Dict[str, int]:
+        """어제 이후 활동이 없는 스트릭의 current_streak를 0으로 저장합니다
+        
+        id 구간마다 UPDATE 한 번씩 실행하고 바로 커밋해 잠금을 짧게 유지합니다.
+        
+        Args:
+            today: 기준일 (기본값: 오늘)
+            batch_size: UPDATE 한 번이 다루는 id 구간 크기
+            progress: 구간마다 누적 결과를 받는 콜백
+        
+        Returns:
+            초기화한 스트릭 수(reset), 실행한 구간 수(batches), 남은 진행 중 스트릭 수(active)
+        """
+        today = today or date.today()
+        cutoff = today - timedelta(days=1)
+        low, high = self.db.query(func.min(LearningStreak.id), func.max(LearningStreak.id)).one()
+        
+        result = {"reset": 0, "batches": 0, "active": 0}
+        if low is not None:
+            for start in range(low, high + 1, batch_size):
+                updated = self.db.query(LearningStreak).filter(
+                    LearningStreak.id >= start,
+                    LearningStreak.id < start + batch_size,
+                    LearningStreak.last_activity_date < cutoff,
+                    LearningStreak.current_streak > 0
+                ).update({"current_streak": 0, "updated_at": datetime.now()}, synchronize_session=False)
+                self.db.commit()
+                
+                result["reset"] += updated
+                result["batches"] += 1
+                if progress:
+                    progress(result)
+        
+        result["active"] = self.db.query(func.count(LearningStreak.id)).filter(
+            LearningStreak.current_streak > 0
+        ).scalar()
+        return result
+    
+    def get_activity_calendar(self, user_id: int, days: int = 365) -> Dict[str, Any]:
+        """학습 달력(히트맵)을 조회합니다
+        
+        Args:
+            user_id: 사용자 ID
+            days: 오늘을 포함해 거슬러 올라갈 일수
+        """
+        bitmap = self.get_activity_bitmap(user_id)
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days - 1)
+        
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "days": [
+                {"date": start_date + timedelta(days=i), "active": active}
+                for i, active in enumerate(bitmap.days(start_date, end_date))
+            ],
+            "active_days": bitmap.count(start_date, end_date),
+            "last_7_days": bitmap.count(end_date - timedelta(days=6), end_date),
+            "last_30_days": bitmap.count(end_date - timedelta(days=29), end_date),
+            "current_streak": bitmap.current_streak(end_date),
+            "longest_streak": bitmap.longest_streak(),
+            "total_study_days": bitmap.total()
+        }
+    
     def get_daily_activities(self, user_id: int, days: int = 30) -> List[DailyActivityResponse]:
         """사용자의 최근 일일 활동을 조회합니다"""
         start_date = date.today() - timedelta(days=days-1)
@@ -164,168 +364,95 @@ class LearningStreakService:
         
         return [DailyActivityResponse.from_orm(activity) for activity in activities]
     
-    def _check_achievements(self, user_id: int):
-        """성취 달성 여부를 확인하고 새로운 성취를 부여합니다"""
-        streak = self.get_or_create_streak(user_id)
-        
-        # 기존 성취 목록
-        existing_achievements = set(
-            achievement.achievement_key for achievement in 
-            self.db.query(Achievement).filter(Achievement.user_id == user_id).all()
-        )
-        
-        new_achievements = []
-        
-        # 스트릭 관련 성취
-        streak_achievements = [
-            (3, "첫걸음", "3일 연속 학습을 달성했습니다!", "streak_3", "🔥"),
-            (7, "일주일 챌린지", "7일 연속 학습을 달성했습니다!", "streak_7", "⭐"),
-            (14, "2주 마스터", "14일 연속 학습을 달성했습니다!", "streak_14", "🏆"),
-            (30, "한달 챔피언", "30일 연속 학습을 달성했습니다!", "streak_30", "👑"),
-            (100, "백일장", "100일 연속 학습을 달성했습니다!", "streak_100", "💎"),
-        ]
-        
-        for days, title, description, key, icon in streak_achievements:
-            if (streak.current_streak >= days and 
-                key not in existing_achievements):
-                new_achievements.append(Achievement(
-                    user_id=user_id,
-                    achievement_type="streak",
-                    achievement_key=key,
-                    title=title,
-                    description=description,
-                    icon=icon,
-                    color="#FF6B35"
-                ))
-        
-        # 총 학습일 관련 성취
-        total_achievements = [
-            (50, "꾸준한 학습자", "총 50일 학습을 완료했습니다!", "total_50", "📚"),
-            (100, "학습 애호가", "총 100일 학습을 완료했습니다!", "total_100", "🎓"),
-            (200, "학습 전문가", "총 200일 학습을 완료했습니다!", "total_200", "🧠"),
-            (365, "1년 마스터", "총 365일 학습을 완료했습니다!", "total_365", "🌟"),
-        ]
-        
-        for days, title, description, key, icon in total_achievements:
-            if (streak.total_study_days >= days and 
-                key not in existing_achievements):
-                new_achievements.append(Achievement(
-                    user_id=user_id,
-                    achievement_type="consistency",
-                    achievement_key=key,
-                    title=title,
-                    description=description,
-                    icon=icon,
-                    color="#4ECDC4"
-                ))
-        
-        # 새 성취 저장
-        if new_achievements:
-            for achievement in new_achievements:
-                self.db.add(achievement)
-            self.db.commit()
-    
-    def get_user_achievements(self, user_id: int) -> List[AchievementResponse]:
-        """사용자의 성취 목록을 조회합니다"""
-        achievements = self.db.query(Achievement).filter(
+    def get_user_achievements(self, user_id: int, limit: Optional[int] = None) -> List[AchievementResponse]:
+        """사용자의 성취 목록을 조회합니다 (limit이 있으면 최근 limit개)"""
+        query = self.db.query(Achievement).filter(
             Achievement.user_id == user_id
-        ).order_by(desc(Achievement.earned_at)).all()
+        ).order_by(desc(Achievement.earned_at))
+        if limit:
+            query = query.limit(limit)
         
-        return [AchievementResponse.from_orm(achievement) for achievement in achievements]
+        return [AchievementResponse.from_orm(achievement) for achievement in query.all()]
     
     def get_learning_stats(self, user_id: int) -> LearningStats:
-        """종합 학습 통계를 조회합니다"""
-        streak = self.get_learning_streak(user_id)
-        recent_activities = self.get_daily_activities(user_id, 7)
-        recent_achievements = self.get_user_achievements(user_id)[:5]  # 최근 5개
-        
-        # 주간 요약
-        weekly_summary = self._get_weekly_summary(user_id)
+        """종합 학습 통계를 조회합니다
         
-        # 월간 요약
-        monthly_summary = self._get_monthly_summary(user_id)
+        스트릭 행, 최근 31일 활동, 최근 성취 5개를 각각 한 번씩만 조회하고
+        주간/월간 요약과 최근 활동은 같은 활동 목록에서 계산합니다.
+        """
+        today = date.today()
+        month_start = today - timedelta(days=30)
+        week_start = today - timedelta(days=7)
         
-        return LearningStats(
-            streak=streak,
-            recent_activities=recent_activities,
-            recent_achievements=recent_achievements,
-            weekly_summary=weekly_summary,
-            monthly_summary=monthly_summary
-        )
-    
-    def _get_weekly_summary(self, user_id: int) -> Dict[str, Any]:
-        """주간 요약 통계를 생성합니다"""
-        start_date = date.today() - timedelta(days=7)
+        streak = self.db.query(LearningStreak).filter(
+            LearningStreak.user_id == user_id
+        ).first()
+        bitmap = self._bitmap(streak)
         
         activities = self.db.query(DailyActivity).filter(
             and_(
                 DailyActivity.user_id == user_id,
-                DailyActivity.activity_date >= start_date
+                DailyActivity.activity_date >= month_start
             )
-        ).all()
-        
-        if not activities:
-            return {
-                "study_days": 0,
-                "total_study_time": 0,
-                "total_questions": 0,
-                "average_score": 0,
-                "consistency_rate": 0.0
-            }
+        ).order_by(desc(DailyActivity.activity_date)).all()
         
-        total_study_time = sum(activity.study_time_minutes for activity in activities)
-        total_questions = sum(activity.questions_solved for activity in activities)
-        total_correct = sum(activity.correct_answers for activity in activities)
+        recent_achievements = self.get_user_achievements(user_id, limit=5)
         
-        scores = [activity.average_score for activity in activities if activity.average_score]
-        average_score = sum(scores) / len(scores) if scores else 0
+        # 최근 7일 활동 (get_daily_activities(user_id, 7)과 같은 범위)
+        recent_start = today - timedelta(days=6)
+        recent_activities = [
+            DailyActivityResponse.from_orm(activity) for activity in activities
+            if activity.activity_date >= recent_start
+        ]
         
-        return {
-            "study_days": len(activities),
-            "total_study_time": total_study_time,
-            "total_questions": total_questions,
-            "average_score": round(average_score, 1),
-            "accuracy_rate": round(total_correct / total_questions * 100, 1) if total_questions > 0 else 0,
-            "consistency_rate": round(len(activities) / 7 * 100, 1)
-        }
-    
-    def _get_monthly_summary(self, user_id: int) -> Dict[str, Any]:
-        """월간 요약 통계를 생성합니다"""
-        start_date = date.today() - timedelta(days=30)
+        dates = np.array([activity.activity_date.toordinal() for activity in activities], dtype=np.int64)
+        in_week = dates >= week_start.toordinal()
         
-        activities = self.db.query(DailyActivity).filter(
-            and_(
-                DailyActivity.user_id == user_id,
-                DailyActivity.activity_date >= start_date
+        return LearningStats(
+            streak=self._streak_response(streak, today),
+            recent_activities=recent_activities,
+            recent_achievements=recent_achievements,
+            weekly_summary=self._summarize(
+                activities, in_week, bitmap.count(week_start, today), 7
+            ),
+            monthly_summary=self._summarize(
+                activities, np.ones(len(activities), dtype=bool), bitmap.count(month_start, today), 30
             )
-        ).all()
-        
-        if not activities:
+        )
+    
+    def _summarize(self, activities: List[DailyActivity], mask: np.ndarray,
+                   study_days: int, period_days: int) -> Dict[str, Any]:
+        """활동 목록 중 mask에 해당하는 행의 요약 통계를 생성합니다"""
+        if not mask.any():
             return {
-                "study_days": 0,
+                "study_days": study_days,
                 "total_study_time": 0,
                 "total_questions": 0,
                 "average_score": 0,
-                "consistency_rate": 0.0
+                "consistency_rate": round(study_days / period_days * 100, 1)
             }
         
-        total_study_time = sum(activity.study_time_minutes for activity in activities)
-        total_questions = sum(activity.questions_solved for activity in activities)
-        total_correct = sum(activity.correct_answers for activity in activities)
+        def column(field: str) -> np.ndarray:
+            return np.array([getattr(activity, field) or 0 for activity in activities], dtype=np.int64)[mask]
+        
+        total_study_time = int(column("study_time_minutes").sum())
+        total_questions = int(column("questions_solved").sum())
+        total_correct = int(column("correct_answers").sum())
         
-        scores = [activity.average_score for activity in activities if activity.average_score]
-        average_score = sum(scores) / len(scores) if scores else 0
+        scores = column("average_score")
+        scores = scores[scores > 0]
+        average_score = float(scores.mean()) if scores.size else 0
         
         return {
-            "study_days": len(activities),
+            "study_days": study_days,
             "total_study_time": total_study_time,
             "total_questions": total_questions,
             "average_score": round(average_score, 1),
             "accuracy_rate": round(total_correct / total_questions * 100, 1) if total_questions > 0 else 0,
-            "consistency_rate": round(len(activities) / 30 * 100, 1)
+            "consistency_rate": round(study_days / period_days * 100, 1)
         }
     
     def __del__(self):
         """소멸자에서 데이터베이스 연결 해제"""
-        if hasattr(self, 'db'):
+        if getattr(self, '_owns_session', False):
             self.db.close()
@@ -0,0 +1,255 @@
+"""
+문제 유사 중복 탐지 서비스
+
+문제 내용과 선택지를 정규화(NFKC, 소문자, 공백/문장부호 제거)한 뒤 글자 5-gram 집합의
+MinHash 서명(128개)을 만들고, 32개 밴드 x 4행 LSH 버킷으로 색인합니다.
+새 문제는 자기 밴드 버킷에 함께 들어 있는 문제만 후보로 삼아 서명 일치율(추정 자카드 유사도)을
+비교하므로, 전체 문제와 쌍대 비교하지 않고 문제당 거의 일정한 비용으로 중복을 찾습니다.
+
+서명과 버킷은 question_signatures / question_lsh_buckets에 저장해 두고,
+서명이 없는 문제만 골라 색인하므로 감사(audit)와 가져오기 모두 증분으로 동작합니다.
+"""
+
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from models.database import SessionLocal, dialect_insert
+from models.question import QuestionBank, QuestionDuplicate, QuestionLshBucket, QuestionSignature
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+# 이 유사도 이상이면 중복으로 판정합니다. (32x4 밴드에서 유사도 0.8인 쌍이 후보에서 빠질 확률은 1e-7 미만)
+SIMILARITY_THRESHOLD = 0.8
+
+# IN 절 하나에 넣을 최대 값 수
+_LOOKUP_CHUNK = 5000
+
+_PRIME = (1 << 31) - 1
+_SHINGLE_BASE = np.uint64(1_000_003)
+
+# 순열 대신 쓰는 해시 함수 (a*x + b mod 2^64의 상위 32비트, a는 홀수)
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(0, 1 << 62, NUM_PERM, dtype=np.int64).astype(np.uint64) * np.uint64(4) + np.uint64(1)
+_B = _rng.randint(0, 1 << 62, NUM_PERM, dtype=np.int64).astype(np.uint64)
+_SHIFT = np.uint64(32)
+
+# 밴드 해시(FNV-1a 방식, 32비트 단위)
+_FNV_PRIME = np.uint64(0x100000001B3)
+_BAND_SEEDS = np.uint64(0xCBF29CE484222325) ^ (np.arange(BANDS, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15))
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_question(content: str, options: Optional[Iterable[str]] = None) -> str:
+    """띄어쓰기, 문장부호, 전각/반각, 대소문자 차이를 없앤 비교용 문자열"""
+    text = " ".join([content or "", *(options or [])])
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """글자 SHINGLE_SIZE-gram의 다항식 해시 (mod _PRIME, 중복 제거)"""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4").astype(np.uint64)
+    size = min(SHINGLE_SIZE, len(codes))
+    count = len(codes) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for k in range(size):
+        hashes = (hashes * _SHINGLE_BASE + codes[k:k + count]) % _PRIME
+    return np.unique(hashes)
+
+
+def minhash_signature(content: str, options: Optional[Iterable[str]] = None) -> np.ndarray:
+    """MinHash 서명 (uint32 NUM_PERM개)"""
+    hashes = _shingle_hashes(normalize_question(content, options))
+    with np.errstate(over="ignore"):
+        permuted = (np.outer(_A, hashes) + _B[:, None]) >> _SHIFT
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_hashes(signatures: np.ndarray) -> np.ndarray:
+    """서명 행렬 (n, NUM_PERM) -> 밴드별 버킷 해시 (n, BANDS) int64
+
+    밴드 번호마다 시작값을 달리해 밴드끼리 버킷이 겹치지 않게 합니다.
+    해시 충돌은 후보만 늘릴 뿐 서명 비교에서 걸러집니다.
+    """
+    bands = np.asarray(signatures, dtype=np.uint64).reshape(-1, BANDS, ROWS)
+    hashes = np.broadcast_to(_BAND_SEEDS, bands.shape[:2]).copy()
+    with np.errstate(over="ignore"):
+        for row in range(ROWS):
+            hashes = (hashes ^ bands[:, :, row]) * _FNV_PRIME
+    return hashes.view(np.int64)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """서명 일치율 (자카드 유사도 추정값)"""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def _to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def _from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+class DuplicateMatch(NamedTuple):
+    """가장 비슷한 기존 문제 또는 같은 묶음의 앞선 항목"""
+    similarity: float
+    question_id: Optional[int] = None
+    batch_index: Optional[int] = None
+
+
+class QuestionDedupService:
+    """MinHash LSH 유사 중복 탐지 서비스"""
+
+    def __init__(self, db_session=None, threshold: float = SIMILARITY_THRESHOLD):
+        self.db = db_session or SessionLocal()
+        self.threshold = threshold
+
+    def _indexed_candidates(self, hashes: Iterable[int]) -> Tuple[Dict[int, List[int]], Dict[int, np.ndarray]]:
+        """버킷 해시 -> 문제 ID 목록, 후보 문제 ID -> 서명"""
+        hashes = list(set(hashes))
+        buckets: Dict[int, List[int]] = {}
+        for start in range(0, len(hashes), _LOOKUP_CHUNK):
+            rows = self.db.execute(
+                select(QuestionLshBucket.bucket_hash, QuestionLshBucket.question_id)
+                .where(QuestionLshBucket.bucket_hash.in_(hashes[start:start + _LOOKUP_CHUNK]))
+            ).all()
+            for bucket_hash, question_id in rows:
+                buckets.setdefault(bucket_hash, []).append(question_id)
+
+        ids = sorted({question_id for ids in buckets.values() for question_id in ids})
+        signatures: Dict[int, np.ndarray] = {}
+        for start in range(0, len(ids), _LOOKUP_CHUNK):
+            rows = self.db.execute(
+                select(QuestionSignature.question_id, QuestionSignature.signature)
+                .where(QuestionSignature.question_id.in_(ids[start:start + _LOOKUP_CHUNK]))
+            ).all()
+            signatures.update((question_id, _from_bytes(data)) for question_id, data in rows)
+        return buckets, signatures
+
+    def match_batch(self, signatures: List[np.ndarray]) -> List[Optional[DuplicateMatch]]:
+        """서명 묶음 각각에 대해 threshold 이상으로 가장 비슷한 항목을 찾습니다
+
+        색인된 문제와 같은 묶음의 앞선 항목을 모두 후보로 보며, 버킷 조회는 묶음 전체에 한 번 합니다.
+        """
+        if not signatures:
+            return []
+        item_hashes = band_hashes(np.vstack(signatures)).tolist()
+        buckets, indexed = self._indexed_candidates(h for hashes in item_hashes for h in hashes)
+
+        local_buckets: Dict[int, List[int]] = {}
+        matches: List[Optional[DuplicateMatch]] = []
+        for i, (signature, hashes) in enumerate(zip(signatures, item_hashes)):
+            best: Optional[DuplicateMatch] = None
+            question_ids = {question_id for h in hashes for question_id in buckets.get(h, ())}
+            for question_id in sorted(question_ids):
+                if question_id not in indexed:
+                    continue
+                score = similarity(signature, indexed[question_id])
+                if score >= self.threshold and (best is None or score > best.similarity):
+                    best = DuplicateMatch(score, question_id=question_id)
+            for j in sorted({j for h in hashes for j in local_buckets.get(h, ())}):
+                score = similarity(signature, signatures[j])
+                if score >= self.threshold and (best is None or score > best.similarity):
+                    best = DuplicateMatch(score, batch_index=j)
+
+            matches.append(best)
+            for h in hashes:
+                local_buckets.setdefault(h, []).append(i)
+        return matches
+
+    def index(self, question_ids: List[int], signatures: List[np.ndarray]):
+        """서명과 밴드 버킷을 저장합니다 (커밋하지 않음)"""
+        if not question_ids:
+            return
+        self.db.execute(QuestionSignature.__table__.insert(), [
+            {"question_id": question_id, "signature": _to_bytes(signature)}
+            for question_id, signature in zip(question_ids, signatures)
+        ])
+        self.db.execute(QuestionLshBucket.__table__.insert(), [
+            {"bucket_hash": h, "question_id": question_id}
+            for question_id, hashes in zip(question_ids, band_hashes(np.vstack(signatures)).tolist())
+            for h in hashes
+        ])
+
+    def record_duplicates(self, pairs: List[Tuple[int, int, float]]):
+        """(문제 ID, 먼저 있던 문제 ID, 유사도) 쌍을 저장합니다 (커밋하지 않음)"""
+        if not pairs:
+            return
+        insert = dialect_insert(self.db)
+        self.db.execute(
+            insert(QuestionDuplicate.__table__).on_conflict_do_nothing(
+                index_elements=["question_id", "duplicate_of"]
+            ),
+            [
+                {"question_id": question_id, "duplicate_of": duplicate_of, "similarity": round(score, 4)}
+                for question_id, duplicate_of, score in pairs
+            ]
+        )
+
+    def index_questions(self, question_ids: List[int], signatures: List[np.ndarray]) -> int:
+        """이미 저장된 문제 묶음을 검사해 중복을 기록하고 색인합니다 (커밋하지 않음)
+
+        Returns:
+            중복으로 기록한 문제 수
+        """
+        matches = self.match_batch(signatures)
+        pairs = [
+            (question_id, match.question_id if match.question_id is not None else question_ids[match.batch_index],
+             match.similarity)
+            for question_id, match in zip(question_ids, matches) if match
+        ]
+        self.record_duplicates(pairs)
+        self.index(question_ids, signatures)
+        return len(pairs)
+
+    def index_missing(self, chunk_size: int = 2000,
+                      progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+        """서명이 없는 문제를 id 순으로 묶어 검사하고 색인합니다
+
+        묶음마다 커밋하므로 중단되어도 다음 실행이 남은 문제부터 이어갑니다.
+
+        Returns:
+            색인한 문제 수, 중복으로 기록한 문제 수
+        """
+        result = {"indexed": 0, "duplicates": 0}
+        last_id = 0
+        while True:
+            rows = self.db.execute(
+                select(QuestionBank.id, QuestionBank.content, QuestionBank.options)
+                .outerjoin(QuestionSignature, QuestionSignature.question_id == QuestionBank.id)
+                .where(QuestionSignature.question_id.is_(None), QuestionBank.id > last_id)
+                .order_by(QuestionBank.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            question_ids = [row.id for row in rows]
+            signatures = [minhash_signature(row.content, row.options) for row in rows]
+            result["duplicates"] += self.index_questions(question_ids, signatures)
+            result["indexed"] += len(rows)
+            self.db.commit()
+
+            last_id = question_ids[-1]
+            if progress:
+                progress(result)
+        return result
+
+    def get_duplicates(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """기록된 중복 쌍 (유사도 높은 순)"""
+        rows = self.db.query(QuestionDuplicate).order_by(
+            QuestionDuplicate.similarity.desc(), QuestionDuplicate.question_id
+        ).limit(limit).all()
+        return [
+            {"question_id": row.question_id, "duplicate_of": row.duplicate_of, "similarity": row.similarity}
+            for row in rows
+        ]
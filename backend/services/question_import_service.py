@@ -0,0 +1,213 @@
+"""
+문제 일괄 가져오기 서비스
+
+JSONL/CSV 파일을 한 줄씩 읽어 QuestionCreate로 검증하고, batch_size개씩 한 트랜잭션에서
+INSERT(executemany)합니다. 묶음마다 파일에서 처리한 레코드 수를 job_checkpoints에
+같은 트랜잭션으로 기록하므로, 중단된 가져오기는 다시 실행하면 이어서 진행합니다.
+
+CSV의 options/tags 칸은 JSON 배열 또는 "|"로 구분한 문자열을 받습니다.
+
+가져오는 문제는 MinHash LSH로 기존 문제 및 같은 파일의 앞선 문제와 비교해
+유사 중복을 건너뛰거나(skip) 추가한 뒤 기록합니다(flag).
+"""
+
+import csv
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from models.analytics import JobCheckpoint
+from models.database import SessionLocal
+from models.question import QuestionBank, QuestionCreate
+from services.question_dedup_service import QuestionDedupService, minhash_signature
+
+# 오류 메시지를 보관할 최대 행 수 (건수는 모두 셉니다)
+MAX_REPORTED_ERRORS = 20
+
+LIST_FIELDS = ("options", "tags")
+
+# 유사 중복 처리 방식: 건너뛰기, 추가하고 기록, 검사 안 함
+DUPLICATE_MODES = ("skip", "flag", "off")
+
+
+def checkpoint_name(path: str) -> str:
+    """파일 경로별 체크포인트 이름 (job_checkpoints.job_name은 50자 제한)"""
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return f"question_import:{digest}"
+
+
+def _parse_list(value: Any) -> Optional[List[str]]:
+    if value is None or isinstance(value, list):
+        return value
+    value = str(value).strip()
+    if not value:
+        return None
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split("|")]
+
+
+def iter_records(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """파일의 레코드를 (레코드 번호, 원본 딕셔너리)로 하나씩 돌려줍니다
+
+    JSONL은 빈 줄을 건너뛰며, 잘못된 JSON 줄은 {"__error__": 메시지}로 돌려줍니다.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                yield number, row
+            return
+
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                record = {"__error__": f"JSON 오류: {e.msg}"}
+            if not isinstance(record, dict):
+                record = {"__error__": "JSON 객체가 아닙니다."}
+            yield number, record
+
+
+def _error_message(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in item['loc'])}: {item['msg']}" for item in error.errors()
+        )
+    return str(error)
+
+
+def parse_question(raw: Dict[str, Any]) -> QuestionCreate:
+    """원본 레코드 -> QuestionCreate (검증 실패 시 ValueError/ValidationError)"""
+    if "__error__" in raw:
+        raise ValueError(raw["__error__"])
+
+    data = {key: (value if value != "" else None) for key, value in raw.items() if key}
+    for field in LIST_FIELDS:
+        if field in data:
+            data[field] = _parse_list(data[field])
+    return QuestionCreate(**data)
+
+
+class QuestionImportService:
+    """JSONL/CSV 문제 일괄 가져오기 서비스"""
+
+    def __init__(self, db_session=None, batch_size: int = 2000, duplicates: str = "skip"):
+        if duplicates not in DUPLICATE_MODES:
+            raise ValueError(f"알 수 없는 중복 처리 방식입니다: {duplicates}")
+        self.db = db_session or SessionLocal()
+        self.batch_size = batch_size
+        self.duplicates = duplicates
+        self.dedup_service = QuestionDedupService(self.db)
+
+    def insert_questions(self, questions: List[QuestionCreate]) -> List[int]:
+        """검증된 문제를 한 번의 executemany INSERT로 추가합니다 (커밋하지 않음)
+
+        Returns:
+            추가한 문제 ID (입력 순서)
+        """
+        if not questions:
+            return []
+        table = QuestionBank.__table__
+        return list(self.db.execute(
+            table.insert().returning(table.c.id, sort_by_parameter_order=True),
+            [question.dict() for question in questions]
+        ).scalars())
+
+    def _insert_batch(self, batch: List[QuestionCreate]) -> Tuple[int, int]:
+        """중복 검사 후 묶음을 추가합니다
+
+        Returns:
+            (추가한 문제 수, 유사 중복으로 판정한 문제 수)
+        """
+        if self.duplicates == "off":
+            return len(self.insert_questions(batch)), 0
+
+        signatures = [minhash_signature(question.content, question.options) for question in batch]
+        matches = self.dedup_service.match_batch(signatures)
+        keep = [i for i, match in enumerate(matches) if not (match and self.duplicates == "skip")]
+
+        question_ids = self.insert_questions([batch[i] for i in keep])
+        id_by_index = dict(zip(keep, question_ids))
+        self.dedup_service.record_duplicates([
+            (id_by_index[i],
+             match.question_id if match.question_id is not None else id_by_index[match.batch_index],
+             match.similarity)
+            for i, match in enumerate(matches) if match and i in id_by_index
+        ])
+        self.dedup_service.index(question_ids, [signatures[i] for i in keep])
+        return len(question_ids), sum(1 for match in matches if match)
+
+    def _checkpoint(self, name: str) -> JobCheckpoint:
+        checkpoint = self.db.query(JobCheckpoint).filter(JobCheckpoint.job_name == name).first()
+        if not checkpoint:
+            checkpoint = JobCheckpoint(job_name=name, last_id=0)
+            self.db.add(checkpoint)
+            self.db.flush()
+        return checkpoint
+
+    def import_file(self, path: str, restart: bool = False,
+                    progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """파일의 문제를 가져옵니다
+
+        Args:
+            path: .jsonl 또는 .csv 파일
+            restart: 체크포인트를 무시하고 처음부터 가져오기
+            progress: 묶음을 커밋할 때마다 누적 결과를 받는 콜백
+
+        Returns:
+            이어서 시작한 레코드 번호, 추가한 문제 수, 건너뛴(검증 실패) 레코드 수,
+            유사 중복 수, 커밋한 묶음 수, 오류 예시(레코드 번호, 메시지)
+        """
+        if self.duplicates != "off":
+            # 다른 경로로 추가되어 아직 색인되지 않은 문제도 비교 대상에 넣습니다.
+            self.dedup_service.index_missing(self.batch_size)
+
+        checkpoint = self._checkpoint(checkpoint_name(path))
+        if restart:
+            checkpoint.last_id = 0
+        resumed_from = checkpoint.last_id
+
+        result: Dict[str, Any] = {
+            "resumed_from": resumed_from, "inserted": 0, "invalid": 0, "duplicates": 0, "batches": 0, "errors": []
+        }
+        batch: List[QuestionCreate] = []
+        last_number = resumed_from
+
+        def flush():
+            inserted, duplicates = self._insert_batch(batch)
+            result["inserted"] += inserted
+            result["duplicates"] += duplicates
+            checkpoint.last_id = last_number
+            self.db.commit()
+            result["batches"] += 1
+            batch.clear()
+            if progress:
+                progress(result)
+
+        for number, raw in iter_records(path):
+            if number <= resumed_from:
+                continue
+            last_number = number
+            try:
+                batch.append(parse_question(raw))
+            except (ValidationError, ValueError) as e:
+                result["invalid"] += 1
+                if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                    result["errors"].append((number, _error_message(e)))
+                continue
+
+            if len(batch) >= self.batch_size:
+                flush()
+
+        if batch or last_number != checkpoint.last_id:
+            flush()
+        else:
+            self.db.commit()
+        return result
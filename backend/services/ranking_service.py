@@ -0,0 +1,175 @@
+"""
+점수 백분위/순위 서비스
+
+시험 종류별 점수 분포를 score_histograms에 누적하고, 프로세스 안에서는
+펜윅 트리(Fenwick tree)로 들고 있어 백분위, 순위, 상위 N% 기준 점수를
+결과 테이블 정렬 없이 O(log n)에 계산합니다.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from models.analytics import ScoreHistogram
+from models.daily_test import DailyTestResult
+from models.database import SessionLocal, dialect_insert
+from models.diagnostic import DiagnosticResult
+
+TEST_TYPES = ("diagnostic", "daily_test")
+
+# 정답률 0-100을 1점 단위 구간으로 나눕니다.
+BUCKET_COUNT = 101
+
+# 다른 워커가 누적한 제출을 반영하기 위해 분포를 다시 읽는 주기 (초)
+RELOAD_INTERVAL_SECONDS = 60
+
+
+class FenwickTree:
+    """구간 합 트리 (0-based 인덱스)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index: int, delta: int):
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """0..index 구간 합 (index < 0이면 0)"""
+        total = 0
+        i = min(index, self.size - 1) + 1
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def total(self) -> int:
+        return self.prefix_sum(self.size - 1)
+
+    def lower_bound(self, target: int) -> int:
+        """누적 합이 target 이상이 되는 가장 작은 인덱스"""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self.tree[nxt] < target:
+                position = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return position
+
+
+# 프로세스 전역 캐시: test_type -> (트리, 불러온 시각)
+_trees: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def score_bucket(accuracy: Optional[float]) -> int:
+    """정답률을 분포 구간으로 변환"""
+    return int(round(min(max(accuracy or 0.0, 0.0), 100.0)))
+
+
+class RankingService:
+    """점수 분포 기반 백분위/순위 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+
+    def _tree(self, test_type: str) -> FenwickTree:
+        with _lock:
+            cached = _trees.get(test_type)
+            if cached and time.monotonic() - cached[1] < RELOAD_INTERVAL_SECONDS:
+                return cached[0]
+
+        tree = FenwickTree(BUCKET_COUNT)
+        rows = self.db.query(ScoreHistogram.bucket, ScoreHistogram.count).filter(
+            ScoreHistogram.test_type == test_type
+        ).all()
+        for bucket, count in rows:
+            tree.add(bucket, count)
+
+        with _lock:
+            _trees[test_type] = (tree, time.monotonic())
+        return tree
+
+    def record_score(self, test_type: str, accuracy: float):
+        """제출 점수를 분포에 누적합니다
+
+        커밋하지 않으므로 결과 저장과 같은 트랜잭션으로 커밋한 뒤 apply_score를 호출합니다.
+        """
+        insert = dialect_insert(self.db)
+        stmt = insert(ScoreHistogram.__table__).values(
+            test_type=test_type, bucket=score_bucket(accuracy), count=1
+        )
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["test_type", "bucket"],
+            set_={"count": ScoreHistogram.__table__.c.count + 1}
+        ))
+
+    def apply_score(self, test_type: str, accuracy: float):
+        """커밋된 점수를 이 프로세스의 트리에 반영합니다"""
+        with _lock:
+            cached = _trees.get(test_type)
+            if cached:
+                cached[0].add(score_bucket(accuracy), 1)
+
+    def get_standing(self, test_type: str, accuracy: Optional[float]) -> Dict[str, Any]:
+        """점수의 백분위와 순위
+
+        백분위는 자신보다 낮은 점수 수 + 같은 점수 수의 절반을 전체로 나눈 값입니다.
+        순위는 자신보다 높은 점수 수 + 1입니다.
+        """
+        tree = self._tree(test_type)
+        total = tree.total()
+        if accuracy is None or total == 0:
+            return {"percentile": None, "rank": None, "total": total, "top_percent": None}
+
+        bucket = score_bucket(accuracy)
+        below = tree.prefix_sum(bucket - 1)
+        at_or_below = tree.prefix_sum(bucket)
+        above = total - at_or_below
+        equal = at_or_below - below
+
+        return {
+            "percentile": round((below + equal / 2) / total * 100, 1),
+            "rank": above + 1,
+            "total": total,
+            "top_percent": round((above + 1) / total * 100, 1)
+        }
+
+    def get_cutoff(self, test_type: str, top_percent: float) -> Optional[int]:
+        """상위 top_percent%에 들기 위한 최소 정답률 구간"""
+        tree = self._tree(test_type)
+        total = tree.total()
+        if total == 0:
+            return None
+
+        # 상위 N% 안에 드는 인원 수만큼 위에서부터 세었을 때의 경계
+        within = max(1, int(total * top_percent / 100))
+        return tree.lower_bound(total - within + 1)
+
+    def get_user_ranking(self, user_id: int, test_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """사용자의 최근 결과 기준 시험 종류별 백분위/순위"""
+        latest_models = {"diagnostic": DiagnosticResult, "daily_test": DailyTestResult}
+        ranking = {}
+
+        for test_type in test_types or TEST_TYPES:
+            model = latest_models[test_type]
+            latest = self.db.query(model.accuracy).filter(
+                model.user_id == user_id
+            ).order_by(model.completed_at.desc()).first()
+            accuracy = latest[0] if latest else None
+
+            ranking[test_type] = {
+                "accuracy": accuracy,
+                **self.get_standing(test_type, accuracy),
+                "cutoffs": {
+                    f"top_{percent}": self.get_cutoff(test_type, percent) for percent in (1, 10, 30)
+                }
+            }
+
+        return ranking
+
@@ -7,41 +7,41 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sqlalchemy import func
 
 from models.database import SessionLocal
-from models.user import User
+from models.user import UserResponse
 from models.question import QuestionService
 from models.daily_test import DailyTestResult
 from services.auth_service import AuthService
-from services.diagnostic_service import DiagnosticService
+from services.answer_event_service import AnswerEventService
+from services.ranking_service import RankingService
+from services.unit_stats_service import UnitStatsService
+from services.learning_streak_service import LearningStreakService
 
 class RecommendationService:
-    def __init__(self):
+    def __init__(self, db_session=None):
         self.question_service = QuestionService()
         self.auth_service = AuthService()
-        self.diagnostic_service = DiagnosticService()
-        self.db = SessionLocal()
+        self.db = db_session or SessionLocal()
+        self.answer_event_service = AnswerEventService(self.db)
+        self.ranking_service = RankingService(self.db)
+        self.unit_stats_service = UnitStatsService(self.db)
+        self.learning_streak_service = LearningStreakService(self.db)
     
-    def generate_daily_test(self, user_id: int) -> Dict[str, Any]:
-        """사용자 맞춤형 일일 모의고사 생성"""
-        # 사용자 정보 조회
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return {"error": "사용자를 찾을 수 없습니다."}
+    def generate_daily_test(self, user: UserResponse) -> Dict[str, Any]:
+        """사용자 맞춤형 일일 모의고사 생성 (인증 단계에서 조회한 사용자)"""
+        user_id = user.id
         
-        # 진단 결과 조회
-        diagnostic_result = self.diagnostic_service.get_user_diagnostic_result(user_id)
+        # 단원별 누적 성과 (진단 평가와 일일 모의고사 채점 시 갱신)
+        weak_units = self.unit_stats_service.get_weak_units(user_id, limit=3)
+        strong_units = [
+            unit for unit in self.unit_stats_service.get_strong_units(user_id, limit=2)
+            if unit not in weak_units
+        ]
         
         # 문제 선택 전략
         questions = []
         
-        if diagnostic_result.get("diagnostic_completed"):
-            # 진단 결과가 있는 경우: 약점 단원 중심으로 문제 선택
-            weak_units = diagnostic_result.get("weak_units", [])
-            strong_units = diagnostic_result.get("strong_units", [])
-            
-            # 약점 단원에서 60%, 강점 단원에서 40% 선택
-            weak_count = min(9, len(weak_units) * 2)  # 약점 단원에서 더 많은 문제
-            strong_count = 6 - weak_count
-            
+        if weak_units:
+            # 풀이 기록이 있는 경우: 약점 단원 중심으로 문제 선택
             # 약점 단원 문제 선택
             for unit in weak_units[:3]:  # 최대 3개 단원
                 unit_questions = self.question_service.get_questions_by_criteria(
@@ -56,7 +56,7 @@ class RecommendationService:
                 )
                 questions.extend(unit_questions[:3])
         else:
-            # 진단 결과가 없는 경우: 기본 문제 선택 (LEET 단원)
+            # 풀이 기록이 없는 경우: 기본 문제 선택 (LEET 단원)
             units = [
                 "언어이해-인식론", "언어이해-신경과학", "언어이해-법학",
                 "추리논증-논리학", "추리논증-경제학", "추리논증-논리게임",
@@ -111,6 +111,7 @@ class RecommendationService:
         total_points = 0
         correct_count = 0
         wrong_questions = []
+        answer_events = []
         
         for question in questions:
             question_id = str(question.id)
@@ -118,6 +119,13 @@ class RecommendationService:
             correct_answer = question.correct_answer
             
             total_points += question.points
+            answer_events.append({
+                "question_id": question.id,
+                "is_correct": user_answer == correct_answer,
+                "user_answer": user_answer,
+                "unit": question.unit,
+                "points": question.points
+            })
             
             if user_answer == correct_answer:
                 total_score += question.points
@@ -160,7 +168,24 @@ class RecommendationService:
         )
         
         self.db.add(daily_test_result)
+        self.db.flush()
+        
+        # 문항별 응답 기록 (정답 포함) 및 단원별 누적 성과 반영
+        self.answer_event_service.record_answers(
+            user_id, "daily_test", daily_test_result.id, answer_events
+        )
+        self.unit_stats_service.record_results(user_id, answer_events)
+        # 학습한 날로 표시 (대시보드 연속 학습일은 활동 비트맵 기준)
+        self.learning_streak_service.mark_study_day(user_id)
+        
+        # 점수 분포 누적 후 백분위/순위 계산
+        self.ranking_service.record_score("daily_test", accuracy)
         self.db.commit()
+        self.ranking_service.apply_score("daily_test", accuracy)
+        
+        standing = self.ranking_service.get_standing("daily_test", accuracy)
+        result["percentile"] = standing["percentile"]
+        result["rank"] = standing["rank"]
         
         # 오답 노트 업데이트
         if wrong_questions:
@@ -209,28 +234,21 @@ class RecommendationService:
         
         return total_time
     
-    def get_recommended_questions(self, user_id: int, unit: str = None, limit: int = 5) -> List[Dict[str, Any]]:
+    def get_recommended_questions(self, user: UserResponse, unit: str = None, limit: int = 5) -> List[Dict[str, Any]]:
         """추천 문제 조회"""
-        # 사용자 정보 조회
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return []
+        user_id = user.id
         
-        # 진단 결과 조회
-        diagnostic_result = self.diagnostic_service.get_user_diagnostic_result(user_id)
+        # 단원별 누적 성과 기준 약점 단원
+        weak_units = self.unit_stats_service.get_weak_units(user_id, limit=3)
         
-        if diagnostic_result.get("diagnostic_completed"):
-            # 진단 결과가 있는 경우: 약점 단원 우선
-            weak_units = diagnostic_result.get("weak_units", [])
-            if unit:
-                target_unit = unit
-            elif weak_units:
-                target_unit = random.choice(weak_units)
-            else:
-                target_unit = "수학I"
+        if unit:
+            target_unit = unit
+        elif weak_units:
+            # 풀이 기록이 있는 경우: 약점 단원 우선
+            target_unit = random.choice(weak_units)
         else:
-            # 진단 결과가 없는 경우: 기본 단원
-            target_unit = unit or "수학I"
+            # 풀이 기록이 없는 경우: 기본 단원
+            target_unit = "수학I"
         
         # 추천 문제 조회
         questions = self.question_service.get_questions_by_criteria(
@@ -247,8 +265,9 @@ class RecommendationService:
         
         return [result.to_dict() for result in results]
     
-    def get_today_daily_test(self, user_id: int) -> Dict[str, Any]:
+    def get_today_daily_test(self, user: UserResponse) -> Dict[str, Any]:
         """오늘의 일일 모의고사 조회 (이미 완료했는지 확인)"""
+        user_id = user.id
         today = datetime.now().date()
         
         # 오늘 완료한 일일 모의고사가 있는지 확인
@@ -266,5 +285,5 @@ class RecommendationService:
         # 오늘 완료하지 않았다면 새로운 일일 모의고사 생성
         return {
             "already_completed": False,
-            "daily_test": self.generate_daily_test(user_id)
+            "daily_test": self.generate_daily_test(user)
         } 
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+전문 검색 서비스
+
+문제 은행(내용/해설)과 오답 노트(문제 내용/해설)를 마이그레이션 m0009가 만든 색인으로 검색합니다.
+
+- SQLite: trigram FTS5 테이블(<테이블>_fts)에 MATCH로 찾고 bm25로 정렬합니다.
+  정렬은 id와 점수만으로 하고 본문은 페이지에 들어갈 행만 읽어 발췌를 만듭니다.
+  (snippet()이나 본문 컬럼을 함께 고르면 일치한 모든 행을 정렬기에 싣게 되어 몇 배 느림)
+  trigram은 조사가 붙은 한국어 어절 안의 부분 문자열도 찾지만 3글자 미만 검색어는 색인을
+  쓸 수 없으므로, 그런 검색어는 찾은 결과 안에서 LIKE로 거릅니다. (모든 검색어가 짧으면 LIKE 검색)
+  SQLite가 trigram 토크나이저(3.34 이상의 FTS5)를 지원하지 않아 마이그레이션이 색인을 만들지
+  못했으면 모든 검색어를 LIKE로 찾습니다.
+- PostgreSQL: search_vector(tsvector)에 검색어별 접두어 질의(term:*)로 찾고
+  ts_rank_cd로 정렬, 검색어가 처음 나오는 컬럼을 ts_headline으로 발췌합니다.
+"""
+
+import html
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from models.database import SessionLocal
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# ts_headline에 넘기는 구분자 (본문을 HTML 이스케이프한 뒤 강조 태그로 바꿈)
+_HEADLINE_START = "\x02"
+_HEADLINE_END = "\x03"
+SNIPPET_CHARS = 60
+
+# bm25 컬럼 가중치 (문제 본문 일치를 해설 일치보다 높게)
+COLUMN_WEIGHTS = (4.0, 1.0)
+
+MAX_TERMS = 8
+MIN_INDEXED_TERM = 3  # trigram 색인을 쓸 수 있는 최소 검색어 길이
+
+_TERM = re.compile(r"[^\W_]+")
+
+# 검색 결과로 돌려줄 컬럼 (t는 검색 대상 테이블)
+QUESTION_COLUMNS = "t.id, t.subject, t.unit, t.difficulty, t.points, t.question_type"
+WRONG_NOTE_COLUMNS = (
+    "t.id, t.question_id, t.subject, t.unit, t.topic, t.mastered, t.review_count, t.created_at"
+)
+
+
+def parse_terms(query: str) -> Tuple[List[str], List[str]]:
+    """검색어 -> (색인 검색어, 3글자 미만 검색어)"""
+    terms = list(dict.fromkeys(term.lower() for term in _TERM.findall(query or "")))[:MAX_TERMS]
+    return (
+        [term for term in terms if len(term) >= MIN_INDEXED_TERM],
+        [term for term in terms if len(term) < MIN_INDEXED_TERM],
+    )
+
+
+def _highlight(text: str, pattern: "re.Pattern[str]") -> str:
+    """본문은 HTML 이스케이프하고 pattern에 맞는 부분만 강조 태그로 감쌉니다"""
+    parts, last = [], 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[last:match.start()]))
+        parts.append(f"{HIGHLIGHT_START}{html.escape(match.group(0))}{HIGHLIGHT_END}")
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
+
+
+def make_snippet(texts: List[Optional[str]], terms: List[str]) -> str:
+    """검색어가 처음 나오는 컬럼에서 그 주변을 잘라 검색어를 강조한 발췌 (HTML 이스케이프됨)"""
+    texts = [value or "" for value in texts]
+    content, position = texts[0], -1
+    for value in texts:
+        lowered = value.lower()
+        positions = [lowered.find(term) for term in terms if term in lowered]
+        if positions:
+            content, position = value, min(positions)
+            break
+    if position < 0:
+        return html.escape(content[:SNIPPET_CHARS])
+
+    start = max(position - SNIPPET_CHARS // 3, 0)
+    pattern = re.compile(
+        "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE
+    )
+    snippet = _highlight(content[start:start + SNIPPET_CHARS], pattern)
+    return ("…" if start else "") + snippet + ("…" if start + SNIPPET_CHARS < len(content) else "")
+
+
+def _headline_html(headline: Optional[str]) -> str:
+    """ts_headline 결과 -> HTML 이스케이프 후 구분자를 강조 태그로 바꾼 발췌"""
+    return (
+        html.escape(headline or "")
+        .replace(_HEADLINE_START, HIGHLIGHT_START)
+        .replace(_HEADLINE_END, HIGHLIGHT_END)
+    )
+
+
+class SearchService:
+    """문제/오답 노트 전문 검색 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+        self._fts_tables: Dict[str, bool] = {}
+
+    def _is_postgresql(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def _has_fts(self, table: str) -> bool:
+        """SQLite FTS5 색인 테이블이 있는지 (테이블마다 처음 검색할 때 한 번 확인)"""
+        if table not in self._fts_tables:
+            self._fts_tables[table] = self.db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": f"{table}_fts"}
+            ).first() is not None
+        return self._fts_tables[table]
+
+    def _search(self, table: str, columns: str, text_columns: Tuple[str, str], query: str,
+                filters: Dict[str, Any], limit: int, offset: int) -> Dict[str, Any]:
+        """공통 검색 (limit + 1개를 읽어 다음 페이지 여부를 판단)"""
+        indexed, short = parse_terms(query)
+        page = {"results": [], "limit": limit, "offset": offset, "has_more": False}
+        if not indexed and not short:
+            return page
+
+        params: Dict[str, Any] = {"limit": limit + 1, "offset": offset}
+        conditions = []
+        for i, (column, value) in enumerate(filters.items()):
+            conditions.append(f"t.{column} = :filter_{i}")
+            params[f"filter_{i}"] = value
+
+        if self._is_postgresql():
+            sql = self._postgresql_sql(table, columns, text_columns, indexed + short, conditions, params)
+        elif indexed and self._has_fts(table):
+            sql = self._sqlite_sql(table, columns, text_columns, indexed, short, conditions, params)
+        else:
+            sql = self._like_sql(table, columns, text_columns, indexed + short, conditions, params)
+
+        rows = [dict(row) for row in self.db.execute(text(sql), params).mappings()]
+        if self._is_postgresql():
+            for row in rows:
+                row["snippet"] = _headline_html(row["snippet"])
+        else:
+            for row in rows:
+                row["snippet"] = make_snippet([row.pop(column) for column in text_columns], indexed + short)
+
+        page["has_more"] = len(rows) > limit
+        page["results"] = rows[:limit]
+        return page
+
+    def _like_conditions(self, text_columns: Tuple[str, str], terms: List[str],
+                         params: Dict[str, Any]) -> List[str]:
+        conditions = []
+        for i, term in enumerate(terms):
+            params[f"like_{i}"] = f"%{term}%"
+            conditions.append("(" + " OR ".join(f"t.{column} LIKE :like_{i}" for column in text_columns) + ")")
+        return conditions
+
+    def _sqlite_sql(self, table: str, columns: str, text_columns: Tuple[str, str], indexed: List[str],
+                    short: List[str], conditions: List[str], params: Dict[str, Any]) -> str:
+        fts = f"{table}_fts"
+        # 각 검색어를 구문으로 따옴표 처리해 FTS5 질의 문법과 섞이지 않게 합니다.
+        params["match"] = " AND ".join('"' + term.replace('"', '""') + '"' for term in indexed)
+        rank = f"bm25({fts}, {', '.join(map(str, COLUMN_WEIGHTS))})"
+        where = [f"{fts} MATCH :match", *conditions, *self._like_conditions(text_columns, short, params)]
+        return f"""
+            SELECT {columns}, {", ".join(f"t.{column}" for column in text_columns)}, ranked.score
+            FROM (
+                SELECT {fts}.rowid AS id, -{rank} AS score
+                FROM {fts} JOIN {table} t ON t.id = {fts}.rowid
+                WHERE {" AND ".join(where)}
+                ORDER BY score DESC, id
+                LIMIT :limit OFFSET :offset
+            ) ranked
+            JOIN {table} t ON t.id = ranked.id
+            ORDER BY ranked.score DESC, t.id
+        """
+
+    def _like_sql(self, table: str, columns: str, text_columns: Tuple[str, str], terms: List[str],
+                  conditions: List[str], params: Dict[str, Any]) -> str:
+        where = [*conditions, *self._like_conditions(text_columns, terms, params)]
+        return f"""
+            SELECT {columns}, {", ".join(f"t.{column}" for column in text_columns)}, 0.0 AS score
+            FROM {table} t
+            WHERE {" AND ".join(where)}
+            ORDER BY t.id DESC
+            LIMIT :limit OFFSET :offset
+        """
+
+    def _postgresql_sql(self, table: str, columns: str, text_columns: Tuple[str, str], terms: List[str],
+                        conditions: List[str], params: Dict[str, Any]) -> str:
+        # 조사가 붙은 어절도 찾도록 검색어마다 접두어 질의를 씁니다. (_TERM이 특수문자를 걸러 둠)
+        params["tsquery"] = " & ".join(f"{term}:*" for term in terms)
+        params["any_tsquery"] = " | ".join(f"{term}:*" for term in terms)
+        params["headline_options"] = (
+            f"StartSel={_HEADLINE_START}, StopSel={_HEADLINE_END}, MaxWords=20, MinWords=8"
+        )
+        # SQLite 경로(make_snippet)와 같이 검색어가 처음 나오는 컬럼에서 발췌합니다.
+        headline_source = "CASE " + " ".join(
+            f"WHEN to_tsvector('simple', coalesce(t.{column}, '')) @@ to_tsquery('simple', :any_tsquery) "
+            f"THEN t.{column}"
+            for column in text_columns
+        ) + f" ELSE t.{text_columns[0]} END"
+        where = ["t.search_vector @@ query", *conditions]
+        return f"""
+            SELECT {columns},
+                   ts_headline('simple', {headline_source}, query,
+                               :headline_options) AS snippet,
+                   ts_rank_cd(t.search_vector, query) AS score
+            FROM {table} t, to_tsquery('simple', :tsquery) query
+            WHERE {" AND ".join(where)}
+            ORDER BY score DESC, t.id
+            LIMIT :limit OFFSET :offset
+        """
+
+    def search_questions(self, query: str, unit: Optional[str] = None,
+                         limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """문제 은행 검색 (내용/해설, 관련도 순)"""
+        filters = {"unit": unit} if unit else {}
+        return self._search("question_banks", QUESTION_COLUMNS, ("content", "explanation"),
+                            query, filters, limit, offset)
+
+    def search_wrong_notes(self, user_id: int, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """사용자의 오답 노트 검색 (문제 내용/해설, 관련도 순)"""
+        page = self._search("wrong_answers", WRONG_NOTE_COLUMNS, ("question_content", "explanation"),
+                            query, {"user_id": int(user_id)}, limit, offset)
+        for row in page["results"]:
+            row["mastered"] = bool(row["mastered"])  # SQLite는 0/1로 돌려줌
+        return page
@@ -0,0 +1,262 @@
+"""
+학습 패턴 분석 서비스
+
+모의고사 완료, 오답 복습, 일일 활동 기록의 시각을 시간대(0-23시)와 요일로 나눠
+이벤트 수, 정답률, 세션 길이를 pandas/NumPy로 한 번에 집계합니다.
+야간 배치가 사용자 묶음 단위로 실행해 study_pattern_snapshots에 저장하고,
+주간 리포트는 저장된 스냅샷만 읽습니다.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, literal, select
+
+from models.analytics import StudyPatternSnapshot
+from models.daily_test import DailyTestResult
+from models.database import SessionLocal, dialect_insert
+from models.learning_streak import DailyActivity
+from models.user import User
+from models.wrong_answer import WrongAnswer, WrongAnswerReview
+
+WEEKDAY_NAMES = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+
+# 이전 이벤트와 이 시간(분) 이상 떨어지면 새 세션으로 봅니다.
+SESSION_GAP_MINUTES = 30
+
+# 정답률 비교에 사용할 최소 문제 수 (표본이 너무 적은 구간 제외)
+MIN_SLOT_ATTEMPTS = 5
+
+EVENT_COLUMNS = ["user_id", "timestamp", "attempted", "correct", "minutes"]
+
+# 시간대/요일을 나눌 기준 시간대 (DB 시각은 UTC로 보고 이 시간대로 바꿈)
+APP_TIMEZONE = os.getenv("APP_TIMEZONE", "Asia/Seoul")
+
+
+def _period_of(hour: int) -> str:
+    if hour < 6:
+        return "새벽"
+    if hour < 12:
+        return "오전"
+    if hour < 18:
+        return "오후"
+    return "저녁"
+
+
+def _slot_label(start_hour: int) -> str:
+    """2시간 구간 이름 (예: 14 -> '오후 2-4시')"""
+    period = _period_of(start_hour)
+    if period == "새벽":
+        return f"{period} {start_hour}-{start_hour + 2}시"
+    start = start_hour % 12 or 12
+    return f"{period} {start}-{start + 2}시"
+
+
+def _to_list(values) -> List[Optional[float]]:
+    """NaN을 None으로 바꾼 JSON 저장용 리스트"""
+    return [None if np.isnan(v) else round(float(v), 1) for v in values]
+
+
+class StudyPatternService:
+    """학습 패턴 스냅샷 계산/조회 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+
+    # 이벤트 로드
+
+    def load_events(self, user_ids: List[int]) -> pd.DataFrame:
+        """사용자 묶음의 학습 이벤트를 하나의 DataFrame으로 읽습니다
+
+        컬럼마다 시간대 정보가 다르므로(completed_at은 naive, 나머지는 timezone=True)
+        모두 UTC로 맞춘 뒤 APP_TIMEZONE으로 바꿉니다. naive 값은 서버 기본값(UTC)으로 봅니다.
+
+        Returns:
+            user_id, timestamp(APP_TIMEZONE), attempted(푼 문제 수), correct(정답 수), minutes(소요 시간) 컬럼
+        """
+        tests = self.db.execute(select(
+            DailyTestResult.user_id,
+            DailyTestResult.completed_at,
+            DailyTestResult.total_questions,
+            DailyTestResult.correct_count,
+            # 배점 + 1분 (일일 모의고사 예상 풀이 시간과 같은 기준)
+            func.coalesce(DailyTestResult.total_points, 0) + func.coalesce(DailyTestResult.total_questions, 0),
+        ).where(DailyTestResult.user_id.in_(user_ids))).all()
+
+        reviews = self.db.execute(select(
+            WrongAnswer.user_id,
+            WrongAnswerReview.created_at,
+            literal(1),
+            WrongAnswerReview.is_correct,
+            func.coalesce(WrongAnswerReview.time_taken, 60) / 60.0,
+        ).join(WrongAnswer, WrongAnswer.id == WrongAnswerReview.wrong_answer_id)
+            .where(WrongAnswer.user_id.in_(user_ids))).all()
+
+        activities = self.db.execute(select(
+            DailyActivity.user_id,
+            func.coalesce(DailyActivity.updated_at, DailyActivity.created_at),
+            DailyActivity.questions_solved,
+            DailyActivity.correct_answers,
+            DailyActivity.study_time_minutes,
+        ).where(DailyActivity.user_id.in_(user_ids))).all()
+
+        events = pd.DataFrame.from_records(
+            [tuple(row) for row in (*tests, *reviews, *activities)], columns=EVENT_COLUMNS
+        )
+        events["timestamp"] = pd.to_datetime(events["timestamp"], utc=True).dt.tz_convert(APP_TIMEZONE)
+        for column in ("attempted", "correct", "minutes"):
+            events[column] = pd.to_numeric(events[column]).fillna(0).astype(float)
+        return events.dropna(subset=["timestamp"])
+
+    # 분석
+
+    def analyze(self, events: pd.DataFrame) -> Dict[int, Dict[str, Any]]:
+        """이벤트를 사용자별 시간대/요일 패턴으로 집계합니다"""
+        if events.empty:
+            return {}
+
+        events = events.sort_values(["user_id", "timestamp"]).reset_index(drop=True)
+        events["hour"] = events["timestamp"].dt.hour
+        events["weekday"] = events["timestamp"].dt.weekday
+
+        def _pivot(column: str, key: str, size: int, how: str = "sum") -> pd.DataFrame:
+            grouped = events.groupby(["user_id", key])
+            table = grouped.size() if how == "count" else grouped[column].sum()
+            return table.unstack(fill_value=0).reindex(columns=range(size), fill_value=0)
+
+        hour_counts = _pivot("", "hour", 24, "count")
+        hour_attempted = _pivot("attempted", "hour", 24)
+        hour_correct = _pivot("correct", "hour", 24)
+        weekday_counts = _pivot("", "weekday", 7, "count")
+        weekday_attempted = _pivot("attempted", "weekday", 7)
+        weekday_correct = _pivot("correct", "weekday", 7)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hour_accuracy = np.where(hour_attempted > 0, hour_correct / hour_attempted * 100, np.nan)
+            weekday_accuracy = np.where(weekday_attempted > 0, weekday_correct / weekday_attempted * 100, np.nan)
+
+        # 2시간 구간 정답률 (표본이 적은 구간은 제외)
+        slot_attempted = hour_attempted.to_numpy().reshape(-1, 12, 2).sum(axis=2)
+        slot_correct = hour_correct.to_numpy().reshape(-1, 12, 2).sum(axis=2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slot_accuracy = np.where(slot_attempted >= MIN_SLOT_ATTEMPTS, slot_correct / slot_attempted, np.nan)
+
+        # 세션 구분: 사용자가 바뀌거나 이전 이벤트와 SESSION_GAP_MINUTES 이상 벌어지면 새 세션
+        gap = events["timestamp"].diff().dt.total_seconds().div(60)
+        new_session = (events["user_id"] != events["user_id"].shift()) | (gap > SESSION_GAP_MINUTES)
+        events["session"] = new_session.cumsum()
+        sessions = events.groupby("session").agg(
+            user_id=("user_id", "first"),
+            start=("timestamp", "min"),
+            end=("timestamp", "max"),
+            minutes=("minutes", "sum"),
+            hour=("hour", "first"),
+        )
+        span = (sessions["end"] - sessions["start"]).dt.total_seconds().div(60)
+        sessions["length"] = np.maximum(span, sessions["minutes"])
+        session_length = sessions.groupby("user_id")["length"].mean()
+        hour_session_length = sessions.groupby(["user_id", "hour"])["length"].mean().unstack().reindex(
+            columns=range(24)
+        )
+
+        totals = events.groupby("user_id")[["attempted", "correct"]].sum()
+        event_counts = events.groupby("user_id").size()
+
+        snapshots = {}
+        for row, user_id in enumerate(hour_counts.index):
+            attempted = totals.at[user_id, "attempted"]
+            accuracy = totals.at[user_id, "correct"] / attempted * 100 if attempted else None
+
+            period_counts = {}
+            for hour, count in enumerate(hour_counts.iloc[row]):
+                period_counts[_period_of(hour)] = period_counts.get(_period_of(hour), 0) + int(count)
+
+            # 정답 수가 가장 많은 요일 (정답 기록이 없으면 이벤트가 가장 많은 요일)
+            day_scores = weekday_correct.iloc[row].to_numpy()
+            if day_scores.sum() == 0:
+                day_scores = weekday_counts.iloc[row].to_numpy()
+
+            weakest_slot = None
+            if not np.all(np.isnan(slot_accuracy[row])):
+                weakest_slot = _slot_label(int(np.nanargmin(slot_accuracy[row])) * 2)
+
+            if accuracy is None:
+                concentration = None
+            elif accuracy >= 75:
+                concentration = "높음"
+            elif accuracy >= 50:
+                concentration = "보통"
+            else:
+                concentration = "낮음"
+
+            snapshots[int(user_id)] = {
+                "user_id": int(user_id),
+                "event_count": int(event_counts[user_id]),
+                "hour_histogram": [int(v) for v in hour_counts.iloc[row]],
+                "hour_accuracy": _to_list(hour_accuracy[row]),
+                "hour_session_length": _to_list(hour_session_length.loc[user_id].to_numpy(dtype=float)),
+                "weekday_histogram": [int(v) for v in weekday_counts.iloc[row]],
+                "weekday_accuracy": _to_list(weekday_accuracy[row]),
+                "preferred_study_time": max(period_counts, key=period_counts.get),
+                "most_productive_day": WEEKDAY_NAMES[int(np.argmax(day_scores))],
+                "average_session_length": int(round(session_length[user_id])),
+                "concentration_level": concentration,
+                "weakest_time_slot": weakest_slot,
+            }
+
+        return snapshots
+
+    # 배치
+
+    def _user_id_chunks(self, chunk_size: int) -> Iterator[List[int]]:
+        """users 테이블을 id 기준 키셋 페이지네이션으로 나눠 읽습니다"""
+        last_id = 0
+        while True:
+            user_ids = self.db.execute(
+                select(User.id).where(User.id > last_id).order_by(User.id).limit(chunk_size)
+            ).scalars().all()
+            if not user_ids:
+                return
+            yield user_ids
+            last_id = user_ids[-1]
+
+    def build_snapshots(self, chunk_size: int = 500) -> Dict[str, int]:
+        """전체 사용자의 학습 패턴 스냅샷을 묶음 단위로 계산해 저장합니다
+
+        한 번에 chunk_size명의 이벤트만 메모리에 올립니다.
+
+        Returns:
+            처리한 사용자 수, 저장한 스냅샷 수, 이벤트 수
+        """
+        insert = dialect_insert(self.db)
+        processed = written = event_total = 0
+
+        for user_ids in self._user_id_chunks(chunk_size):
+            events = self.load_events(user_ids)
+            snapshots = self.analyze(events)
+            processed += len(user_ids)
+            event_total += len(events)
+
+            if snapshots:
+                rows = [dict(snapshot, computed_at=datetime.now()) for snapshot in snapshots.values()]
+                stmt = insert(StudyPatternSnapshot.__table__)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={column: stmt.excluded[column] for column in rows[0] if column != "user_id"}
+                )
+                self.db.execute(stmt, rows)
+                self.db.commit()
+                written += len(rows)
+
+        return {"users": processed, "snapshots": written, "events": event_total}
+
+    # 조회
+
+    def get_snapshot(self, user_id: int) -> Optional[StudyPatternSnapshot]:
+        """저장된 학습 패턴 스냅샷"""
+        return self.db.query(StudyPatternSnapshot).filter(
+            StudyPatternSnapshot.user_id == user_id
+        ).first()
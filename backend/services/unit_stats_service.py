@@ -0,0 +1,107 @@
+"""
+단원별 성과 서비스
+
+채점 결과를 (사용자, 단원)별 누적 카운터(unit_stats)에 더하고,
+강점/약점 단원 조회를 이 카운터 위에서 제공합니다.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.analytics import UnitStats
+from models.database import SessionLocal, dialect_insert
+
+# 강점/약점 판단에 필요한 최소 응답 수 (이보다 적은 단원은 다른 단원이 없을 때만 사용)
+MIN_ATTEMPTS = 5
+
+
+def _accuracy(correct: int, attempted: int) -> float:
+    return round(correct / attempted * 100, 1) if attempted else 0.0
+
+
+class UnitStatsService:
+    """단원별 누적 성과 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+
+    def record_results(self, user_id: int, graded: List[Dict[str, Any]]):
+        """채점된 문제들을 단원별로 묶어 카운터에 더합니다
+
+        단원마다 한 행씩, 한 번의 INSERT ... ON CONFLICT DO UPDATE로 누적합니다.
+        커밋하지 않으므로 호출한 쪽에서 결과 저장과 같은 트랜잭션으로 커밋합니다.
+
+        Args:
+            user_id: 사용자 ID
+            graded: unit, is_correct, points 딕셔너리 목록
+        """
+        totals: Dict[str, Dict[str, int]] = {}
+        for item in graded:
+            unit = item.get("unit") or "기타"
+            points = item.get("points") or 0
+            row = totals.setdefault(unit, {
+                "attempted": 0, "correct": 0, "points_attempted": 0, "points_earned": 0
+            })
+            row["attempted"] += 1
+            row["points_attempted"] += points
+            if item["is_correct"]:
+                row["correct"] += 1
+                row["points_earned"] += points
+
+        if not totals:
+            return
+
+        insert = dialect_insert(self.db)
+        table = UnitStats.__table__
+        stmt = insert(table).values([
+            {"user_id": user_id, "unit": unit, "updated_at": datetime.now(), **counts}
+            for unit, counts in totals.items()
+        ])
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id", "unit"],
+            set_={
+                "attempted": table.c.attempted + stmt.excluded.attempted,
+                "correct": table.c.correct + stmt.excluded.correct,
+                "points_attempted": table.c.points_attempted + stmt.excluded.points_attempted,
+                "points_earned": table.c.points_earned + stmt.excluded.points_earned,
+                "updated_at": stmt.excluded.updated_at
+            }
+        ))
+
+    def get_unit_stats(self, user_id: int) -> List[Dict[str, Any]]:
+        """사용자의 단원별 성과 (정답률 낮은 순)"""
+        rows = self.db.query(UnitStats).filter(UnitStats.user_id == user_id).all()
+        stats = [
+            {
+                "unit": row.unit,
+                "attempted": row.attempted,
+                "correct": row.correct,
+                "accuracy": _accuracy(row.correct, row.attempted),
+                "points_attempted": row.points_attempted,
+                "points_earned": row.points_earned
+            }
+            for row in rows
+        ]
+        stats.sort(key=lambda s: (s["accuracy"], -s["attempted"], s["unit"]))
+        return stats
+
+    def _ranked_units(self, user_id: int) -> List[Dict[str, Any]]:
+        """판단 근거가 충분한 단원 우선, 정답률 낮은 순"""
+        stats = self.get_unit_stats(user_id)
+        reliable = [s for s in stats if s["attempted"] >= MIN_ATTEMPTS]
+        return reliable or stats
+
+    def get_strongest_weakest(self, user_id: int) -> Tuple[Optional[str], Optional[str]]:
+        """가장 정답률이 높은/낮은 단원 (기록이 없으면 None)"""
+        ranked = self._ranked_units(user_id)
+        if not ranked:
+            return None, None
+        return ranked[-1]["unit"], ranked[0]["unit"]
+
+    def get_weak_units(self, user_id: int, limit: int = 3) -> List[str]:
+        """정답률이 낮은 단원부터 limit개"""
+        return [s["unit"] for s in self._ranked_units(user_id)[:limit]]
+
+    def get_strong_units(self, user_id: int, limit: int = 2) -> List[str]:
+        """정답률이 높은 단원부터 limit개"""
+        return [s["unit"] for s in reversed(self._ranked_units(user_id))][:limit]
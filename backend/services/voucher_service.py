@@ -1,56 +1,91 @@
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from models.voucher import Voucher, UserVoucher, PaymentHistory, PaymentMethod
+from models.database import dialect_insert
+from models.voucher import Voucher, UserVoucher, PaymentHistory, PaymentMethod, CatalogVersion
 from models.user import User
-from typing import List, Optional
+from services.entitlement_service import invalidate_entitlement
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
+import threading
+import time
+
+CATALOG_NAME = "vouchers"
+
+# 다른 프로세스의 카탈로그 변경을 확인하는 주기 (초)
+CATALOG_CHECK_INTERVAL_SECONDS = 30
+
+# 프로세스 전체 이용권 카탈로그 캐시
+_catalog_lock = threading.Lock()
+_catalog: Dict[str, Any] = {"version": None, "checked_at": 0.0, "vouchers": []}
+
+
+def _voucher_dict(voucher: Voucher) -> dict:
+    return {
+        "id": str(voucher.id),
+        "name": voucher.name,
+        "type": voucher.type,
+        "price": voucher.price,
+        "period": voucher.period,
+        "features": voucher.features,
+        "is_active": voucher.is_active
+    }
+
 
 class VoucherService:
     def __init__(self, db: Session):
         self.db = db
 
     def get_user_voucher_info(self, user_id: int) -> dict:
-        """사용자의 현재 이용권 정보를 가져옵니다."""
-        user_voucher = self.db.query(UserVoucher).filter(
+        """사용자의 현재 이용권 정보를 가져옵니다. (이용권 조인 한 번)"""
+        row = self.db.query(Voucher).join(
+            UserVoucher, UserVoucher.voucher_id == Voucher.id
+        ).filter(
             UserVoucher.user_id == user_id,
-            UserVoucher.is_active == True
+            UserVoucher.is_active == True,
+            or_(UserVoucher.expires_at.is_(None), UserVoucher.expires_at > datetime.now())
         ).first()
 
-        if not user_voucher:
+        if not row:
             return {"voucher": None}
 
-        voucher = self.db.query(Voucher).filter(Voucher.id == user_voucher.voucher_id).first()
-        
+        return {"voucher": _voucher_dict(row)}
+
+    def get_payment_history(self, user_id: int, limit: int = 20, before_id: Optional[int] = None) -> dict:
+        """사용자의 결제 내역을 최신순으로 가져옵니다.
+
+        이용권 이름은 조인으로 함께 읽고, (user_id, id) 인덱스로 키셋 페이지네이션합니다.
+
+        Args:
+            limit: 한 페이지 크기
+            before_id: 이전 페이지의 next_before_id (없으면 첫 페이지)
+
+        Returns:
+            결제 내역 목록과 다음 페이지 커서 (마지막 페이지면 None)
+        """
+        query = self.db.query(PaymentHistory, Voucher.name).outerjoin(
+            Voucher, Voucher.id == PaymentHistory.voucher_id
+        ).filter(PaymentHistory.user_id == user_id)
+        if before_id is not None:
+            query = query.filter(PaymentHistory.id < before_id)
+
+        rows = query.order_by(PaymentHistory.id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
         return {
-            "voucher": {
-                "id": str(voucher.id),
-                "name": voucher.name,
-                "type": voucher.type,
-                "price": voucher.price,
-                "period": voucher.period,
-                "features": voucher.features,
-                "is_active": voucher.is_active
-            }
+            "payments": [
+                {
+                    "id": str(payment.id),
+                    "voucher_name": voucher_name or "알 수 없음",
+                    "amount": payment.amount,
+                    "date": payment.created_at.isoformat(),
+                    "status": payment.status
+                }
+                for payment, voucher_name in rows
+            ],
+            "next_before_id": rows[-1][0].id if has_more else None
         }
 
-    def get_payment_history(self, user_id: int) -> List[dict]:
-        """사용자의 결제 내역을 가져옵니다."""
-        payments = self.db.query(PaymentHistory).filter(
-            PaymentHistory.user_id == user_id
-        ).order_by(PaymentHistory.created_at.desc()).all()
-
-        result = []
-        for payment in payments:
-            voucher = self.db.query(Voucher).filter(Voucher.id == payment.voucher_id).first()
-            result.append({
-                "id": str(payment.id),
-                "voucher_name": voucher.name if voucher else "알 수 없음",
-                "amount": payment.amount,
-                "date": payment.created_at.isoformat(),
-                "status": payment.status
-            })
-
-        return result
-
     def get_payment_method(self, user_id: int) -> Optional[dict]:
         """사용자의 결제 수단을 가져옵니다."""
         payment_method = self.db.query(PaymentMethod).filter(
@@ -68,23 +103,43 @@ class VoucherService:
             "expiry_date": payment_method.expiry_date
         }
 
+    def _catalog_version(self) -> int:
+        row = self.db.query(CatalogVersion.version).filter(CatalogVersion.name == CATALOG_NAME).first()
+        return row.version if row else 0
+
     def get_available_vouchers(self) -> List[dict]:
-        """이용 가능한 이용권 목록을 가져옵니다."""
-        vouchers = self.db.query(Voucher).filter(Voucher.is_active == True).all()
-        
-        result = []
-        for voucher in vouchers:
-            result.append({
-                "id": str(voucher.id),
-                "name": voucher.name,
-                "type": voucher.type,
-                "price": voucher.price,
-                "period": voucher.period,
-                "features": voucher.features,
-                "is_active": voucher.is_active
-            })
-
-        return result
+        """이용 가능한 이용권 목록을 가져옵니다.
+
+        카탈로그는 프로세스 전체에서 캐시하고, CATALOG_CHECK_INTERVAL_SECONDS마다
+        카탈로그 버전만 확인해 바뀌었을 때 다시 읽습니다.
+        """
+        now = time.monotonic()
+        with _catalog_lock:
+            if _catalog["version"] is not None and now - _catalog["checked_at"] < CATALOG_CHECK_INTERVAL_SECONDS:
+                return list(_catalog["vouchers"])
+
+        version = self._catalog_version()
+        with _catalog_lock:
+            if version != _catalog["version"]:
+                vouchers = self.db.query(Voucher).filter(Voucher.is_active == True).order_by(Voucher.id).all()
+                _catalog["vouchers"] = [_voucher_dict(voucher) for voucher in vouchers]
+                _catalog["version"] = version
+            _catalog["checked_at"] = now
+            return list(_catalog["vouchers"])
+
+    def bump_catalog_version(self):
+        """이용권 카탈로그를 바꾼 뒤 호출해 모든 프로세스의 캐시를 무효화합니다."""
+        insert = dialect_insert(self.db)
+        table = CatalogVersion.__table__
+        stmt = insert(table).values(name=CATALOG_NAME, version=1, updated_at=datetime.now())
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": table.c.version + 1, "updated_at": stmt.excluded.updated_at}
+        ))
+        self.db.commit()
+
+        with _catalog_lock:
+            _catalog["version"] = None
 
     def purchase_voucher(self, user_id: int, voucher_id: int, payment_method_id: int) -> dict:
         """이용권을 구매합니다."""
@@ -128,6 +183,7 @@ class VoucherService:
         self.db.add(payment_history)
 
         self.db.commit()
+        invalidate_entitlement(user_id)
 
         return {
             "success": True,
@@ -146,6 +202,7 @@ class VoucherService:
 
         user_voucher.is_active = False
         self.db.commit()
+        invalidate_entitlement(user_id)
 
         return {
             "success": True,
@@ -0,0 +1,312 @@
+"""
+주간 학습 통계 서비스
+
+daily_test_results와 daily_activities를 ISO 주(월요일 시작) 단위로 집계합니다.
+종료된 주는 weekly_stats 테이블에 저장해 두고, 진행 중인 주만 조회 시점에 계산합니다.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Date, and_, cast, func, select, union
+
+from models.analytics import WeeklyStats
+from models.daily_test import DailyTestResult
+from models.database import SessionLocal, dialect_insert
+from models.learning_streak import DailyActivity
+
+
+def week_start_of(day: date) -> date:
+    """해당 날짜가 속한 ISO 주의 월요일"""
+    return day - timedelta(days=day.weekday())
+
+
+class WeeklyStatsService:
+    """주간 통계 집계/저장 서비스"""
+
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+        self._is_postgres = self.db.get_bind().dialect.name == "postgresql"
+
+    # SQL 식 (SQLite / PostgreSQL)
+
+    def _day(self, column):
+        """타임스탬프 컬럼의 날짜"""
+        if self._is_postgres:
+            return cast(column, Date)
+        return func.date(column)
+
+    def _week_start(self, column):
+        """날짜/타임스탬프 컬럼이 속한 주의 월요일"""
+        if self._is_postgres:
+            return cast(func.date_trunc("week", column), Date)
+        # 'weekday 0'은 다음(또는 당일) 일요일, 거기서 6일 전이 월요일
+        return func.date(column, "weekday 0", "-6 days")
+
+    @staticmethod
+    def _as_date(value) -> date:
+        return date.fromisoformat(value) if isinstance(value, str) else value
+
+    # 집계
+
+    def compute_weeks(self, start: date, end: date,
+                      user_id: Optional[int] = None) -> Dict[Tuple[int, date], Dict[str, Any]]:
+        """[start, end) 구간을 사용자/주 단위로 집계합니다
+
+        평균 정답률의 직전 학습 주 대비 변화는 LAG 윈도우 함수로 함께 계산합니다.
+        구간의 첫 주는 직전 주가 구간 밖에 있으므로 prev_average_score가 None입니다.
+
+        Returns:
+            (user_id, week_start) -> 집계 딕셔너리
+        """
+        start_at = datetime.combine(start, datetime.min.time())
+        end_at = datetime.combine(end, datetime.min.time())
+
+        test_filter = [DailyTestResult.completed_at >= start_at, DailyTestResult.completed_at < end_at]
+        activity_filter = [DailyActivity.activity_date >= start, DailyActivity.activity_date < end]
+        if user_id is not None:
+            test_filter.append(DailyTestResult.user_id == user_id)
+            activity_filter.append(DailyActivity.user_id == user_id)
+
+        # 일일 모의고사: 주별 합계 + 직전 학습 주 평균 (LAG)
+        test_week = self._week_start(DailyTestResult.completed_at).label("week_start")
+        test_weeks = select(
+            DailyTestResult.user_id.label("user_id"),
+            test_week,
+            func.count(DailyTestResult.id).label("tests_completed"),
+            func.coalesce(func.sum(DailyTestResult.total_questions), 0).label("questions_solved"),
+            func.coalesce(func.sum(DailyTestResult.correct_count), 0).label("correct_count"),
+            func.avg(DailyTestResult.accuracy).label("average_score"),
+        ).where(and_(*test_filter)).group_by(DailyTestResult.user_id, test_week).subquery()
+
+        test_rows = self.db.execute(select(
+            test_weeks,
+            func.lag(test_weeks.c.average_score).over(
+                partition_by=test_weeks.c.user_id, order_by=test_weeks.c.week_start
+            ).label("prev_average_score"),
+        )).mappings().all()
+
+        # 학습 활동: 주별 학습 시간
+        activity_week = self._week_start(DailyActivity.activity_date).label("week_start")
+        activity_rows = self.db.execute(select(
+            DailyActivity.user_id.label("user_id"),
+            activity_week,
+            func.coalesce(func.sum(DailyActivity.study_time_minutes), 0).label("total_study_time"),
+        ).where(and_(*activity_filter)).group_by(DailyActivity.user_id, activity_week)).mappings().all()
+
+        # 학습일: 모의고사 완료일과 활동 기록일의 합집합
+        days = union(
+            select(DailyTestResult.user_id.label("user_id"),
+                   self._day(DailyTestResult.completed_at).label("day")).where(and_(*test_filter)),
+            select(DailyActivity.user_id.label("user_id"),
+                   DailyActivity.activity_date.label("day")).where(and_(*activity_filter)),
+        ).subquery()
+        day_week = self._week_start(days.c.day).label("week_start")
+        day_rows = self.db.execute(select(
+            days.c.user_id, day_week, func.count().label("study_days")
+        ).group_by(days.c.user_id, day_week)).mappings().all()
+
+        weeks: Dict[Tuple[int, date], Dict[str, Any]] = {}
+
+        def _week(row) -> Dict[str, Any]:
+            key = (row["user_id"], self._as_date(row["week_start"]))
+            if key not in weeks:
+                weeks[key] = {
+                    "tests_completed": 0, "questions_solved": 0, "correct_count": 0,
+                    "average_score": 0.0, "prev_average_score": None,
+                    "study_days": 0, "total_study_time": 0,
+                }
+            return weeks[key]
+
+        for row in test_rows:
+            _week(row).update(
+                tests_completed=row["tests_completed"],
+                questions_solved=int(row["questions_solved"]),
+                correct_count=int(row["correct_count"]),
+                average_score=float(row["average_score"] or 0.0),
+                prev_average_score=row["prev_average_score"],
+            )
+        for row in activity_rows:
+            _week(row)["total_study_time"] = int(row["total_study_time"])
+        for row in day_rows:
+            _week(row)["study_days"] = row["study_days"]
+
+        return weeks
+
+    @staticmethod
+    def improvement_rate(current: Optional[float], previous: Optional[float]) -> float:
+        """직전 학습 주 대비 평균 정답률 변화율 (%)
+
+        이번 주에 본 모의고사가 없으면(current가 None) 비교하지 않고 0을 돌려줍니다.
+        """
+        if current is None or not previous:
+            return 0.0
+        return round((current - previous) / previous * 100, 1)
+
+    # 저장 (배치)
+
+    def materialize_closed_weeks(self, since: Optional[date] = None,
+                                 user_id: Optional[int] = None) -> int:
+        """종료된 주의 통계를 weekly_stats에 저장합니다
+
+        since를 지정하지 않으면 사용자마다 마지막으로 저장된 주 다음 주부터 지난주까지 계산합니다.
+        (한 사용자만 저장한 실행이 다른 사용자의 저장 시작점을 앞당기지 않도록 사용자별로 봄)
+        늦게 동기화된 과거 기록을 반영하려면 since로 재계산 시작일을 지정합니다.
+
+        Returns:
+            저장(갱신)한 행 수
+        """
+        current_week = week_start_of(date.today())
+        stored_until: Dict[int, date] = {}
+        if since is None:
+            latest = self.db.query(WeeklyStats.user_id, func.max(WeeklyStats.week_start))
+            if user_id is not None:
+                latest = latest.filter(WeeklyStats.user_id == user_id)
+            stored_until = dict(latest.group_by(WeeklyStats.user_id).all())
+            starts = [latest_week + timedelta(days=7) for latest_week in stored_until.values()]
+            # 저장된 주가 하나도 없는 사용자는 첫 기록부터
+            first_unstored = self._first_unstored_day(user_id)
+            if first_unstored is not None:
+                starts.append(first_unstored)
+            if not starts:
+                return 0
+            since = min(starts)
+        since = week_start_of(since) if since != date.min else since
+
+        if since >= current_week:
+            return 0
+
+        weeks = {
+            key: stats for key, stats in self.compute_weeks(since, current_week, user_id).items()
+            if key[1] > stored_until.get(key[0], date.min)
+        }
+        if not weeks:
+            return 0
+
+        # 구간 첫 주의 비교 기준은 저장된 직전 주
+        baselines = self._latest_stored_averages({uid for uid, _ in weeks}, before=since)
+
+        rows = []
+        for (uid, week_start), stats in sorted(weeks.items()):
+            previous = stats["prev_average_score"]
+            if previous is None:
+                previous = baselines.get(uid)
+            iso_year, iso_week, _ = week_start.isocalendar()
+            rows.append({
+                "user_id": uid,
+                "week_start": week_start,
+                "iso_year": iso_year,
+                "iso_week": iso_week,
+                "tests_completed": stats["tests_completed"],
+                "questions_solved": stats["questions_solved"],
+                "correct_count": stats["correct_count"],
+                "wrong_questions": stats["questions_solved"] - stats["correct_count"],
+                "average_score": round(stats["average_score"], 1),
+                "study_days": stats["study_days"],
+                "total_study_time": stats["total_study_time"],
+                "improvement_rate": self.improvement_rate(
+                    stats["average_score"] if stats["tests_completed"] else None, previous
+                ),
+                "computed_at": datetime.now(),
+            })
+
+        insert = dialect_insert(self.db)
+        stmt = insert(WeeklyStats.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "week_start"],
+            set_={column: stmt.excluded[column] for column in rows[0] if column not in ("user_id", "week_start")}
+        )
+        self.db.execute(stmt, rows)
+        self.db.commit()
+
+        return len(rows)
+
+    def _first_unstored_day(self, user_id: Optional[int] = None) -> Optional[date]:
+        """weekly_stats에 저장된 주가 없는 사용자의 가장 이른 기록 날짜"""
+        days = []
+        for user_column, day_column in (
+            (DailyTestResult.user_id, self._day(DailyTestResult.completed_at)),
+            (DailyActivity.user_id, DailyActivity.activity_date),
+        ):
+            query = self.db.query(func.min(day_column)).filter(
+                ~select(WeeklyStats.id).where(WeeklyStats.user_id == user_column).exists()
+            )
+            if user_id is not None:
+                query = query.filter(user_column == user_id)
+            day = query.scalar()
+            if day is not None:
+                days.append(self._as_date(day))
+        return min(days) if days else None
+
+    def _latest_stored_averages(self, user_ids: Iterable[int], before: date) -> Dict[int, float]:
+        """사용자별로 before 이전에 저장된 가장 최근 주의 평균 정답률"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+
+        latest = select(
+            WeeklyStats.user_id, func.max(WeeklyStats.week_start).label("week_start")
+        ).where(and_(
+            WeeklyStats.user_id.in_(user_ids),
+            WeeklyStats.week_start < before,
+            WeeklyStats.tests_completed > 0
+        )).group_by(WeeklyStats.user_id).subquery()
+
+        rows = self.db.execute(
+            select(WeeklyStats.user_id, WeeklyStats.average_score).join(
+                latest,
+                and_(WeeklyStats.user_id == latest.c.user_id, WeeklyStats.week_start == latest.c.week_start)
+            )
+        ).all()
+        return {uid: score for uid, score in rows}
+
+    # 조회
+
+    def get_current_week_stats(self, user_id: int) -> Dict[str, Any]:
+        """이번 주 통계 (진행 중인 주만 실시간 계산)
+
+        비교 기준은 저장된 직전 주를 읽으므로 기록이 쌓여도 비용이 일정합니다.
+        """
+        current_week = week_start_of(date.today())
+        stats = self.compute_weeks(current_week, current_week + timedelta(days=7), user_id).get(
+            (user_id, current_week)
+        )
+        if stats is None:
+            stats = {"tests_completed": 0, "questions_solved": 0, "correct_count": 0,
+                     "average_score": 0.0, "study_days": 0, "total_study_time": 0}
+
+        previous = self._latest_stored_averages([user_id], before=current_week).get(user_id)
+        average_score = stats["average_score"]
+
+        return {
+            "week_start": current_week.isoformat(),
+            "questions_solved": stats["questions_solved"],
+            "average_score": round(average_score, 1),
+            "study_days": stats["study_days"],
+            "total_study_time": stats["total_study_time"],
+            "wrong_questions": stats["questions_solved"] - stats["correct_count"],
+            "improvement_rate": self.improvement_rate(
+                average_score if stats["tests_completed"] else None, previous
+            )
+        }
+
+    def get_stored_weeks(self, user_id: int, limit: int = 12) -> List[Dict[str, Any]]:
+        """저장된 최근 주간 통계 (최신순)"""
+        rows = self.db.query(WeeklyStats).filter(
+            WeeklyStats.user_id == user_id
+        ).order_by(WeeklyStats.week_start.desc()).limit(limit).all()
+
+        return [
+            {
+                "week_start": row.week_start.isoformat(),
+                "iso_year": row.iso_year,
+                "iso_week": row.iso_week,
+                "questions_solved": row.questions_solved,
+                "average_score": row.average_score,
+                "study_days": row.study_days,
+                "total_study_time": row.total_study_time,
+                "wrong_questions": row.wrong_questions,
+                "improvement_rate": row.improvement_rate
+            }
+            for row in rows
+        ]
@@ -5,12 +5,12 @@
 """
 
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, case, insert, update
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import random
 
-from models.database import SessionLocal
+from models.database import SessionLocal, dialect_insert
 from models.wrong_answer import (
     WrongAnswer, WrongAnswerReview,
     WrongAnswerCreate, WrongAnswerResponse,
@@ -19,6 +19,10 @@ from models.wrong_answer import (
 )
 from models.user import User
 from services.auth_service import AuthService
+from services.answer_event_service import AnswerEventService
+
+# 연속 정답 횟수가 이 값에 도달하면 마스터로 판정
+MASTERY_STREAK = 3
 
 
 class WrongAnswerService:
@@ -27,9 +31,11 @@ class WrongAnswerService:
     틀린 문제 저장, 조회, 복습 관리 등의 기능을 제공합니다.
     """
     
-    def __init__(self):
-        self.db = SessionLocal()
-        self.auth_service = AuthService()
+    def __init__(self, db_session=None):
+        self.db = db_session or SessionLocal()
+        self._owns_session = db_session is None  # 직접 연 세션만 닫음
+        self.auth_service = AuthService(self.db)
+        self.answer_event_service = AnswerEventService(self.db)
     
     def add_wrong_answer(self, user_id: int, wrong_answer_data: WrongAnswerCreate) -> WrongAnswerResponse:
         """오답 노트에 틀린 문제 추가
@@ -41,34 +47,7 @@ class WrongAnswerService:
         Returns:
             생성된 오답 노트 항목
         """
-        # 중복 체크 (같은 문제를 이미 틀렸는지 확인)
-        existing = self.db.query(WrongAnswer).filter(
-            and_(
-                WrongAnswer.user_id == user_id,
-                WrongAnswer.question_id == wrong_answer_data.question_id,
-                WrongAnswer.source_type == wrong_answer_data.source_type
-            )
-        ).first()
-        
-        if existing:
-            # 이미 존재하는 경우 업데이트
-            existing.user_answer = wrong_answer_data.user_answer
-            existing.updated_at = datetime.now()
-            self.db.commit()
-            self.db.refresh(existing)
-            return WrongAnswerResponse.from_orm(existing)
-        
-        # 새로운 오답 노트 항목 생성
-        wrong_answer = WrongAnswer(
-            user_id=user_id,
-            **wrong_answer_data.dict()
-        )
-        
-        self.db.add(wrong_answer)
-        self.db.commit()
-        self.db.refresh(wrong_answer)
-        
-        return WrongAnswerResponse.from_orm(wrong_answer)
+        return self._upsert_wrong_answers(user_id, [wrong_answer_data])[0]
     
     def get_wrong_answers(self, user_id: int, filters: WrongAnswerFilter) -> List[WrongAnswerResponse]:
         """사용자의 오답 노트 조회
@@ -142,48 +121,56 @@ class WrongAnswerService:
         Returns:
             복습 기록
         """
-        # 오답 노트 항목 확인
-        wrong_answer = self.db.query(WrongAnswer).filter(
-            and_(
-                WrongAnswer.id == wrong_answer_id,
-                WrongAnswer.user_id == user_id
+        now = datetime.now()
+        streak = func.coalesce(WrongAnswer.consecutive_correct, 0) + 1
+        
+        # 오답 노트 항목 업데이트 (소유권 확인 + 연속 정답/마스터 판정을 한 번에)
+        # 연속 MASTERY_STREAK번 정답 시 마스터, 틀리면 연속 정답과 마스터 해제
+        if review_data.is_correct:
+            values = {
+                "consecutive_correct": streak,
+                "mastered": or_(WrongAnswer.mastered == True, streak >= MASTERY_STREAK),
+                "mastered_at": case(
+                    (streak >= MASTERY_STREAK, func.coalesce(WrongAnswer.mastered_at, now)),
+                    else_=WrongAnswer.mastered_at
+                ),
+            }
+        else:
+            values = {"consecutive_correct": 0, "mastered": False, "mastered_at": None}
+        
+        updated = self.db.execute(
+            update(WrongAnswer)
+            .where(and_(WrongAnswer.id == wrong_answer_id, WrongAnswer.user_id == user_id))
+            .values(
+                review_count=func.coalesce(WrongAnswer.review_count, 0) + 1,
+                last_reviewed_at=now,
+                **values
             )
+            .returning(WrongAnswer.question_id)
+            .execution_options(synchronize_session=False)
         ).first()
         
-        if not wrong_answer:
+        if updated is None:
+            self.db.rollback()
             raise ValueError("해당 오답 노트 항목을 찾을 수 없습니다.")
         
         # 복습 기록 생성
-        review = WrongAnswerReview(
-            wrong_answer_id=wrong_answer_id,
-            **review_data.dict()
-        )
-        
-        self.db.add(review)
-        
-        # 오답 노트 항목 업데이트
-        wrong_answer.review_count += 1
-        wrong_answer.last_reviewed_at = datetime.now()
-        
-        # 마스터 여부 판단 (연속 3번 정답 시 마스터)
-        if review_data.is_correct:
-            recent_reviews = self.db.query(WrongAnswerReview).filter(
-                WrongAnswerReview.wrong_answer_id == wrong_answer_id
-            ).order_by(desc(WrongAnswerReview.created_at)).limit(2).all()
-            
-            all_correct = all(r.is_correct for r in recent_reviews)
-            if all_correct and len(recent_reviews) >= 2:  # 이번 포함 3번 연속 정답
-                wrong_answer.mastered = True
-                wrong_answer.mastered_at = datetime.now()
-        else:
-            # 틀렸으면 마스터 해제
-            wrong_answer.mastered = False
-            wrong_answer.mastered_at = None
+        review = self.db.execute(
+            insert(WrongAnswerReview)
+            .values(wrong_answer_id=wrong_answer_id, created_at=now, **review_data.dict())
+            .returning(*WrongAnswerReview.__table__.columns)
+        ).mappings().one()
+        
+        self.answer_event_service.record_answers(user_id, "review", wrong_answer_id, [{
+            "question_id": updated.question_id,
+            "is_correct": review_data.is_correct,
+            "user_answer": review_data.user_answer,
+            "time_taken": review_data.time_taken
+        }], answered_at=now)
         
         self.db.commit()
-        self.db.refresh(review)
         
-        return WrongAnswerReviewResponse.from_orm(review)
+        return WrongAnswerReviewResponse(**review)
     
     def get_wrong_answer_stats(self, user_id: int) -> WrongAnswerStats:
         """오답 노트 통계 조회
@@ -343,19 +330,44 @@ class WrongAnswerService:
         Returns:
             생성된 오답 노트 항목 목록
         """
-        created_items = []
+        try:
+            return self._upsert_wrong_answers(user_id, wrong_answers)
+        except Exception as e:
+            self.db.rollback()
+            print(f"오답 노트 추가 실패: {e}")
+            return []
+    
+    def _upsert_wrong_answers(self, user_id: int, wrong_answers: List[WrongAnswerCreate]) -> List[WrongAnswerResponse]:
+        """오답 노트 항목을 INSERT ... ON CONFLICT DO UPDATE 한 번으로 저장
+        
+        (user_id, question_id, source_type)이 이미 있으면 사용자 답안과 수정 시각만
+        갱신합니다. 하나의 트랜잭션에서 처리하고 영향받은 행을 반환합니다.
+        """
+        if not wrong_answers:
+            return []
         
+        # 같은 배치 안의 중복은 마지막 항목만 남김 (PostgreSQL은 한 문장에서 같은 행을 두 번 갱신할 수 없음)
+        rows = {}
         for wrong_answer_data in wrong_answers:
-            try:
-                item = self.add_wrong_answer(user_id, wrong_answer_data)
-                created_items.append(item)
-            except Exception as e:
-                print(f"오답 노트 추가 실패: {e}")
-                continue
-        
-        return created_items
+            row = dict(wrong_answer_data.dict(), user_id=user_id)
+            rows[(row["question_id"], row["source_type"])] = row
+        
+        insert = dialect_insert(self.db)
+        stmt = insert(WrongAnswer.__table__).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "question_id", "source_type"],
+            set_={
+                "user_answer": stmt.excluded.user_answer,
+                "updated_at": datetime.now(),
+            }
+        ).returning(*WrongAnswer.__table__.columns)
+        
+        result = self.db.execute(stmt).mappings().all()
+        self.db.commit()
+        
+        return [WrongAnswerResponse(**row) for row in result]
     
     def __del__(self):
         """소멸자에서 데이터베이스 연결 해제"""
-        if hasattr(self, 'db'):
+        if getattr(self, '_owns_session', False):
             self.db.close()
@@ -25,6 +25,10 @@ def db_session():
     """Create a fresh database session for each test."""
     try:
         from models.database import Base
+        # Import every model so all tables and relationships are registered
+        from models import (  # noqa: F401
+            user, question, diagnostic, daily_test, voucher, wrong_answer, learning_streak, analytics, answer_event
+        )
         Base.metadata.create_all(bind=engine)
         session = TestingSessionLocal()
         yield session
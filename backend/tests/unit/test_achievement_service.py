@@ -0,0 +1,69 @@
+"""
+Unit tests for achievement service.
+"""
+from models.learning_streak import Achievement, LearningStreak
+from services.achievement_service import AchievementService, RULES_VERSION, next_threshold
+
+
+def test_next_threshold():
+    """Test the cached threshold lookup over the rule registry."""
+    assert next_threshold("current_streak", 0) == 3
+    assert next_threshold("current_streak", 7) == 14
+    assert next_threshold("current_streak", 100) is None
+
+
+def test_check_awards_once_and_caches_threshold(db_session):
+    """Test that reached rules are awarded idempotently and the next threshold is cached."""
+    streak = LearningStreak(user_id=1, current_streak=8, longest_streak=8, total_study_days=8)
+    db_session.add(streak)
+    db_session.flush()
+
+    service = AchievementService(db_session)
+    assert sorted(service.check(streak, {"current_streak": 8, "total_study_days": 8})) == ["streak_3", "streak_7"]
+    db_session.commit()
+    assert streak.next_achievement_thresholds == {
+        "version": RULES_VERSION, "current_streak": 14, "total_study_days": 50
+    }
+
+    # 기준값 미만이면 규칙을 평가하지 않음
+    assert service.check(streak, {"current_streak": 9, "total_study_days": 9}) == []
+
+    # 캐시가 없어도 이미 받은 성취는 중복으로 추가되지 않음
+    streak.next_achievement_thresholds = None
+    assert service.check(streak, {"current_streak": 8, "total_study_days": 8}) == []
+    db_session.commit()
+    assert db_session.query(Achievement).filter(Achievement.user_id == 1).count() == 2
+
+
+def test_backfill_awards_qualifying_users_idempotently(db_session):
+    """Test that backfill awards rules to qualifying users across chunks exactly once."""
+    db_session.add_all([
+        LearningStreak(user_id=user_id, current_streak=0, longest_streak=longest, total_study_days=total)
+        for user_id, longest, total in [(1, 2, 2), (2, 7, 60), (3, 30, 120)]
+    ])
+    db_session.commit()
+
+    service = AchievementService(db_session)
+    result = service.backfill(chunk_size=2)
+    assert result["users"] == 3
+    assert result["awarded"] == 2 + 7
+
+    keys = {a.achievement_key for a in db_session.query(Achievement).filter(Achievement.user_id == 2)}
+    assert keys == {"streak_3", "streak_7", "total_50"}
+    assert service.backfill()["awarded"] == 0
+
+
+def test_backfill_ignores_activity_of_users_without_streak_row(db_session):
+    """Test that activity totals of a user with no learning_streaks row do not shift onto another user."""
+    from datetime import date
+
+    from models.learning_streak import DailyActivity
+    from services.achievement_service import AchievementRule
+
+    db_session.add_all([LearningStreak(user_id=user_id, current_streak=0) for user_id in (1, 3)])
+    db_session.add(DailyActivity(user_id=2, learning_streak_id=0, activity_date=date(2024, 1, 1), questions_solved=100))
+    db_session.commit()
+
+    rule = AchievementRule("solved_100", "questions", "questions_solved", 100, "백 문제", "100문제를 풀었습니다!", "✏️", "#000000")
+    result = AchievementService(db_session).backfill(rules=[rule])
+    assert result["awarded"] == 0
@@ -0,0 +1,52 @@
+"""
+Unit tests for activity bitmap.
+"""
+from datetime import date, timedelta
+
+from models.learning_streak import DailyActivityRecord
+from services.activity_bitmap import ActivityBitmap
+from services.learning_streak_service import LearningStreakService
+
+
+def test_streaks_and_window_counts():
+    """Test streak, longest run and window counts from bit operations."""
+    today = date(2024, 3, 10)
+    days = [today - timedelta(days=n) for n in (1, 2, 3, 7, 8, 9, 10, 11)]
+    bitmap = ActivityBitmap.from_dates(days)
+
+    assert bitmap.current_streak(today) == 3
+    assert bitmap.current_streak(today + timedelta(days=1)) == 0
+    assert bitmap.longest_streak() == 5
+    assert bitmap.total() == 8
+    assert bitmap.count(today - timedelta(days=6), today) == 3
+    assert bitmap.last_active() == today - timedelta(days=1)
+
+
+def test_set_before_start_and_round_trip():
+    """Test that earlier dates rebase the bitmap and bytes round-trip."""
+    bitmap = ActivityBitmap.from_dates([date(2024, 1, 10)])
+    assert bitmap.set(date(2024, 1, 5)) is True
+    assert bitmap.set(date(2024, 1, 5)) is False
+
+    restored = ActivityBitmap.from_bytes(bitmap.start, bitmap.to_bytes())
+    assert restored.start == date(2024, 1, 5)
+    assert restored.days(date(2024, 1, 4), date(2024, 1, 6)) == [False, True, False]
+    assert restored.is_active(date(2024, 1, 10))
+
+
+def test_update_streak_and_calendar(db_session):
+    """Test that recorded activity days drive the stored streak and calendar."""
+    service = LearningStreakService(db_session)
+    today = date.today()
+    service.record_activities_batch(1, [
+        DailyActivityRecord(activity_date=today - timedelta(days=offset)) for offset in (2, 1, 0)
+    ])
+
+    streak = service.get_learning_streak(1)
+    assert streak.current_streak == 3
+    assert streak.total_study_days == 3
+    assert streak.is_active_today
+
+    calendar = service.get_activity_calendar(1, days=7)
+    assert calendar["active_days"] == 3
+    assert [day["active"] for day in calendar["days"]] == [False] * 4 + [True] * 3
@@ -0,0 +1,33 @@
+"""
+Unit tests for answer event service.
+"""
+from models.answer_event import AnswerEvent
+from models.question import QuestionBank
+from services.answer_event_service import AnswerEventService
+
+
+def _add_question(db, unit):
+    question = QuestionBank(subject="추리논증", unit=unit, difficulty=3, points=3,
+                            question_type="객관식", content="테스트 문제입니다.", correct_answer="①")
+    db.add(question)
+    db.flush()
+    return question.id
+
+
+def test_record_answers(db_session):
+    """Test that one submission's answers are stored as answer events."""
+    logic = _add_question(db_session, "논리학")
+    economics = _add_question(db_session, "경제학")
+
+    service = AnswerEventService(db_session)
+    service.record_answers(1, "daily_test", 10, [
+        {"question_id": logic, "is_correct": True, "user_answer": "①"},
+        {"question_id": logic, "is_correct": False, "user_answer": "②"},
+        {"question_id": economics, "is_correct": True, "user_answer": "①"},
+    ])
+    db_session.commit()
+
+    assert db_session.query(AnswerEvent).filter(AnswerEvent.source_id == 10).count() == 3
+    events = db_session.query(AnswerEvent).filter(AnswerEvent.question_id == logic).order_by(AnswerEvent.id).all()
+    assert [(event.is_correct, event.user_answer) for event in events] == [(True, "①"), (False, "②")]
+    assert {event.source_type for event in events} == {"daily_test"}
@@ -44,4 +44,85 @@ def test_auth_service_methods_exist():
         assert callable(auth_service.get_user_by_email)
         
     except Exception as e:
-        assert False, f"AuthService method check failed: {e}"
\ No newline at end of file
+        assert False, f"AuthService method check failed: {e}"
+
+def test_get_current_user_cached_until_invalidated(db_session):
+    """Test that authenticated user lookups are cached and invalidated on profile updates."""
+    from models.user import User
+    from services.auth_service import AuthService
+
+    user = User(email="cache@example.com", password_hash="x", name="캐시", grade="3등급",
+                target_grade="1등급", study_time=60, learning_style="mixed")
+    db_session.add(user)
+    db_session.commit()
+
+    auth_service = AuthService(db_session)
+    first = auth_service.get_current_user(str(user.id))
+    assert first.name == "캐시"
+
+    # 캐시가 살아 있는 동안에는 다시 조회하지 않음
+    db_session.query(User).filter(User.id == user.id).update({"name": "변경"})
+    db_session.commit()
+    assert auth_service.get_current_user(user.id) is first
+
+    # 프로필 수정은 캐시를 지움
+    auth_service.update_user_profile(user.id, grade="2등급")
+    refreshed = auth_service.get_current_user(user.id)
+    assert refreshed.name == "변경"
+    assert refreshed.grade == "2등급"
+    assert auth_service.get_current_user(user.id + 1) is None
+
+
+def test_refresh_token_rotation_and_reuse(db_session):
+    """Test that refresh tokens rotate and a reused token revokes its whole family."""
+    import pytest
+    from models.user import RefreshToken, User
+    from services.auth_service import AuthService
+
+    user = User(email="refresh@example.com", password_hash="x", name="리프레시", grade="3등급",
+                target_grade="1등급", study_time=60, learning_style="mixed")
+    db_session.add(user)
+    db_session.commit()
+
+    auth_service = AuthService(db_session)
+    first = auth_service._issue_tokens(user.id)
+    assert int(auth_service.verify_token(first["access_token"])) == user.id
+
+    second = auth_service.refresh_access_token(first["refresh_token"])
+    assert second["refresh_token"] != first["refresh_token"]
+    assert int(auth_service.verify_token(second["access_token"])) == user.id
+    # 토큰 원문은 저장하지 않음
+    assert db_session.query(RefreshToken).filter(RefreshToken.token_hash == second["refresh_token"]).count() == 0
+
+    # 이미 회전된 토큰을 다시 쓰면 거절하고 같은 묶음의 최신 토큰까지 폐기
+    with pytest.raises(Exception):
+        auth_service.refresh_access_token(first["refresh_token"])
+    with pytest.raises(Exception):
+        auth_service.refresh_access_token(second["refresh_token"])
+
+    # 로그아웃한 토큰은 쓸 수 없음
+    third = auth_service._issue_tokens(user.id)
+    auth_service.revoke_refresh_token(third["refresh_token"])
+    with pytest.raises(Exception):
+        auth_service.refresh_access_token(third["refresh_token"])
+
+
+def test_refresh_rejected_after_user_is_deleted(db_session):
+    """Test that a deleted user's refresh token no longer issues new tokens."""
+    import pytest
+    from models.user import RefreshToken, User
+    from services.auth_service import AuthService
+
+    user = User(email="deleted@example.com", password_hash="x", name="탈퇴", grade="3등급",
+                target_grade="1등급", study_time=60, learning_style="mixed")
+    db_session.add(user)
+    db_session.commit()
+
+    auth_service = AuthService(db_session)
+    tokens = auth_service._issue_tokens(user.id)
+    db_session.delete(user)
+    db_session.commit()
+
+    with pytest.raises(Exception):
+        auth_service.refresh_access_token(tokens["refresh_token"])
+    assert db_session.query(RefreshToken).filter(RefreshToken.revoked_at.is_(None)).count() == 0
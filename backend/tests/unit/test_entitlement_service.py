@@ -0,0 +1,53 @@
+"""Unit tests for EntitlementService."""
+
+from datetime import datetime, timedelta
+
+from models.voucher import UserVoucher, Voucher
+from services import entitlement_service as entitlement_module
+from services.entitlement_service import FREE, EntitlementService, invalidate_entitlement
+
+
+def _subscribe(db_session, user_id, plan, expires_at):
+    voucher = Voucher(name=plan, type=plan, price=9900, period="month", features=["pdf 다운로드"])
+    db_session.add(voucher)
+    db_session.flush()
+    db_session.add(UserVoucher(user_id=user_id, voucher_id=voucher.id, is_active=True, expires_at=expires_at))
+    db_session.commit()
+
+
+def test_entitlement_cached_and_bounded_by_expiry(db_session):
+    """권한은 캐시에서 읽고, 캐시 유지 시간은 만료 시각을 넘지 않는다"""
+    entitlement_module._entitlements.clear()
+    _subscribe(db_session, 1, "pro", datetime.now() + timedelta(days=3))
+    _subscribe(db_session, 2, "basic", datetime.now() + timedelta(seconds=5))
+
+    service = EntitlementService(db_session)
+    pro = service.get_entitlement(1)
+    assert pro.has_plan("basic", "pro") and pro.has_feature("pdf 다운로드")
+    assert service.get_entitlement(3) is FREE
+
+    # 캐시된 동안에는 해지가 반영되지 않다가 무효화하면 반영
+    db_session.query(UserVoucher).filter(UserVoucher.user_id == 1).update({"is_active": False})
+    db_session.commit()
+    assert service.get_entitlement(1).plan == "pro"
+    invalidate_entitlement(1)
+    assert service.get_entitlement(1) is FREE
+
+    service.get_entitlement(2)
+    cached_until = entitlement_module._entitlements[2][0]
+    assert cached_until - entitlement_module.time.monotonic() <= 5
+    entitlement_module._entitlements.clear()
+
+
+def test_expire_vouchers(db_session):
+    """만료된 활성 이용권만 비활성화한다"""
+    now = datetime.now()
+    _subscribe(db_session, 1, "pro", now - timedelta(minutes=1))
+    _subscribe(db_session, 2, "basic", now + timedelta(days=1))
+    _subscribe(db_session, 3, "light", None)
+
+    service = EntitlementService(db_session)
+    assert service.expire_vouchers(now) == 1
+    assert service.expire_vouchers(now) == 0
+    active = {row.user_id for row in db_session.query(UserVoucher).filter(UserVoucher.is_active == True)}
+    assert active == {2, 3}
@@ -0,0 +1,113 @@
+"""
+Unit tests for Parquet export service.
+"""
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from models.daily_test import DailyTestResult
+from models.diagnostic import DiagnosticResult
+from services.export_service import STATE_FILE, ParquetExportService
+
+
+def _daily_result(user_id, completed_at, wrong_units=()):
+    return DailyTestResult(
+        user_id=user_id, total_score=10, total_points=20, correct_count=len(wrong_units), total_questions=5,
+        accuracy=50.0, completed_at=completed_at,
+        wrong_questions=[
+            {"id": i, "unit": unit, "points": 3, "user_answer": "1", "correct_answer": "2"}
+            for i, unit in enumerate(wrong_units)
+        ]
+    )
+
+
+def _read(output_dir, dataset):
+    return pd.read_parquet(os.path.join(output_dir, dataset))
+
+
+def test_incremental_export_picks_up_rows_sharing_last_timestamp(db_session, tmp_path):
+    """Test that a second run exports only new rows, including one committed with the previous high-water time."""
+    output = str(tmp_path)
+    january, february = datetime(2024, 1, 15, 9, 0), datetime(2024, 2, 1, 9, 0)
+    db_session.add_all([_daily_result(1, january, ["민법"]), _daily_result(2, february, ["형법", "헌법"])])
+    db_session.commit()
+
+    counts = ParquetExportService(output, db_session).export_all(["daily_test_results"])
+    assert counts == {"daily_test_results": 2, "daily_test_wrong_questions": 3}
+    assert sorted(os.listdir(os.path.join(output, "daily_test_results"))) == ["month=2024-01", "month=2024-02"]
+    with open(os.path.join(output, STATE_FILE), encoding="utf-8") as f:
+        assert datetime.fromisoformat(json.load(f)["daily_test_results"]["changed_at"]) == february
+
+    # 지난 실행의 마지막 시각과 같은 시각에 늦게 커밋된 행
+    late = _daily_result(3, february, ["상법"])
+    db_session.add(late)
+    db_session.commit()
+
+    counts = ParquetExportService(output, db_session).export_all(["daily_test_results"])
+    assert counts == {"daily_test_results": 1, "daily_test_wrong_questions": 1}
+    assert ParquetExportService(output, db_session).export_all(["daily_test_results"])["daily_test_results"] == 0
+
+    results = _read(output, "daily_test_results")
+    assert sorted(results["user_id"]) == [1, 2, 3]
+    assert "wrong_questions" not in results.columns
+
+
+def test_full_export_ignores_high_water(db_session, tmp_path):
+    """Test that full=True exports every row again and replaces the previous files."""
+    output = str(tmp_path)
+    db_session.add_all([_daily_result(user_id, datetime(2024, 3, user_id)) for user_id in (1, 2)])
+    db_session.commit()
+
+    service = ParquetExportService(output, db_session)
+    assert service.export_table("daily_test_results")["daily_test_results"] == 2
+    assert service.export_table("daily_test_results")["daily_test_results"] == 0
+    assert ParquetExportService(output, db_session).export_table("daily_test_results", full=True)[
+        "daily_test_results"] == 2
+    assert sorted(_read(output, "daily_test_results")["user_id"]) == [1, 2]
+
+
+def test_incremental_export_picks_up_whole_second_server_defaults(db_session, tmp_path):
+    """Test that a row written later in the same second as the high-water mark is exported."""
+    from sqlalchemy import text
+
+    output = str(tmp_path)
+    insert = text(
+        "INSERT INTO wrong_answers (user_id, question_id, question_content, user_answer, correct_answer,"
+        " consecutive_correct, created_at) VALUES (1, :question_id, '문제', '1', '2', 0, '2024-05-01 10:00:00')"
+    )
+    db_session.execute(insert, {"question_id": 1})
+    db_session.commit()
+    assert ParquetExportService(output, db_session).export_table("wrong_answers")["wrong_answers"] == 1
+
+    db_session.execute(insert, {"question_id": 2})
+    db_session.commit()
+    assert ParquetExportService(output, db_session).export_table("wrong_answers")["wrong_answers"] == 1
+    assert ParquetExportService(output, db_session).export_table("wrong_answers")["wrong_answers"] == 0
+    assert sorted(_read(output, "wrong_answers")["question_id"]) == [1, 2]
+
+
+def test_json_columns_are_flattened_into_child_datasets(db_session, tmp_path):
+    """Test that wrong_questions and unit_scores become rows of their own datasets."""
+    output = str(tmp_path)
+    db_session.add(DiagnosticResult(
+        user_id=7, total_score=30, total_points=40, accuracy=75.0, estimated_grade="2등급",
+        unit_scores={"민법": {"correct": 9, "total": 12}, "형법": {"correct": 6, "total": 8}},
+        wrong_questions=[{"id": 11, "unit": "민법", "points": 3, "user_answer": "1", "correct_answer": "4"}],
+        completed_at=datetime(2024, 4, 2, 10, 0)
+    ))
+    db_session.commit()
+
+    counts = ParquetExportService(output, db_session).export_table("diagnostic_results")
+    assert counts == {"diagnostic_results": 1, "diagnostic_wrong_questions": 1, "diagnostic_unit_scores": 2}
+
+    unit_scores = _read(output, "diagnostic_unit_scores").sort_values("unit")
+    assert list(unit_scores["unit"]) == ["민법", "형법"]
+    assert list(unit_scores["correct"]) == [9, 6]
+    assert set(unit_scores["user_id"]) == {7}
+
+    wrong = _read(output, "diagnostic_wrong_questions")
+    assert list(wrong["question_id"]) == [11]
+    assert list(wrong["correct_answer"]) == ["4"]
+    assert {"unit_scores", "wrong_questions"}.isdisjoint(_read(output, "diagnostic_results").columns)
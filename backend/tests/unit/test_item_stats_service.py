@@ -0,0 +1,92 @@
+"""
+Unit tests for item stats service.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from models.analytics import ItemStats
+from models.question import QuestionBank
+from services.answer_event_service import AnswerEventService
+from services.item_stats_service import ItemStatsService, item_metrics
+
+
+def _add_question(db):
+    question = QuestionBank(subject="추리논증", unit="논리학", difficulty=3, points=3,
+                            question_type="객관식", content="테스트 문제입니다.", correct_answer="①")
+    db.add(question)
+    db.flush()
+    return question.id
+
+
+def test_item_metrics_matches_numpy_correlation():
+    """Test that point-biserial from sufficient statistics equals Pearson correlation."""
+    is_correct = np.array([1, 1, 0, 1, 0, 0], dtype=float)
+    score = np.array([0.9, 0.7, 0.4, 0.8, 0.5, 0.2])
+
+    p, r = item_metrics(np.array([6.0]), np.array([is_correct.sum()]), np.array([score.sum()]),
+                        np.array([(score ** 2).sum()]), np.array([(score * is_correct).sum()]))
+
+    assert p[0] == 0.5
+    assert np.isclose(r[0], np.corrcoef(is_correct, score)[0, 1])
+
+
+def test_update_is_incremental(db_session):
+    """Test that a second run folds in only new submissions."""
+    first = _add_question(db_session)
+    second = _add_question(db_session)
+    events = AnswerEventService(db_session)
+    answered_at = datetime.now() - timedelta(hours=1)
+    events.record_answers(1, "daily_test", 1, [
+        {"question_id": first, "is_correct": True, "user_answer": "①"},
+        {"question_id": second, "is_correct": True, "user_answer": "①"},
+    ], answered_at=answered_at)
+    events.record_answers(2, "daily_test", 2, [
+        {"question_id": first, "is_correct": False, "user_answer": "③"},
+        {"question_id": second, "is_correct": False, "user_answer": "②"},
+    ], answered_at=answered_at)
+    events.record_answers(2, "review", 5, [
+        {"question_id": first, "is_correct": True, "user_answer": "①"},
+    ], answered_at=answered_at)
+    db_session.commit()
+
+    service = ItemStatsService(db_session)
+    assert service.update(chunk_size=3)["events"] == 4
+
+    stats = db_session.query(ItemStats).filter(ItemStats.question_id == first).one()
+    assert (stats.attempts, stats.correct, stats.p_value) == (2, 1, 0.5)
+    assert stats.discrimination == 1.0
+    assert stats.option_counts == {"①": 1, "③": 1}
+
+    events.record_answers(3, "daily_test", 3, [
+        {"question_id": first, "is_correct": False, "user_answer": "③"},
+    ], answered_at=answered_at)
+    db_session.commit()
+    assert service.update()["events"] == 1
+
+    db_session.refresh(stats)
+    assert stats.attempts == 3
+    assert stats.option_counts == {"①": 1, "③": 2}
+    assert service.update()["events"] == 0
+
+
+def test_flagged_only_includes_possible_miskeys(db_session):
+    """Test that items flagged only as possible miskeys appear in the flagged view."""
+    miskeyed, healthy, few_answers = (_add_question(db_session) for _ in range(3))
+    db_session.add_all([
+        # 정답률/변별도는 정상이지만 오답지 ③을 정답보다 많이 고름
+        ItemStats(question_id=miskeyed, attempts=40, correct=16, p_value=0.4, discrimination=0.3,
+                  option_counts={"①": 16, "③": 20, "②": 4}),
+        ItemStats(question_id=healthy, attempts=40, correct=24, p_value=0.6, discrimination=0.4,
+                  option_counts={"①": 24, "③": 16}),
+        ItemStats(question_id=few_answers, attempts=5, correct=1, p_value=0.2, discrimination=0.3,
+                  option_counts={"①": 1, "③": 4}),
+    ])
+    db_session.commit()
+
+    service = ItemStatsService(db_session)
+    flagged = service.get_item_stats(flagged_only=True)
+    assert [item["question_id"] for item in flagged] == [miskeyed]
+    assert flagged[0]["flags"] == ["possible_miskey"]
+    assert service.get_item_stats(flagged_only=True, offset=1) == []
+    assert len(service.get_item_stats()) == 3
@@ -0,0 +1,230 @@
+"""
+Unit tests for learning streak service.
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from models.learning_streak import Achievement, DailyActivity, DailyActivityCreate, DailyActivityRecord
+from services.learning_streak_service import LearningStreakService
+
+
+def test_learning_stats_uses_three_queries(db_session):
+    """Test that the stats bundle derives weekly and monthly summaries from one activity fetch."""
+    service = LearningStreakService(db_session)
+    today = date.today()
+    service.record_activities_batch(1, [
+        DailyActivityRecord(activity_date=today - timedelta(days=offset),
+                            study_time_minutes=30, questions_solved=10, correct_answers=offset % 10)
+        for offset in (20, 3, 0)
+    ])
+    db_session.add_all([
+        Achievement(user_id=1, achievement_type="streak", achievement_key=f"key_{i}", title=str(i))
+        for i in range(7)
+    ])
+    db_session.commit()
+    db_session.expire_all()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        stats = service.get_learning_stats(1)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert len(statements) == 3
+    assert len(stats.recent_activities) == 2
+    assert len(stats.recent_achievements) == 5
+    assert stats.weekly_summary["study_days"] == 2
+    assert stats.weekly_summary["total_questions"] == 20
+    assert stats.monthly_summary["total_study_time"] == 90
+    assert stats.monthly_summary["accuracy_rate"] == 10.0
+
+
+def test_streak_reads_are_read_only_and_reconcile_persists_reset(db_session):
+    """Test that GET paths never write and the reconcile step stores lapsed streaks."""
+    from models.learning_streak import LearningStreak
+
+    service = LearningStreakService(db_session)
+    assert service.get_learning_streak(1).current_streak == 0
+    assert db_session.query(LearningStreak).count() == 0
+
+    db_session.add(LearningStreak(user_id=1, current_streak=5, longest_streak=5, total_study_days=5,
+                                  last_activity_date=date.today() - timedelta(days=3)))
+    db_session.commit()
+
+    assert service.get_learning_streak(1).current_streak == 0
+    assert not db_session.dirty
+    assert db_session.query(LearningStreak.current_streak).scalar() == 5
+
+    assert service.expire_stale_streaks()["reset"] == 1
+    assert db_session.query(LearningStreak.current_streak).scalar() == 0
+
+
+def test_expire_stale_streaks_in_batches(db_session):
+    """Test that lapsed streaks are reset across id batches and active ones are kept."""
+    from models.learning_streak import LearningStreak
+
+    today = date.today()
+    db_session.add_all([
+        LearningStreak(user_id=user_id, current_streak=4, longest_streak=4, total_study_days=4,
+                       last_activity_date=today - timedelta(days=user_id % 3))
+        for user_id in range(1, 8)
+    ])
+    db_session.commit()
+
+    result = LearningStreakService(db_session).expire_stale_streaks(today=today, batch_size=3)
+    assert result == {"reset": 2, "batches": 3, "active": 5}
+
+
+def test_record_activities_batch_merges_days_in_one_transaction(db_session):
+    """Test that offline records are merged per day, upserted and counted once in the streak."""
+    import pytest
+
+
+    service = LearningStreakService(db_session)
+    today = date.today()
+    records = [
+        DailyActivityRecord(activity_date=today - timedelta(days=2), questions_solved=10, correct_answers=7),
+        DailyActivityRecord(activity_date=today - timedelta(days=1), study_time_minutes=20),
+        DailyActivityRecord(activity_date=today - timedelta(days=2), questions_solved=5, correct_answers=5),
+        DailyActivityRecord(activity_date=today, daily_tests_completed=1, average_score=80),
+    ]
+    result = service.record_activities_batch(1, records)
+
+    assert len(result["activities"]) == 3
+    assert result["streak"].current_streak == 3
+    assert result["new_achievements"] == ["streak_3"]
+
+    # 다시 동기화하면 같은 날짜에 더해짐
+    service.record_activities_batch(1, [
+        DailyActivityRecord(activity_date=today - timedelta(days=2), questions_solved=1, diagnostic_completed=True)
+    ])
+    activity = db_session.query(DailyActivity).filter(
+        DailyActivity.activity_date == today - timedelta(days=2)
+    ).one()
+    assert (activity.questions_solved, activity.correct_answers, activity.diagnostic_completed) == (16, 12, True)
+    assert db_session.query(DailyActivity).count() == 3
+
+    with pytest.raises(ValueError):
+        service.record_activities_batch(1, [DailyActivityRecord(activity_date=today + timedelta(days=1))])
+
+
+def test_record_daily_activity_adds_to_todays_row(db_session):
+    """Test that repeated records for today accumulate in one row with the streak updated."""
+    service = LearningStreakService(db_session)
+    service.record_daily_activity(1, DailyActivityCreate(questions_solved=10, correct_answers=6))
+    response = service.record_daily_activity(1, DailyActivityCreate(questions_solved=5, wrong_answers_reviewed=2))
+
+    assert (response.questions_solved, response.correct_answers, response.wrong_answers_reviewed) == (15, 6, 2)
+    assert db_session.query(DailyActivity).count() == 1
+    assert service.get_learning_streak(1).is_active_today
+
+
+def test_record_activities_batch_idempotency_and_size(db_session):
+    """Test that a replayed idempotency key is applied once and long backlogs are upserted in chunks."""
+    import pytest
+    from pydantic import ValidationError
+
+    from models.learning_streak import MAX_BATCH_ACTIVITIES, DailyActivityBatch
+
+    service = LearningStreakService(db_session)
+    today = date.today()
+    records = [DailyActivityRecord(activity_date=today - timedelta(days=i), questions_solved=2) for i in range(120)]
+
+    first = service.record_activities_batch(1, records, idempotency_key="sync-1")
+    replay = service.record_activities_batch(1, records, idempotency_key="sync-1")
+    assert len(first["activities"]) == 120 and not first["replayed"]
+    assert replay["replayed"] and len(replay["activities"]) == 120
+    assert replay["streak"].current_streak == 120
+    assert {row.questions_solved for row in db_session.query(DailyActivity)} == {2}
+
+    service.record_activities_batch(1, records[:1], idempotency_key="sync-2")
+    assert db_session.query(DailyActivity).filter(DailyActivity.activity_date == today).one().questions_solved == 4
+
+    with pytest.raises(ValidationError):
+        DailyActivityBatch(activities=[records[0]] * (MAX_BATCH_ACTIVITIES + 1))
+    with pytest.raises(ValidationError):
+        DailyActivityBatch(activities=[])
+
+
+def test_daily_test_submit_counts_toward_dashboard_streak(db_session):
+    """Test that submitting a daily test marks the activity bitmap the dashboard streak reads."""
+    from models.learning_streak import LearningStreak
+    from models.question import QuestionBank
+    from services.analytics_service import AnalyticsService
+    from services.recommendation_service import RecommendationService
+
+    question = QuestionBank(subject="추리논증", unit="논리학", difficulty=3, points=3, question_type="객관식",
+                            content="문제", correct_answer="①")
+    db_session.add(question)
+    db_session.commit()
+
+    service = RecommendationService(db_session)
+    service.question_service.db = db_session
+    service.process_daily_test_result(1, {str(question.id): "①"})
+
+    stats = AnalyticsService(db_session)._calculate_basic_stats(1)
+    assert (stats["current_streak"], stats["best_streak"]) == (1, 1)
+    assert db_session.query(LearningStreak).one().last_activity_date == date.today()
+
+
+def test_m0005_backfills_bitmap_from_results(db_session):
+    """Test that the bitmap backfill includes test/diagnostic days and creates missing streak rows."""
+    from datetime import datetime
+
+    from migrations import m0005_learning_streak_bitmap
+    from models.daily_test import DailyTestResult
+    from models.diagnostic import DiagnosticResult
+    from models.learning_streak import LearningStreak
+
+    today = date.today()
+    at_noon = lambda day: datetime.combine(day, datetime.min.time()) + timedelta(hours=12)
+    db_session.add_all([
+        DailyTestResult(user_id=1, completed_at=at_noon(today - timedelta(days=1))),
+        DailyTestResult(user_id=1, completed_at=at_noon(today)),
+        DiagnosticResult(user_id=1, completed_at=at_noon(today - timedelta(days=2))),
+    ])
+    db_session.commit()
+
+    m0005_learning_streak_bitmap.upgrade(db_session.connection())
+    db_session.commit()
+
+    streak = db_session.query(LearningStreak).one()
+    assert (streak.total_study_days, streak.current_streak, streak.longest_streak) == (3, 3, 3)
+    assert LearningStreakService(db_session).get_learning_streak(1).current_streak == 3
+
+
+def test_m0010_merges_duplicate_streak_rows(db_session):
+    """Test that duplicate streak rows are merged into the oldest one before the unique index is created."""
+    from sqlalchemy import text
+
+    from migrations import m0010_learning_streak_unique_user
+    from models.learning_streak import LearningStreak
+    from services.activity_bitmap import ActivityBitmap
+
+    today = date.today()
+    db_session.execute(text("DROP INDEX uq_learning_streaks_user"))
+    older = ActivityBitmap.from_dates([today - timedelta(days=3), today - timedelta(days=2)])
+    newer = ActivityBitmap.from_dates([today - timedelta(days=1), today])
+    db_session.add_all([
+        LearningStreak(user_id=1, longest_streak=2, activity_start=older.start, activity_bitmap=older.to_bytes()),
+        LearningStreak(user_id=1, longest_streak=2, activity_start=newer.start, activity_bitmap=newer.to_bytes()),
+    ])
+    db_session.flush()
+    db_session.add(DailyActivity(user_id=1, learning_streak_id=2, activity_date=today))
+    db_session.commit()
+
+    m0010_learning_streak_unique_user.upgrade(db_session.connection())
+    db_session.commit()
+    db_session.expire_all()
+
+    streak = db_session.query(LearningStreak).one()
+    assert (streak.id, streak.total_study_days, streak.current_streak, streak.longest_streak) == (1, 4, 4, 4)
+    assert db_session.query(DailyActivity.learning_streak_id).scalar() == 1
+
+    # 유니크 인덱스가 생겼으므로 get_or_create_streak은 기존 행을 돌려줌
+    assert LearningStreakService(db_session).get_or_create_streak(1).id == 1
+    assert LearningStreakService(db_session).get_or_create_streak(2).id != 1
+    assert db_session.query(LearningStreak).count() == 2
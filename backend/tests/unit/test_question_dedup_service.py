@@ -0,0 +1,71 @@
+"""Unit tests for QuestionDedupService and duplicate handling on import."""
+
+import json
+
+from models.question import QuestionBank, QuestionDuplicate, QuestionSignature
+from services.question_dedup_service import QuestionDedupService, minhash_signature, similarity
+from services.question_import_service import QuestionImportService
+
+PASSAGE = (
+    "갑은 을에게 자신의 토지를 매도하는 계약을 체결하고 계약금을 받았으나, 중도금 지급 전에 "
+    "병에게 같은 토지를 더 높은 가격에 매도하고 소유권이전등기를 마쳐 주었다. 이 경우 을이 갑에게 "
+    "행사할 수 있는 권리에 관한 설명으로 옳은 것은?"
+)
+OPTIONS = ["계약을 해제하고 손해배상을 청구할 수 있다", "병에게 등기말소를 청구할 수 있다", "계약금의 배액을 청구할 수 있다"]
+OTHER = (
+    "헌법재판소가 법률의 위헌 여부를 심판할 때 적용하는 과잉금지원칙의 내용으로 목적의 정당성, "
+    "수단의 적합성, 침해의 최소성, 법익의 균형성을 심사한다. 다음 중 침해의 최소성에 관한 설명으로 옳지 않은 것은?"
+)
+
+
+def _question(content, options=OPTIONS):
+    return {
+        "subject": "민법", "unit": "채권각론", "difficulty": 3, "points": 3,
+        "question_type": "객관식", "content": content, "options": options, "correct_answer": "1"
+    }
+
+
+def test_signature_similarity_ignores_formatting():
+    """띄어쓰기, 문장부호, 전각 문자 차이는 같은 문제로 본다"""
+    original = minhash_signature(PASSAGE, OPTIONS)
+    reformatted = minhash_signature(PASSAGE.replace(" ", "  ").replace(",", "，").replace("?", ""), OPTIONS)
+    edited = minhash_signature(PASSAGE.replace("더 높은 가격에", "높은 값에"), OPTIONS)
+
+    assert similarity(original, reformatted) == 1.0
+    assert similarity(original, edited) >= 0.8
+    assert similarity(original, minhash_signature(OTHER, OPTIONS)) < 0.5
+
+
+def test_import_skips_and_flags_near_duplicates(db_session, tmp_path):
+    """기존 문제와 같은 파일의 앞선 문제 모두에 대해 유사 중복을 찾는다"""
+    db_session.add(QuestionBank(**_question(PASSAGE)))
+    db_session.commit()
+
+    path = tmp_path / "questions.jsonl"
+    path.write_text("\n".join(json.dumps(q, ensure_ascii=False) for q in [
+        _question(PASSAGE.replace(" ", "")),        # 기존 문제와 중복
+        _question(OTHER),
+        _question(OTHER + " "),                      # 같은 파일의 앞선 문제와 중복
+    ]), encoding="utf-8")
+
+    result = QuestionImportService(db_session).import_file(str(path))
+    assert result["inserted"] == 1 and result["duplicates"] == 2
+    assert db_session.query(QuestionBank).count() == 2
+    assert db_session.query(QuestionSignature).count() == 2
+
+    flagged = QuestionImportService(db_session, duplicates="flag").import_file(str(path), restart=True)
+    assert flagged["inserted"] == 3 and flagged["duplicates"] == 3
+    pairs = {(row.question_id, row.duplicate_of) for row in db_session.query(QuestionDuplicate)}
+    assert pairs == {(3, 1), (4, 2), (5, 2)}
+
+
+def test_index_missing_is_incremental(db_session):
+    """서명이 없는 문제만 색인하고 중복을 기록한다"""
+    for content in (PASSAGE, OTHER, PASSAGE + "!"):
+        db_session.add(QuestionBank(**_question(content)))
+    db_session.commit()
+
+    service = QuestionDedupService(db_session)
+    assert service.index_missing(chunk_size=2) == {"indexed": 3, "duplicates": 1}
+    assert service.index_missing() == {"indexed": 0, "duplicates": 0}
+    assert service.get_duplicates() == [{"question_id": 3, "duplicate_of": 1, "similarity": 1.0}]
@@ -0,0 +1,61 @@
+"""Unit tests for QuestionImportService."""
+
+import json
+
+from models.question import QuestionBank
+from services.question_import_service import QuestionImportService
+
+
+def _question(i, **overrides):
+    question = {
+        "subject": "추리논증", "unit": "논리학", "difficulty": 3, "points": 3,
+        "question_type": "객관식", "content": f"문제 {i}", "options": ["1", "2", "3", "4", "5"],
+        "correct_answer": "2"
+    }
+    question.update(overrides)
+    return question
+
+
+def test_import_jsonl_batches_and_resume(db_session, tmp_path):
+    """검증 실패 행은 건너뛰고, 다시 실행하면 체크포인트 다음부터 이어간다"""
+    path = tmp_path / "questions.jsonl"
+    lines = [json.dumps(_question(i), ensure_ascii=False) for i in range(5)]
+    lines.insert(2, json.dumps(_question(99, difficulty="어려움")))
+    lines.insert(4, "{broken")
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+    service = QuestionImportService(db_session, batch_size=2)
+    result = service.import_file(str(path))
+    assert result["inserted"] == 5
+    assert result["invalid"] == 2
+    assert [number for number, _ in result["errors"]] == [3, 5]
+
+    # 같은 파일을 다시 실행하면 추가하지 않음, 이어서 추가된 줄만 가져옴
+    assert service.import_file(str(path))["inserted"] == 0
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(_question(5), ensure_ascii=False) + "\n")
+    resumed = service.import_file(str(path))
+    assert resumed["resumed_from"] == 7
+    assert resumed["inserted"] == 1
+    assert db_session.query(QuestionBank).count() == 6
+
+
+def test_import_csv_list_columns(db_session, tmp_path):
+    """CSV의 options/tags는 JSON 배열 또는 | 구분 문자열을 받는다"""
+    path = tmp_path / "questions.csv"
+    path.write_text(
+        "subject,unit,difficulty,points,question_type,content,options,correct_answer,explanation,tags\n"
+        '민법,물권법,2,4,객관식,문제 A,"[""가"",""나""]",1,,물권|민법\n'
+        "민법,물권법,2,4,객관식,문제 B,가|나|다,3,해설,\n",
+        encoding="utf-8"
+    )
+
+    result = QuestionImportService(db_session).import_file(str(path))
+    assert result["inserted"] == 2 and result["invalid"] == 0
+
+    rows = {q.content: q for q in db_session.query(QuestionBank).all()}
+    assert rows["문제 A"].options == ["가", "나"]
+    assert rows["문제 A"].tags == ["물권", "민법"]
+    assert rows["문제 A"].explanation is None
+    assert rows["문제 B"].options == ["가", "나", "다"]
+    assert rows["문제 B"].tags is None
@@ -0,0 +1,40 @@
+"""
+Unit tests for ranking service.
+"""
+from services import ranking_service
+from services.ranking_service import FenwickTree, RankingService
+
+
+def test_fenwick_tree_prefix_sum_and_lower_bound():
+    """Test prefix sums and cumulative-count search."""
+    tree = FenwickTree(101)
+    tree.add(50, 2)
+    tree.add(80, 1)
+    tree.add(100, 1)
+
+    assert tree.total() == 4
+    assert tree.prefix_sum(49) == 0
+    assert tree.prefix_sum(80) == 3
+    assert tree.lower_bound(3) == 80
+    assert tree.lower_bound(4) == 100
+
+
+def test_standing_and_cutoff_from_histogram(db_session):
+    """Test percentile, rank and top-N% cutoff computed from recorded scores."""
+    ranking_service._trees.clear()
+    service = RankingService(db_session)
+    for accuracy in (40.0, 60.0, 60.0, 80.0, 100.0):
+        service.record_score("daily_test", accuracy)
+    db_session.commit()
+
+    standing = service.get_standing("daily_test", 60.0)
+    assert standing["rank"] == 3
+    assert standing["total"] == 5
+    assert standing["percentile"] == 40.0
+    assert service.get_cutoff("daily_test", 20) == 100
+
+    service.record_score("daily_test", 90.0)
+    db_session.commit()
+    service.apply_score("daily_test", 90.0)
+    assert service.get_standing("daily_test", 60.0)["rank"] == 4
+    ranking_service._trees.clear()
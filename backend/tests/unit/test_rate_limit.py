@@ -0,0 +1,98 @@
+"""Unit tests for RateLimitMiddleware."""
+
+import asyncio
+
+from middleware.rate_limit import InMemoryBucketStore, RateLimitMiddleware
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _request(middleware, path, method="GET", client="10.0.0.1", token=None):
+    scope = {"type": "http", "method": method, "path": path, "client": (client, 1234), "headers": []}
+    if token:
+        scope["headers"].append((b"authorization", f"Bearer {token}".encode()))
+
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    start = messages[0]
+    return start["status"], dict(start["headers"])
+
+
+def test_expensive_route_drains_bucket():
+    """무거운 경로는 비용만큼 토큰을 쓰고, 바닥나면 Retry-After와 함께 429를 돌려준다"""
+    middleware = RateLimitMiddleware(_ok_app, requests_per_minute=20, route_costs={("POST", "/auth/login"): 10})
+
+    assert _request(middleware, "/auth/login", "POST")[0] == 200
+    assert _request(middleware, "/auth/login", "POST")[0] == 200
+    status, headers = _request(middleware, "/auth/login", "POST")
+    assert status == 429
+    assert int(headers[b"retry-after"]) >= 1
+
+    # 다른 IP와 제외 경로는 영향을 받지 않음
+    assert _request(middleware, "/auth/login", "POST", client="10.0.0.2")[0] == 200
+    assert _request(middleware, "/health", client="10.0.0.1")[0] == 200
+
+
+def test_user_bucket_shared_across_ips():
+    """토큰이 확인되면 IP가 달라도 사용자 버킷을 함께 소진한다"""
+    middleware = RateLimitMiddleware(
+        _ok_app, requests_per_minute=2, route_costs={}, identify_user=lambda token: int(token)
+    )
+
+    assert _request(middleware, "/learning/stats", client="10.0.0.1", token="7")[0] == 200
+    assert _request(middleware, "/learning/stats", client="10.0.0.2", token="7")[0] == 200
+    assert _request(middleware, "/learning/stats", client="10.0.0.3", token="7")[0] == 429
+    # 다른 사용자는 별도 버킷
+    assert _request(middleware, "/learning/stats", client="10.0.0.3", token="8")[0] == 200
+
+
+def test_resolved_user_id_is_left_in_scope_state():
+    """확인한 사용자 ID를 scope["state"]에 남겨 엔드포인트가 토큰을 다시 풀지 않게 한다"""
+    seen, decoded = [], []
+
+    async def app(scope, receive, send):
+        seen.append(scope.get("state", {}).get("user_id"))
+        await _ok_app(scope, receive, send)
+
+    middleware = RateLimitMiddleware(
+        app, route_costs={}, identify_user=lambda token: decoded.append(token) or int(token)
+    )
+    assert _request(middleware, "/learning/stats", token="7")[0] == 200
+    assert _request(middleware, "/learning/stats", token="not-a-number")[0] == 200
+    assert _request(middleware, "/learning/stats")[0] == 200
+    assert seen == [7, None, None]
+    assert decoded == ["7", "not-a-number"]
+
+
+def test_concurrency_cap_returns_503():
+    """동시 처리 상한을 넘으면 버킷과 무관하게 503을 돌려준다"""
+    middleware = RateLimitMiddleware(_ok_app, max_concurrent=1)
+    middleware.in_flight = 1
+
+    status, headers = _request(middleware, "/learning/stats")
+    assert status == 503
+    assert headers[b"retry-after"] == b"1"
+
+
+def test_in_memory_store_refills():
+    """버킷은 경과 시간만큼 다시 채워진다"""
+    store = InMemoryBucketStore()
+
+    async def scenario():
+        assert (await store.take("k", 1, 1, 1000.0))[0]
+        allowed, retry_after = await store.take("k", 1, 1, 0.001)
+        assert not allowed and retry_after > 0
+        await asyncio.sleep(0.01)
+        return await store.take("k", 1, 1, 1000.0)
+
+    assert asyncio.run(scenario())[0]
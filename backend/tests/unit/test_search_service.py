@@ -0,0 +1,146 @@
+"""Unit tests for SearchService (FTS5 trigram index from migration m0009)."""
+
+import pytest
+from sqlalchemy import text
+
+from migrations import m0009_full_text_search
+from models.question import QuestionBank
+from models.wrong_answer import WrongAnswer
+from services.search_service import SearchService, _headline_html
+
+SYLLOGISM = "다음 삼단논법의 타당성을 판단하시오. 모든 사람은 죽는다. 소크라테스는 사람이다."
+EPISTEMOLOGY = "인식론에서 정당화된 참인 믿음이 지식의 충분조건인지에 관한 게티어의 반례를 고르시오."
+
+
+def _question(content, explanation=None, unit="논리학"):
+    return QuestionBank(
+        subject="언어이해", unit=unit, difficulty=3, points=3, question_type="객관식",
+        content=content, options=["1", "2", "3"], correct_answer="1", explanation=explanation
+    )
+
+
+def _wrong_answer(user_id, content, explanation=None, question_id=1):
+    return WrongAnswer(
+        user_id=user_id, question_id=question_id, question_content=content, user_answer="2", correct_answer="1",
+        explanation=explanation, unit="논리학", subject="언어이해"
+    )
+
+
+@pytest.fixture
+def search_db(db_session):
+    """색인 마이그레이션을 적용한 세션 (테스트 DB는 create_all만 하므로 직접 적용)"""
+    m0009_full_text_search.upgrade(db_session.connection())
+    db_session.commit()
+    yield db_session
+    db_session.rollback()
+    for table in m0009_full_text_search.SEARCH_INDEXES:
+        db_session.execute(text(f"DROP TABLE IF EXISTS {table}_fts"))
+    db_session.commit()
+
+
+def test_search_questions_matches_korean_substrings(search_db):
+    """조사가 붙은 어절 안의 단어도 찾고, 관련도와 강조한 발췌를 돌려준다"""
+    search_db.add_all([
+        _question(SYLLOGISM, "대전제와 소전제에서 결론을 이끌어 낸다."),
+        _question(EPISTEMOLOGY, "게티어 사례는 삼단논법과 무관하다.", unit="인식론"),
+        _question("헌법상 과잉금지원칙의 내용으로 옳지 않은 것은?"),
+    ])
+    search_db.commit()
+
+    page = SearchService(search_db).search_questions("삼단논법")
+    assert len(page["results"]) == 2
+    assert page["results"][0]["unit"] == "논리학"  # 본문 일치가 해설 일치보다 앞선다
+    assert all(row["score"] > 0 for row in page["results"])
+    assert "<mark>" in page["results"][0]["snippet"]
+
+    page = SearchService(search_db).search_questions("삼단논법", unit="인식론")
+    assert [row["unit"] for row in page["results"]] == ["인식론"]
+    assert SearchService(search_db).search_questions("소크라테스 지식")["results"] == []
+
+
+def test_index_follows_insert_update_delete(search_db):
+    """트리거가 INSERT/UPDATE/DELETE를 색인에 반영한다"""
+    service = SearchService(search_db)
+    question = _question(SYLLOGISM)
+    search_db.add(question)
+    search_db.commit()
+    assert len(service.search_questions("소크라테스")["results"]) == 1
+
+    question.content = EPISTEMOLOGY
+    search_db.commit()
+    assert service.search_questions("소크라테스")["results"] == []
+    assert len(service.search_questions("게티어")["results"]) == 1
+
+    search_db.delete(question)
+    search_db.commit()
+    assert service.search_questions("게티어")["results"] == []
+
+
+def test_search_wrong_notes_is_per_user_and_paginated(search_db):
+    """다른 사용자의 오답 노트는 찾지 않고, limit + 1개로 다음 페이지 여부를 알려준다"""
+    search_db.add_all([_wrong_answer(1, f"{i}번 삼단논법 문제", question_id=i) for i in range(3)])
+    search_db.add(_wrong_answer(2, "삼단논법 문제"))
+    search_db.commit()
+
+    service = SearchService(search_db)
+    first = service.search_wrong_notes(1, "삼단논법", limit=2)
+    second = service.search_wrong_notes(1, "삼단논법", limit=2, offset=2)
+
+    assert len(first["results"]) == 2 and first["has_more"]
+    assert len(second["results"]) == 1 and not second["has_more"]
+    ids = {row["id"] for row in first["results"] + second["results"]}
+    assert len(ids) == 3
+    assert len(service.search_wrong_notes(2, "삼단논법")["results"]) == 1
+
+
+def test_short_terms_fall_back_to_like(search_db):
+    """3글자 미만 검색어는 색인 결과 안에서 거르거나, 그것만 있으면 LIKE로 찾는다"""
+    search_db.add_all([_question(SYLLOGISM), _question(EPISTEMOLOGY)])
+    search_db.commit()
+    service = SearchService(search_db)
+
+    only_short = service.search_questions("지식")["results"]
+    assert len(only_short) == 1 and "<mark>지식</mark>" in only_short[0]["snippet"]
+
+    mixed = service.search_questions("사람 타당성")["results"]
+    assert len(mixed) == 1
+    assert service.search_questions("지식 타당성")["results"] == []
+    assert service.search_questions("  ?! ")["results"] == []
+
+
+def test_snippets_escape_stored_html(search_db):
+    """저장된 본문은 HTML 이스케이프하고 강조 태그만 그대로 둔다"""
+    search_db.add(_question('<img src=x onerror="alert(1)"> 다음 삼단논법 & 추론은?'))
+    search_db.commit()
+    service = SearchService(search_db)
+
+    for query in ("삼단논법", "추론"):  # 색인 검색 / LIKE 검색
+        snippet = service.search_questions(query)["results"][0]["snippet"]
+        markup = snippet.replace("<mark>", "").replace("</mark>", "")
+        assert "<" not in markup and ">" not in markup
+        assert "&gt;" in snippet and "&amp;" in snippet
+        assert f"<mark>{query}</mark>" in snippet
+
+    assert _headline_html("<b>\x02삼단논법\x03</b>") == "&lt;b&gt;<mark>삼단논법</mark>&lt;/b&gt;"
+
+
+def test_search_falls_back_to_like_without_trigram(db_session, monkeypatch):
+    """trigram을 못 쓰는 SQLite에서는 마이그레이션이 색인을 건너뛰고 검색은 LIKE로 한다"""
+    monkeypatch.setattr(m0009_full_text_search, "sqlite_trigram_available", lambda connection: False)
+    m0009_full_text_search.upgrade(db_session.connection())
+    assert db_session.execute(text("SELECT name FROM sqlite_master WHERE name LIKE '%fts%'")).all() == []
+
+    db_session.add_all([_question(SYLLOGISM, "대전제와 소전제"), _question(EPISTEMOLOGY)])
+    db_session.commit()
+    results = SearchService(db_session).search_questions("삼단논법 소전제")["results"]
+    assert len(results) == 1 and "<mark>삼단논법</mark>" in results[0]["snippet"]
+
+
+def test_postgresql_headline_uses_matching_column(db_session):
+    """PostgreSQL 발췌는 검색어가 나오는 컬럼을 고른다 (해설에만 있으면 해설)"""
+    params = {}
+    sql = SearchService(db_session)._postgresql_sql(
+        "question_banks", "t.id", ("content", "explanation"), ["삼단논법"], [], params
+    )
+    assert "THEN t.content WHEN" in sql and "THEN t.explanation ELSE t.content END" in sql
+    assert params["any_tsquery"] == "삼단논법:*"
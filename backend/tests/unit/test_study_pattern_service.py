@@ -0,0 +1,75 @@
+"""
+Unit tests for study pattern service.
+"""
+from datetime import datetime
+
+import pandas as pd
+
+from models.analytics import StudyPatternSnapshot
+from models.daily_test import DailyTestResult
+from models.user import User
+from services.study_pattern_service import StudyPatternService, EVENT_COLUMNS
+
+
+def test_analyze_bins_events_by_hour_and_weekday():
+    """Test that events are binned into hour/weekday histograms with accuracy."""
+    events = pd.DataFrame([
+        # 2024-03-06 (수요일) 저녁, 한 세션
+        (1, datetime(2024, 3, 6, 20, 0), 10, 9, 20),
+        (1, datetime(2024, 3, 6, 20, 25), 10, 8, 20),
+        # 2024-03-07 (목요일) 오후
+        (1, datetime(2024, 3, 7, 14, 30), 10, 3, 10),
+    ], columns=EVENT_COLUMNS)
+
+    snapshot = StudyPatternService(db_session=object()).analyze(events)[1]
+
+    assert snapshot["event_count"] == 3
+    assert snapshot["hour_histogram"][20] == 2
+    assert snapshot["hour_accuracy"][20] == 85.0
+    assert snapshot["weekday_histogram"][2] == 2
+    assert snapshot["preferred_study_time"] == "저녁"
+    assert snapshot["most_productive_day"] == "수요일"
+    assert snapshot["weakest_time_slot"] == "오후 2-4시"
+    assert snapshot["average_session_length"] == 25  # (40분 + 10분) / 2 세션
+
+
+def test_build_snapshots_writes_one_row_per_user(db_session):
+    """Test that the batch stores a snapshot for each user with events."""
+    for email in ("a@example.com", "b@example.com"):
+        db_session.add(User(email=email, password_hash="x", name="n", grade="150점",
+                            target_grade="180점", study_time=60, learning_style="mixed"))
+    db_session.add(DailyTestResult(user_id=1, total_score=12, total_points=15, correct_count=4,
+                                   total_questions=5, accuracy=80.0, wrong_questions=[],
+                                   completed_at=datetime(2024, 3, 6, 12, 0)))  # UTC -> 21시
+    db_session.commit()
+
+    service = StudyPatternService(db_session)
+    result = service.build_snapshots(chunk_size=1)
+
+    assert result == {"users": 2, "snapshots": 1, "events": 1}
+    assert db_session.query(StudyPatternSnapshot).count() == 1
+    assert service.get_snapshot(1).preferred_study_time == "저녁"
+
+
+def test_load_events_normalizes_timezones(db_session):
+    """Test that naive and tz-aware timestamps are converted to the app timezone before binning."""
+    from datetime import timezone
+
+    from models.wrong_answer import WrongAnswer, WrongAnswerReview
+
+    db_session.add(DailyTestResult(user_id=1, total_score=12, total_points=15, correct_count=4,
+                                   total_questions=5, accuracy=80.0, wrong_questions=[],
+                                   completed_at=datetime(2024, 3, 6, 11, 0)))
+    item = WrongAnswer(user_id=1, question_id=1, question_content="문제", user_answer="①", correct_answer="②")
+    db_session.add(item)
+    db_session.flush()
+    db_session.add(WrongAnswerReview(
+        wrong_answer_id=item.id, user_answer="②", is_correct=True,
+        created_at=datetime(2024, 3, 6, 11, 30, tzinfo=timezone.utc)
+    ))
+    db_session.commit()
+
+    events = StudyPatternService(db_session).load_events([1])
+
+    assert str(events["timestamp"].dt.tz) == "Asia/Seoul"
+    assert sorted(events["timestamp"].dt.hour) == [20, 20]
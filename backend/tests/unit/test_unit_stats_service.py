@@ -0,0 +1,76 @@
+"""
+Unit tests for unit stats service.
+"""
+from services.unit_stats_service import UnitStatsService
+
+
+def test_record_results_accumulates_per_unit(db_session):
+    """Test that graded answers accumulate into per-unit counters across submissions."""
+    service = UnitStatsService(db_session)
+    service.record_results(1, [
+        {"unit": "논리학", "is_correct": True, "points": 3},
+        {"unit": "논리학", "is_correct": False, "points": 4},
+        {"unit": "경제학", "is_correct": False, "points": 3},
+    ])
+    db_session.commit()
+    service.record_results(1, [
+        {"unit": "논리학", "is_correct": True, "points": 5},
+        {"unit": "경제학", "is_correct": True, "points": 3},
+    ])
+    db_session.commit()
+
+    stats = {s["unit"]: s for s in service.get_unit_stats(1)}
+    assert stats["논리학"]["attempted"] == 3
+    assert stats["논리학"]["correct"] == 2
+    assert stats["논리학"]["points_earned"] == 8
+    assert stats["경제학"]["accuracy"] == 50.0
+    assert service.get_strongest_weakest(1) == ("논리학", "경제학")
+    assert service.get_weak_units(1, limit=1) == ["경제학"]
+    assert service.get_strongest_weakest(2) == (None, None)
+
+
+def test_dashboard_stats_fall_back_when_no_unit_counters(db_session):
+    """Test that the dashboard keeps non-null strongest/weakest units for users without counters."""
+    from services.analytics_service import AnalyticsService, DEFAULT_STRONGEST_UNIT, DEFAULT_WEAKEST_UNIT
+
+    stats = AnalyticsService(db_session)._calculate_basic_stats(2)
+    assert stats["strongest_unit"] == DEFAULT_STRONGEST_UNIT
+    assert stats["weakest_unit"] == DEFAULT_WEAKEST_UNIT
+
+
+def test_m0004_backfills_from_results_without_events(db_session):
+    """Test that the backfill uses events where present and historical results otherwise."""
+    from migrations import m0004_unit_stats
+    from models.answer_event import AnswerEvent
+    from models.daily_test import DailyTestResult
+    from models.diagnostic import DiagnosticResult
+    from models.question import QuestionBank
+
+    question = QuestionBank(subject="추리논증", unit="", difficulty=3, points=4, question_type="객관식",
+                            content="문제", correct_answer="①")
+    db_session.add_all([question, QuestionBank(subject="추리논증", unit="논리학", difficulty=3, points=3,
+                                               question_type="객관식", content="문제", correct_answer="①")])
+    db_session.flush()
+    # 이벤트가 있는 결과는 이벤트로만 센다
+    recorded = DailyTestResult(user_id=1, correct_count=1, total_questions=1,
+                               wrong_questions=[{"id": 99, "unit": "논리학", "points": 3}])
+    db_session.add(recorded)
+    db_session.flush()
+    db_session.add(AnswerEvent(user_id=1, question_id=question.id, source_type="daily_test",
+                               source_id=recorded.id, is_correct=True))
+    db_session.add_all([
+        DailyTestResult(user_id=1, correct_count=3, total_questions=5, wrong_questions=[
+            {"id": 1, "unit": "논리학", "points": 3}, {"id": 2, "unit": None, "points": 2}
+        ]),
+        DiagnosticResult(user_id=1, unit_scores={"논리학": {"correct": 6, "total": 9}},
+                         wrong_questions=[{"id": 3, "unit": "논리학", "points": 3}]),
+    ])
+    db_session.commit()
+
+    m0004_unit_stats.upgrade(db_session.connection())
+    db_session.commit()
+
+    stats = {s["unit"]: s for s in UnitStatsService(db_session).get_unit_stats(1)}
+    assert (stats["기타"]["attempted"], stats["기타"]["correct"], stats["기타"]["points_attempted"]) == (2, 1, 6)
+    assert (stats["논리학"]["attempted"], stats["논리학"]["correct"]) == (4, 2)
+    assert (stats["논리학"]["points_attempted"], stats["논리학"]["points_earned"]) == (12, 6)
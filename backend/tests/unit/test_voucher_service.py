@@ -0,0 +1,62 @@
+"""Unit tests for VoucherService."""
+
+from models.voucher import PaymentHistory, UserVoucher, Voucher
+from services import voucher_service as voucher_module
+from services.voucher_service import VoucherService
+
+
+def _voucher(db_session, name, price, is_active=True):
+    voucher = Voucher(name=name, type="pro", price=price, period="month", features=["a"], is_active=is_active)
+    db_session.add(voucher)
+    db_session.commit()
+    return voucher
+
+
+def test_payment_history_keyset_pages(db_session):
+    """결제 내역은 이용권 이름을 조인해 최신순으로 이어 읽는다"""
+    pro = _voucher(db_session, "프로", 19900)
+    for voucher_id in (pro.id, pro.id, 999, pro.id, pro.id):
+        db_session.add(PaymentHistory(user_id=1, voucher_id=voucher_id, amount=19900, status="completed"))
+    db_session.add(PaymentHistory(user_id=2, voucher_id=pro.id, amount=19900, status="completed"))
+    db_session.commit()
+
+    service = VoucherService(db_session)
+    first = service.get_payment_history(1, limit=2)
+    second = service.get_payment_history(1, limit=2, before_id=first["next_before_id"])
+    last = service.get_payment_history(1, limit=2, before_id=second["next_before_id"])
+
+    ids = [int(p["id"]) for page in (first, second, last) for p in page["payments"]]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 5
+    assert last["next_before_id"] is None
+    names = [p["voucher_name"] for page in (first, second, last) for p in page["payments"]]
+    assert names.count("알 수 없음") == 1
+
+
+def test_active_voucher_info(db_session):
+    """활성 이용권만 조인해 돌려준다"""
+    basic = _voucher(db_session, "베이직", 9900)
+    pro = _voucher(db_session, "프로", 19900)
+    db_session.add(UserVoucher(user_id=1, voucher_id=basic.id, is_active=False))
+    db_session.add(UserVoucher(user_id=1, voucher_id=pro.id, is_active=True))
+    db_session.commit()
+
+    service = VoucherService(db_session)
+    assert service.get_user_voucher_info(1)["voucher"]["name"] == "프로"
+    assert service.get_user_voucher_info(2) == {"voucher": None}
+
+
+def test_catalog_cached_until_version_bump(db_session):
+    """카탈로그는 버전이 바뀔 때까지 캐시에서 읽는다"""
+    voucher_module._catalog["version"] = None
+    _voucher(db_session, "프로", 19900)
+    _voucher(db_session, "종료", 4900, is_active=False)
+
+    service = VoucherService(db_session)
+    assert [v["name"] for v in service.get_available_vouchers()] == ["프로"]
+
+    _voucher(db_session, "라이트", 4900)
+    assert [v["name"] for v in service.get_available_vouchers()] == ["프로"]
+
+    service.bump_catalog_version()
+    assert [v["name"] for v in service.get_available_vouchers()] == ["프로", "라이트"]
+    voucher_module._catalog["version"] = None
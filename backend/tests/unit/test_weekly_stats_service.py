@@ -0,0 +1,89 @@
+"""
+Unit tests for weekly statistics service.
+"""
+from datetime import date, datetime, timedelta
+
+from models.analytics import WeeklyStats
+from models.daily_test import DailyTestResult
+from models.learning_streak import DailyActivity
+from services.weekly_stats_service import WeeklyStatsService, week_start_of
+
+
+def _add_test(db, day, accuracy, user_id=1):
+    db.add(DailyTestResult(
+        user_id=user_id, total_score=0, total_points=0, correct_count=int(accuracy / 10),
+        total_questions=10, accuracy=accuracy, wrong_questions=[],
+        completed_at=datetime.combine(day, datetime.min.time()) + timedelta(hours=20)
+    ))
+
+
+def test_week_start_of_is_monday():
+    """Test that week_start_of returns the Monday of the ISO week."""
+    assert week_start_of(date(2024, 3, 10)) == date(2024, 3, 4)  # Sunday
+    assert week_start_of(date(2024, 3, 4)) == date(2024, 3, 4)  # Monday
+
+
+def test_materialize_closed_weeks_and_improvement(db_session):
+    """Test that closed weeks are stored with week-over-week improvement."""
+    this_week = week_start_of(date.today())
+    two_weeks_ago = this_week - timedelta(days=14)
+    last_week = this_week - timedelta(days=7)
+
+    _add_test(db_session, two_weeks_ago, 50.0)
+    _add_test(db_session, last_week, 60.0)
+    _add_test(db_session, last_week + timedelta(days=2), 80.0)
+    _add_test(db_session, this_week, 77.0)
+    db_session.add(DailyActivity(
+        user_id=1, learning_streak_id=1, activity_date=last_week + timedelta(days=3), study_time_minutes=45
+    ))
+    db_session.commit()
+
+    service = WeeklyStatsService(db_session)
+    assert service.materialize_closed_weeks() == 2
+    assert service.materialize_closed_weeks() == 0  # 이미 저장된 주는 다시 계산하지 않음
+
+    stored = db_session.query(WeeklyStats).filter(WeeklyStats.week_start == last_week).one()
+    assert stored.tests_completed == 2
+    assert stored.average_score == 70.0
+    assert stored.study_days == 3
+    assert stored.total_study_time == 45
+    assert stored.improvement_rate == 40.0
+
+    current = service.get_current_week_stats(1)
+    assert current["questions_solved"] == 10
+    assert current["improvement_rate"] == 10.0
+
+
+def test_week_without_tests_has_no_improvement(db_session):
+    """Test that a week with activity but no tests is not reported as a -100% drop."""
+    this_week = week_start_of(date.today())
+    last_week = this_week - timedelta(days=7)
+
+    _add_test(db_session, last_week - timedelta(days=7), 60.0)
+    db_session.add(DailyActivity(user_id=1, learning_streak_id=1, activity_date=last_week, study_time_minutes=30))
+    db_session.commit()
+
+    service = WeeklyStatsService(db_session)
+    service.materialize_closed_weeks()
+    stored = db_session.query(WeeklyStats).filter(WeeklyStats.week_start == last_week).one()
+    assert (stored.tests_completed, stored.improvement_rate) == (0, 0.0)
+    assert service.get_current_week_stats(1)["improvement_rate"] == 0.0
+
+
+def test_materialize_uses_each_users_latest_week(db_session):
+    """Test that storing one user's weeks does not skip other users' unsaved weeks."""
+    this_week = week_start_of(date.today())
+    last_week = this_week - timedelta(days=7)
+
+    _add_test(db_session, last_week, 70.0, user_id=1)
+    _add_test(db_session, last_week - timedelta(days=7), 50.0, user_id=2)
+    _add_test(db_session, last_week, 60.0, user_id=2)
+    db_session.commit()
+
+    service = WeeklyStatsService(db_session)
+    assert service.materialize_closed_weeks(user_id=1) == 1
+    assert service.materialize_closed_weeks() == 2
+    assert service.materialize_closed_weeks() == 0
+
+    stored = db_session.query(WeeklyStats).filter(WeeklyStats.user_id == 2, WeeklyStats.week_start == last_week).one()
+    assert stored.improvement_rate == 20.0
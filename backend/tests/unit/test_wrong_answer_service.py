@@ -0,0 +1,137 @@
+"""
+Unit tests for wrong answer service.
+"""
+import pytest
+
+from models.wrong_answer import WrongAnswer, WrongAnswerCreate, WrongAnswerReviewCreate
+from services.wrong_answer_service import WrongAnswerService
+
+
+def _add_item(service, user_id=1, question_id=1):
+    return service.add_wrong_answer(user_id, WrongAnswerCreate(
+        question_id=question_id,
+        question_content="테스트 문제입니다.",
+        user_answer="①",
+        correct_answer="②",
+    ))
+
+
+def _review(service, item_id, is_correct, user_id=1):
+    answer = "②" if is_correct else "①"
+    return service.review_wrong_answer(
+        user_id, item_id, WrongAnswerReviewCreate(user_answer=answer, is_correct=is_correct)
+    )
+
+
+def test_three_consecutive_correct_reviews_master_item(db_session):
+    """Test that an item is mastered after three correct reviews in a row."""
+    service = WrongAnswerService(db_session)
+    item = _add_item(service)
+
+    _review(service, item.id, True)
+    _review(service, item.id, True)
+    row = db_session.get(WrongAnswer, item.id)
+    db_session.refresh(row)
+    assert row.consecutive_correct == 2
+    assert not row.mastered
+
+    review = _review(service, item.id, True)
+    db_session.refresh(row)
+    assert review.is_correct
+    assert row.review_count == 3
+    assert row.mastered
+    assert row.mastered_at is not None
+
+
+def test_wrong_review_resets_streak_and_mastery(db_session):
+    """Test that a wrong review clears the streak and mastery."""
+    service = WrongAnswerService(db_session)
+    item = _add_item(service)
+
+    for _ in range(3):
+        _review(service, item.id, True)
+    _review(service, item.id, False)
+
+    row = db_session.get(WrongAnswer, item.id)
+    db_session.refresh(row)
+    assert row.consecutive_correct == 0
+    assert not row.mastered
+    assert row.mastered_at is None
+
+
+def test_review_of_other_users_item_is_rejected(db_session):
+    """Test that reviewing another user's item raises an error."""
+    service = WrongAnswerService(db_session)
+    item = _add_item(service, user_id=1)
+
+    with pytest.raises(ValueError):
+        _review(service, item.id, True, user_id=2)
+
+
+def test_bulk_add_upserts_duplicates(db_session):
+    """Test that bulk add updates existing items instead of duplicating them."""
+    service = WrongAnswerService(db_session)
+    first = _add_item(service, question_id=1)
+
+    items = [
+        WrongAnswerCreate(question_id=1, question_content="테스트", user_answer="③", correct_answer="②"),
+        WrongAnswerCreate(question_id=2, question_content="테스트", user_answer="①", correct_answer="②"),
+    ]
+    result = service.bulk_add_wrong_answers(1, items)
+
+    assert len(result) == 2
+    assert db_session.query(WrongAnswer).count() == 2
+    updated = next(item for item in result if item.question_id == 1)
+    assert updated.id == first.id
+    assert updated.user_answer == "③"
+
+
+def test_review_records_answer_event(db_session):
+    """Test that each review is appended to answer_events."""
+    from models.answer_event import AnswerEvent
+
+    service = WrongAnswerService(db_session)
+    item = _add_item(service, question_id=7)
+    _review(service, item.id, False)
+
+    event = db_session.query(AnswerEvent).one()
+    assert (event.question_id, event.source_type, event.is_correct) == (7, "review", False)
+
+
+def test_duplicate_merge_recomputes_review_state(db_session):
+    """Test that m0002 recomputes review counters on the kept row after moving duplicate reviews."""
+    from sqlalchemy import text
+    from migrations import m0002_wrong_answer_unique_source
+    from models.wrong_answer import WrongAnswerReview
+
+    db_session.execute(text("DROP INDEX uq_wrong_answers_user_question_source"))
+    keeper = WrongAnswer(user_id=1, question_id=1, question_content="문제", user_answer="①", correct_answer="②")
+    duplicate = WrongAnswer(user_id=1, question_id=1, question_content="문제", user_answer="③", correct_answer="②")
+    db_session.add_all([keeper, duplicate])
+    db_session.flush()
+    for item, is_correct in [(keeper, True), (duplicate, False), (duplicate, True), (keeper, True), (duplicate, True)]:
+        db_session.add(WrongAnswerReview(wrong_answer_id=item.id, user_answer="②", is_correct=is_correct))
+        db_session.flush()
+    db_session.commit()
+
+    m0002_wrong_answer_unique_source.upgrade(db_session.connection())
+    db_session.commit()
+
+    rows = db_session.query(WrongAnswer).all()
+    assert [row.id for row in rows] == [keeper.id]
+    db_session.refresh(keeper)
+    assert keeper.review_count == 5
+    assert keeper.consecutive_correct == 3
+    assert keeper.mastered
+    assert keeper.mastered_at is not None and keeper.last_reviewed_at is not None
+
+
+def test_service_keeps_caller_session_open(db_session):
+    """Test that a discarded service does not close a session it was handed."""
+    from services.learning_streak_service import LearningStreakService
+
+    pending = WrongAnswer(user_id=1, question_id=99, question_content="문제", user_answer="①", correct_answer="②")
+    db_session.add(pending)
+    for service_class in (WrongAnswerService, LearningStreakService):
+        service_class(db_session).__del__()
+        assert pending in db_session  # close()였다면 세션에서 빠짐